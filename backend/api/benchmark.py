@@ -0,0 +1,81 @@
+"""Throughput benchmark for the API's main read endpoints
+
+Run against a started server (production or dev profile) to compare
+serving setups; reports requests/s in total and per worker:
+
+    python benchmark.py --url http://localhost:8000 --workers 4
+
+Run it from a separate machine/container so the load generator doesn't
+compete with the workers for CPU.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, Any, List
+
+import httpx
+
+ENDPOINTS = [
+    "/",
+    "/api/v1/themes",
+    "/api/v1/check-subdomain?subdomain=benchmark-test",
+    "/api/v1/tenant/test-academy/config",
+    "/api/v1/users/email/benchmark@kurs24.io/id",
+]
+
+
+async def hammer(client: httpx.AsyncClient, path: str, deadline: float,
+                 latencies: List[float], errors: List[int]):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+        latencies.append(time.perf_counter() - started)
+
+
+async def benchmark(url: str, path: str, duration: float, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: List[int] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        await client.get(path)  # warm-up (connection, caches)
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(hammer(client, path, deadline, latencies, errors)
+                               for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+        "errors": len(errors),
+    }
+
+
+async def main(args):
+    print(f"📊 {args.url} - {args.duration}s per endpoint, {args.concurrency} concurrent, "
+          f"{args.workers} worker(s)")
+    print(f"{'endpoint':<55} {'req/s':>9} {'req/s/worker':>13} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for path in args.endpoints or ENDPOINTS:
+        result = await benchmark(args.url, path, args.duration, args.concurrency)
+        print(f"{path:<55} {result['rps']:>9.0f} {result['rps'] / args.workers:>13.0f} "
+              f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the API's read endpoints")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes of the server (for req/s per worker)")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("endpoints", nargs="*", help=f"paths (default: {', '.join(ENDPOINTS)})")
+    asyncio.run(main(parser.parse_args()))
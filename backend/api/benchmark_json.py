@@ -0,0 +1,114 @@
+"""Micro-benchmark: encoding time of a 1,000-invoice response
+
+Compares the encoding paths of /api/v1/invoices/{email} without a
+database (rows are simulated with the types asyncpg returns):
+
+    python benchmark_json.py [--rows 1000] [--repeat 200]
+
+- dicts + jsonable_encoder + json: per-row dicts, FastAPI's default before
+- dicts + jsonable_encoder + orjson: same with ORJSONResponse as default
+- response model: InvoiceHistory validated and dumped (response_model path)
+- json_agg fragment: rows encoded by PostgreSQL, embedded as orjson.Fragment
+  (the endpoint's path; PostgreSQL's encoding time is not included)
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from responses import InvoiceHistory
+
+
+def fake_rows(count: int):
+    started = datetime(2024, 1, 1, 9, 30)
+    return [{
+        "invoice_number": f"K24-2024-{i:05d}",
+        "customer_email": "benchmark@kurs24.io",
+        "customer_name": "Benchmark Akademie",
+        "plan": "pro" if i % 2 else "basis",
+        "amount": Decimal("99.00") if i % 2 else Decimal("49.00"),
+        "currency": "EUR",
+        "payment_date": started + timedelta(days=i, microseconds=i),
+        "payment_method": "PayPal",
+        "subdomain": "benchmark",
+        "status": "paid",
+        "pdf_url": f"/api/v1/invoices/K24-2024-{i:05d}/pdf",
+    } for i in range(count)]
+
+
+def row_dicts(rows):
+    return [{
+        "invoice_number": row["invoice_number"],
+        "customer_email": row["customer_email"],
+        "customer_name": row["customer_name"],
+        "plan": row["plan"],
+        "amount": float(row["amount"]),
+        "currency": row["currency"],
+        "payment_date": row["payment_date"].isoformat(),
+        "payment_method": row["payment_method"],
+        "subdomain": row["subdomain"],
+        "status": row["status"],
+        "pdf_url": row["pdf_url"],
+    } for row in rows]
+
+
+def payload(items, total):
+    return {"status": "success", "customer_email": "benchmark@kurs24.io",
+            "total_invoices": total, "invoices": items}
+
+
+def dicts_json(rows, _):
+    content = jsonable_encoder(payload(row_dicts(rows), len(rows)))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def dicts_orjson(rows, _):
+    return orjson.dumps(jsonable_encoder(payload(row_dicts(rows), len(rows))))
+
+
+def response_model(rows, _):
+    model = InvoiceHistory.model_validate(payload(rows, len(rows)))
+    return orjson.dumps(model.model_dump(mode="json"))
+
+
+def json_agg_fragment(rows, encoded):
+    return orjson.dumps(payload(orjson.Fragment(encoded), len(rows)))
+
+
+PATHS = [
+    ("dicts + jsonable_encoder + json", dicts_json),
+    ("dicts + jsonable_encoder + orjson", dicts_orjson),
+    ("response model", response_model),
+    ("json_agg fragment", json_agg_fragment),
+]
+
+
+def main(args):
+    rows = fake_rows(args.rows)
+    # What json_agg returns: numbers for amounts, ISO timestamps
+    encoded = json.dumps(row_dicts(rows), separators=(",", ":"))
+
+    print(f"📊 {args.rows} invoices, {args.repeat} runs per path")
+    print(f"{'path':<36} {'median ms':>10} {'min ms':>8} {'bytes':>8}")
+    for name, encode in PATHS:
+        body = encode(rows, encoded)
+        assert json.loads(body)["total_invoices"] == args.rows
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            encode(rows, encoded)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"{name:<36} {statistics.median(timings):>10.3f} {min(timings):>8.3f} {len(body):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark invoice response encoding")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    main(parser.parse_args())
@@ -0,0 +1,251 @@
+"""Caddy admin API client for kurs24.io tenant routes
+
+Tenant sites are routes with an "@id" of tenant-<subdomain> in the HTTPS
+server of Caddy's live JSON config. Changes are collected for a short
+moment and written with one PATCH of the route list, guarded by the
+config ETag, so a burst of signups costs one config load instead of a
+full Caddyfile reparse per tenant.
+
+An error route (@id wake-tenants) sends requests that failed with 502 on a
+tenant host - container hibernated - to the API, which wakes the container.
+"""
+import asyncio
+import os
+from typing import Dict, Any, Iterable, List, Optional, Set
+
+import httpx
+
+ROUTE_PREFIX = "tenant-"
+TENANT_DOMAIN = "kurs24.io"
+# Must not start with ROUTE_PREFIX (reconcile would treat it as a tenant)
+WAKE_ROUTE_ID = "wake-tenants"
+
+# Concurrent config changes (412 Precondition Failed) are retried
+MAX_CONFLICT_RETRIES = 5
+
+
+class CaddyError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Caddy API {status_code}: {message}")
+        self.status_code = status_code
+
+
+def route_id(subdomain: str) -> str:
+    return f"{ROUTE_PREFIX}{subdomain}"
+
+
+def tenant_route(subdomain: str) -> Dict[str, Any]:
+    """Route for <subdomain>.kurs24.io -> tenant-<subdomain>-app:5000"""
+    return {
+        "@id": route_id(subdomain),
+        "match": [{"host": [f"{subdomain}.{TENANT_DOMAIN}"]}],
+        "handle": [
+            {
+                "handler": "headers",
+                "response": {"set": {
+                    "X-Tenant-Id": [subdomain],
+                    "X-Frame-Options": ["SAMEORIGIN"],
+                    "X-Content-Type-Options": ["nosniff"],
+                }},
+            },
+            {
+                "handler": "reverse_proxy",
+                "upstreams": [{"dial": f"tenant-{subdomain}-app:5000"}],
+                "headers": {"request": {"set": {
+                    "X-Real-Ip": ["{http.request.remote.host}"],
+                    "X-Forwarded-Proto": ["{http.request.scheme}"],
+                    "X-Tenant-Id": [subdomain],
+                }}},
+            },
+        ],
+        "terminal": True,
+    }
+
+
+def wake_route(upstream: str, static_hosts: Set[str]) -> Dict[str, Any]:
+    """Error route: 502 on a tenant host -> /internal/wake/<subdomain><uri> on the API"""
+    match = {
+        "host": [f"*.{TENANT_DOMAIN}"],
+        "expression": "{http.error.status_code} == 502",
+    }
+    if static_hosts:
+        match["not"] = [{"host": sorted(static_hosts)}]
+    return {
+        "@id": WAKE_ROUTE_ID,
+        "match": [match],
+        "handle": [
+            {
+                "handler": "rewrite",
+                "uri": "/internal/wake/{http.request.host.labels.2}{http.request.uri}",
+            },
+            {
+                "handler": "reverse_proxy",
+                "upstreams": [{"dial": upstream}],
+                # Held until the container is up
+                "transport": {"protocol": "http", "response_header_timeout": "120s"},
+            },
+        ],
+        "terminal": True,
+    }
+
+
+def route_hosts(route: Dict[str, Any]) -> Set[str]:
+    return {host for match in route.get("match", []) for host in match.get("host", [])}
+
+
+def is_tenant_route(route: Dict[str, Any]) -> bool:
+    return str(route.get("@id", "")).startswith(ROUTE_PREFIX)
+
+
+class CaddyAPI:
+    def __init__(self):
+        self.admin_url = os.getenv("CADDY_ADMIN_URL", "http://caddy:2019")
+        # Name of the HTTPS server in the adapted Caddyfile (srv0, ...), detected if unset
+        self.server = os.getenv("CADDY_SERVER")
+        self.batch_delay = float(os.getenv("CADDY_BATCH_DELAY", "0.2"))
+        self.wake_upstream = os.getenv("CADDY_WAKE_UPSTREAM", "kurs24-api:8000")
+
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._waiters: List[asyncio.Future] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        async with httpx.AsyncClient(base_url=self.admin_url, timeout=30) as client:
+            response = await client.request(method, path, **kwargs)
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("error", response.text)
+            except ValueError:
+                message = response.text
+            raise CaddyError(response.status_code, message)
+        return response
+
+    async def request_counts(self) -> Dict[str, float]:
+        """Proxied requests per host since Caddy started (metrics { per_host })"""
+        response = await self.request("GET", "/metrics")
+        counts: Dict[str, float] = {}
+        for line in response.text.splitlines():
+            if not line.startswith("caddy_http_requests_total{"):
+                continue
+            labels, _, value = line[len("caddy_http_requests_total{"):].rpartition("} ")
+            fields = dict(part.split("=", 1) for part in labels.split(",") if "=" in part)
+            # Every handler of a route counts the request; count it once
+            if fields.get("handler") != '"reverse_proxy"' or "host" not in fields:
+                continue
+            host = fields["host"].strip('"')
+            counts[host] = counts.get(host, 0) + float(value)
+        return counts
+
+    async def find_server(self) -> str:
+        """The server listening on :443 (holds all site routes)"""
+        if self.server:
+            return self.server
+        servers = (await self.request("GET", "/config/apps/http/servers")).json() or {}
+        for name, server in servers.items():
+            if any(listen.endswith(":443") for listen in server.get("listen", [])):
+                self.server = name
+                return name
+        raise CaddyError(404, "no HTTPS server in Caddy config")
+
+    async def routes_path(self) -> str:
+        return f"/config/apps/http/servers/{await self.find_server()}/routes"
+
+    async def get_routes(self):
+        """(routes, etag) of the HTTPS server"""
+        response = await self.request("GET", await self.routes_path())
+        return response.json() or [], response.headers.get("Etag")
+
+    async def apply(self, changes: Dict[str, Optional[Dict[str, Any]]]):
+        """Add/replace (route) or remove (None) routes by id in one config load"""
+        path = await self.routes_path()
+        for _ in range(MAX_CONFLICT_RETRIES):
+            routes, etag = await self.get_routes()
+            kept = [route for route in routes if route.get("@id") not in changes]
+            updated = [route for route in changes.values() if route is not None] + kept
+            if updated == routes:
+                return
+            try:
+                await self.request("PATCH" if routes else "PUT", path, json=updated,
+                                   headers={"If-Match": etag} if etag else {})
+                return
+            except CaddyError as e:
+                if e.status_code != 412:
+                    raise
+        raise CaddyError(412, "config kept changing, giving up")
+
+    async def ensure_wake_route(self, static_hosts: Set[str]):
+        """Put the wake-up route first in the HTTPS server's error routes"""
+        path = f"/config/apps/http/servers/{await self.find_server()}/errors"
+        try:
+            errors = (await self.request("GET", path)).json() or {}
+        except CaddyError:
+            errors = {}
+        routes = errors.get("routes") or []
+        route = wake_route(self.wake_upstream, static_hosts)
+        updated = [route] + [r for r in routes if r.get("@id") != WAKE_ROUTE_ID]
+        if updated == routes:
+            return
+        if "routes" in errors:
+            await self.request("PATCH", f"{path}/routes", json=updated)
+        elif errors:
+            await self.request("PUT", f"{path}/routes", json=updated)
+        else:
+            await self.request("PUT", path, json={"routes": updated})
+        print(f"⏰ Caddy wake-up route for hibernated tenants set ({self.wake_upstream})")
+
+    async def add_tenant(self, subdomain: str):
+        await self._queue(route_id(subdomain), tenant_route(subdomain))
+
+    async def remove_tenant(self, subdomain: str):
+        await self._queue(route_id(subdomain), None)
+
+    async def _queue(self, key: str, route: Optional[Dict[str, Any]]):
+        """Batch the change with others arriving within batch_delay"""
+        self._pending[key] = route
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+        await future
+
+    async def _flush(self):
+        while self._pending:
+            await asyncio.sleep(self.batch_delay)
+            changes, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, []
+            try:
+                await self.apply(changes)
+                print(f"🔀 Caddy routes updated: {len(changes)} change(s) in one load")
+            except Exception as e:
+                for waiter in waiters:
+                    waiter.set_exception(e)
+            else:
+                for waiter in waiters:
+                    waiter.set_result(None)
+
+    async def reconcile(self, subdomains: Iterable[str]) -> Dict[str, int]:
+        """Make the live tenant routes match the given subdomains
+
+        Hosts already served by hand-written Caddyfile sites are left alone.
+        """
+        routes, _ = await self.get_routes()
+        current = {route["@id"]: route for route in routes if is_tenant_route(route)}
+        static_hosts = set().union(*(route_hosts(route) for route in routes
+                                     if not is_tenant_route(route)))
+
+        # Wildcard sites (TENANT_DNS_MODE=wildcard) are tenant hosts themselves
+        await self.ensure_wake_route({host for host in static_hosts
+                                      if host.endswith(f".{TENANT_DOMAIN}") and not host.startswith("*.")})
+
+        desired = {route_id(subdomain): tenant_route(subdomain) for subdomain in subdomains
+                   if f"{subdomain}.{TENANT_DOMAIN}" not in static_hosts}
+        changes = {key: None for key in current if key not in desired}
+        changes.update({key: route for key, route in desired.items() if current.get(key) != route})
+
+        if changes:
+            await self.apply(changes)
+        added = sum(1 for route in changes.values() if route is not None)
+        return {"added": added, "removed": len(changes) - added, "total": len(desired)}
+
+
+caddy_api = CaddyAPI()
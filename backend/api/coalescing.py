@@ -0,0 +1,29 @@
+"""Request coalescing: concurrent identical calls share one in-flight run
+
+Used for probes that many clients poll at the same time (provisioning
+status of one subdomain): the first caller starts the probe, callers
+arriving while it runs await the same result. Nothing is cached after
+the run finishes.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class Coalescer:
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, probe: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(probe())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        # A disconnecting client must not cancel the probe of the others
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved even if every caller went away
@@ -0,0 +1,194 @@
+"""Docker Engine API client for kurs24.io (unix socket, no docker CLI)
+
+All calls share one connection pool on the socket. At most
+DOCKER_MAX_CONCURRENCY calls run at the same time, so a burst of
+provisioning, restarts and stats polls queues in the API instead of piling
+up on the Docker daemon; image builds and pulls (long streams) don't count
+against the limit.
+"""
+import asyncio
+import fnmatch
+import io
+import json
+import os
+import struct
+import tarfile
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+
+class DockerError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Docker API {status_code}: {message}")
+        self.status_code = status_code
+
+
+class DockerAPI:
+    def __init__(self):
+        self.socket_path = os.getenv("DOCKER_SOCKET", "/var/run/docker.sock")
+        self.api_version = os.getenv("DOCKER_API_VERSION", "v1.43")
+        self.max_concurrency = int(os.getenv("DOCKER_MAX_CONCURRENCY", "8"))
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._limit = asyncio.Semaphore(self.max_concurrency)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            transport = httpx.AsyncHTTPTransport(uds=self.socket_path)
+            self._client = httpx.AsyncClient(
+                transport=transport,
+                base_url=f"http://docker/{self.api_version}",
+                timeout=30,
+                limits=httpx.Limits(max_connections=self.max_concurrency + 4)
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(self, method: str, path: str, ok=(200, 201, 204, 304), **kwargs) -> httpx.Response:
+        async with self._limit:
+            response = await self.client.request(method, path, **kwargs)
+        if response.status_code not in ok:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise DockerError(response.status_code, message)
+        return response
+
+    # Images
+
+    async def image_exists(self, image: str) -> bool:
+        response = await self.request("GET", f"/images/{image}/json", ok=(200, 404))
+        return response.status_code == 200
+
+    async def build_image(self, context_dir: str, tag: str, dockerfile: str = "Dockerfile",
+                          buildargs: Dict[str, str] = None):
+        """Build an image from a directory (honours .dockerignore)"""
+        context = build_context_tar(context_dir)
+        params = {"t": tag, "dockerfile": dockerfile, "rm": "1"}
+        if buildargs:
+            params["buildargs"] = json.dumps(buildargs)
+        async with self.client.stream(
+            "POST", "/build",
+            params=params,
+            content=context,
+            headers={"Content-Type": "application/x-tar"},
+            timeout=900
+        ) as response:
+            if response.status_code != 200:
+                raise DockerError(response.status_code, (await response.aread()).decode())
+            # Build errors arrive in the progress stream, not as status codes
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if "error" in event:
+                    raise DockerError(500, event["error"])
+
+    async def pull_image(self, image: str):
+        name, tag = image.rsplit(":", 1) if ":" in image.rsplit("/", 1)[-1] else (image, "latest")
+        async with self.client.stream("POST", "/images/create",
+                                      params={"fromImage": name, "tag": tag},
+                                      timeout=900) as response:
+            if response.status_code != 200:
+                raise DockerError(response.status_code, (await response.aread()).decode())
+            async for line in response.aiter_lines():
+                if line.strip() and "error" in json.loads(line):
+                    raise DockerError(500, json.loads(line)["error"])
+
+    # Containers
+
+    async def create_container(self, name: str, config: Dict[str, Any]) -> str:
+        response = await self.request("POST", "/containers/create", params={"name": name}, json=config)
+        return response.json()["Id"]
+
+    async def start_container(self, name: str):
+        await self.request("POST", f"/containers/{name}/start")
+
+    async def stop_container(self, name: str, timeout: int = 10):
+        await self.request("POST", f"/containers/{name}/stop", params={"t": timeout},
+                           timeout=timeout + 30)
+
+    async def restart_container(self, name: str, timeout: int = 10):
+        await self.request("POST", f"/containers/{name}/restart", params={"t": timeout},
+                           timeout=timeout + 30)
+
+    async def rename_container(self, name: str, new_name: str):
+        await self.request("POST", f"/containers/{name}/rename", params={"name": new_name})
+
+    async def remove_container(self, name: str, force: bool = False):
+        await self.request("DELETE", f"/containers/{name}", params={"force": str(force).lower()},
+                           ok=(204, 404))
+
+    async def inspect_container(self, name: str) -> Optional[Dict[str, Any]]:
+        response = await self.request("GET", f"/containers/{name}/json", ok=(200, 404))
+        return response.json() if response.status_code == 200 else None
+
+    async def list_containers(self, labels: List[str] = None, all: bool = True) -> List[Dict[str, Any]]:
+        params = {"all": str(all).lower()}
+        if labels:
+            params["filters"] = json.dumps({"label": labels})
+        response = await self.request("GET", "/containers/json", params=params)
+        return response.json()
+
+    async def container_stats(self, name: str, one_shot: bool = False) -> Dict[str, Any]:
+        """One stats sample; takes about a second, Docker waits for a second
+        CPU reading (precpu_stats) so usage can be computed from the delta.
+        one_shot returns at once without precpu_stats."""
+        response = await self.request("GET", f"/containers/{name}/stats",
+                                      params={"stream": "false", "one-shot": str(one_shot).lower()})
+        return response.json()
+
+    async def container_logs(self, name: str, tail: int = 100) -> str:
+        """Last lines of stdout and stderr"""
+        response = await self.request("GET", f"/containers/{name}/logs",
+                                      params={"stdout": "true", "stderr": "true", "tail": str(tail)})
+        return demux_logs(response.content)
+
+
+def demux_logs(raw: bytes) -> str:
+    """Strip the 8-byte frame headers of non-TTY log streams"""
+    if raw[:1] not in (b"\x00", b"\x01", b"\x02") or raw[1:4] != b"\x00\x00\x00":
+        return raw.decode(errors="replace")  # TTY container: plain text
+    chunks = []
+    offset = 0
+    while offset + 8 <= len(raw):
+        size = struct.unpack(">I", raw[offset + 4:offset + 8])[0]
+        chunks.append(raw[offset + 8:offset + 8 + size])
+        offset += 8 + size
+    return b"".join(chunks).decode(errors="replace")
+
+
+def build_context_tar(context_dir: str) -> bytes:
+    """Tar a build context in memory, skipping .dockerignore matches"""
+    ignore = []
+    ignore_file = os.path.join(context_dir, ".dockerignore")
+    if os.path.exists(ignore_file):
+        with open(ignore_file) as f:
+            ignore = [line.strip().rstrip("/") for line in f
+                      if line.strip() and not line.startswith("#")]
+
+    def ignored(path: str) -> bool:
+        return any(fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(os.path.basename(path), pattern)
+                   or path.startswith(pattern + "/") for pattern in ignore)
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for root, dirs, files in os.walk(context_dir):
+            rel_root = os.path.relpath(root, context_dir)
+            dirs[:] = [d for d in dirs if d != "__pycache__"
+                       and not ignored(os.path.normpath(os.path.join(rel_root, d)))]
+            for name in files:
+                rel_path = os.path.normpath(os.path.join(rel_root, name))
+                if not ignored(rel_path):
+                    tar.add(os.path.join(root, name), arcname=rel_path)
+    return buffer.getvalue()
+
+
+docker_api = DockerAPI()
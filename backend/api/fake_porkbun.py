@@ -0,0 +1,138 @@
+"""Local fake of the Porkbun DNS API
+Keeps records in memory, optionally rate-limits like the real API - for
+development and tests of porkbun.py without touching the live zone
+
+    python fake_porkbun.py [--port 8053] [--rate-limit 2]
+
+then start the API with PORKBUN_API_URL=http://localhost:8053/api/json/v3
+"""
+import argparse
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "/api/json/v3"
+
+
+class FakePorkbun:
+    """In-memory zones: {domain: [record, ...]}"""
+
+    def __init__(self, rate_limit: float = 0):
+        self.records = {}
+        self.rate_limit = rate_limit
+        self.requests = 0
+        self._ids = itertools.count(100000)
+        self._lock = threading.Lock()
+        self._window = (0, 0)
+
+    def throttled(self) -> bool:
+        """True if more than rate_limit requests arrived in the current second"""
+        if not self.rate_limit:
+            return False
+        second = int(time.monotonic())
+        start, count = self._window
+        count = count + 1 if start == second else 1
+        self._window = (second, count)
+        return count > self.rate_limit
+
+    def zone(self, domain):
+        return self.records.setdefault(domain, [])
+
+    def handle(self, path, body):
+        """(status_code, response) for one API call"""
+        with self._lock:
+            self.requests += 1
+            if self.throttled():
+                return 503, {"status": "ERROR", "message": "Rate limit exceeded"}
+            if not body.get("apikey") or not body.get("secretapikey"):
+                return 400, {"status": "ERROR", "message": "Invalid API key."}
+
+            if path == "/ping":
+                return 200, {"status": "SUCCESS", "yourIp": "127.0.0.1"}
+
+            match = re.fullmatch(r"/dns/(\w+)/([^/]+)(?:/(.*))?", path)
+            if not match:
+                return 404, {"status": "ERROR", "message": "Unknown endpoint"}
+            action, domain, rest = match.groups()
+            zone = self.zone(domain)
+
+            def full_name(name):
+                return f"{name}.{domain}" if name else domain
+
+            if action == "retrieve":
+                return 200, {"status": "SUCCESS", "records": list(zone)}
+            if action == "retrieveByNameType":
+                record_type, _, name = rest.partition("/")
+                found = [r for r in zone if r["type"] == record_type and r["name"] == full_name(name)]
+                return 200, {"status": "SUCCESS", "records": found}
+            if action == "create":
+                record = {"id": str(next(self._ids)), "name": full_name(body.get("name", "")),
+                          "type": body["type"], "content": body["content"],
+                          "ttl": str(body.get("ttl", "600")), "prio": "0", "notes": ""}
+                zone.append(record)
+                return 200, {"status": "SUCCESS", "id": int(record["id"])}
+            if action == "edit":
+                for record in zone:
+                    if record["id"] == rest:
+                        record.update(name=full_name(body.get("name", "")), type=body["type"],
+                                      content=body["content"], ttl=str(body.get("ttl", "600")))
+                        return 200, {"status": "SUCCESS"}
+                return 400, {"status": "ERROR", "message": "Invalid record ID."}
+            if action == "delete":
+                zone[:] = [r for r in zone if r["id"] != rest]
+                return 200, {"status": "SUCCESS"}
+            if action == "deleteByNameType":
+                record_type, _, name = rest.partition("/")
+                zone[:] = [r for r in zone
+                           if not (r["type"] == record_type and r["name"] == full_name(name))]
+                return 200, {"status": "SUCCESS"}
+            return 404, {"status": "ERROR", "message": "Unknown endpoint"}
+
+
+class FakePorkbunHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            body = {}
+
+        path = self.path[len(PREFIX):] if self.path.startswith(PREFIX) else self.path
+        status, response = self.server.fake.handle(path, body)
+
+        payload = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            print(f"🌐 {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+
+def start(port: int = 8053, rate_limit: float = 0, quiet: bool = False) -> ThreadingHTTPServer:
+    """Run the fake in a background thread (for scripted tests)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakePorkbunHandler)
+    server.fake = FakePorkbun(rate_limit)
+    server.quiet = quiet
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Porkbun DNS API")
+    parser.add_argument("--port", type=int, default=8053)
+    parser.add_argument("--rate-limit", type=float, default=0,
+                        help="requests per second before answering 503 (0 = unlimited)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), FakePorkbunHandler)
+    server.fake = FakePorkbun(args.rate_limit)
+    server.quiet = False
+    print(f"🌐 Fake Porkbun API on http://127.0.0.1:{args.port}{PREFIX}")
+    server.serve_forever()
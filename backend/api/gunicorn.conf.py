@@ -0,0 +1,56 @@
+"""
+Gunicorn configuration for the kurs24.io API (production profile)
+Uvicorn workers on uvloop/httptools, sized from the container's CPU quota.
+Development runs a single `uvicorn --reload` instead (docker-compose.dev.yml).
+"""
+
+import multiprocessing
+import os
+
+
+def container_cpu_count():
+    """CPUs available to this container (cgroup v2/v1 quota, else host count)"""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            return max(1, int(quota) // int(period))
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, quota // period)
+    except (OSError, ValueError):
+        pass
+
+    return multiprocessing.cpu_count()
+
+
+cpus = container_cpu_count()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# Async workers: one event loop per CPU is enough, I/O waits overlap in the loop
+workers = int(os.environ.get('WEB_CONCURRENCY', min(cpus, int(os.environ.get('MAX_WORKERS', 8)))))
+worker_class = 'production_worker.ProductionWorker'
+
+# Each worker opens its own clients/pools in its own event loop
+preload_app = False
+
+# Provisioning runs inside the capture request (DNS propagation up to 5 min
+# plus certificate wait): on stop/reload, workers finish it before exiting.
+# docker-compose stop_grace_period must be longer.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('API_GRACEFUL_TIMEOUT', 600))
+
+# Caddy keeps upstream connections open; stay above its idle timeout
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 75))
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
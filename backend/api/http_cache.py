@@ -0,0 +1,205 @@
+"""Response compression and HTTP caching for the kurs24.io API
+
+HTTPCacheMiddleware buffers responses up to MAX_BUFFER_BYTES and
+- adds a weak ETag to 200 GET responses and answers a matching
+  If-None-Match with 304 (no body, nothing to encode or transfer),
+- sets Cache-Control from the route's policy (default: revalidate),
+- compresses text/JSON bodies above API_COMPRESS_MIN_SIZE with brotli or
+  gzip, whichever the client accepts (brotli only if installed).
+
+Routes declare their policy below the route decorator:
+
+    @app.get("/api/v1/themes")
+    @cache_policy(STATIC)
+    async def get_available_themes(): ...
+"""
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_SIZE = int(os.getenv("API_COMPRESS_MIN_SIZE", "1024"))
+
+# Larger (file/streaming) responses pass through untouched
+MAX_BUFFER_BYTES = 1024 * 1024
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript",
+                      "application/xml", "image/svg+xml")
+
+# Compressed bodies of cacheable routes, keyed by (ETag, encoding)
+COMPRESSED_CACHE_SIZE = 256
+
+
+class CachePolicy:
+    def __init__(self, max_age: int = 0, public: bool = False, no_store: bool = False):
+        self.max_age = max_age
+        self.public = public
+        self.no_store = no_store
+
+    @property
+    def header(self) -> str:
+        if self.no_store:
+            return "no-store"
+        scope = "public" if self.public else "private"
+        return f"{scope}, max-age={self.max_age}" if self.max_age else f"{scope}, no-cache"
+
+
+# Browser revalidates every time, unchanged data costs a 304 (default)
+REVALIDATE = CachePolicy()
+# Same for data that is identical for all users (shared caches may keep it)
+PUBLIC_REVALIDATE = CachePolicy(public=True)
+# Static definitions (THEMES, PLAN_FEATURES) change only with a deploy
+STATIC = CachePolicy(max_age=6 * 3600, public=True)
+# Live data (health, metrics)
+NO_STORE = CachePolicy(no_store=True)
+
+
+def cache_policy(policy: CachePolicy):
+    """Declare the cache policy of a route (put below @app.get)"""
+    def decorator(endpoint):
+        endpoint.cache_policy = policy
+        return endpoint
+    return decorator
+
+
+def weak_etag(body: bytes) -> str:
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:]
+    return any(candidate.strip().removeprefix("W/") == opaque
+               for candidate in if_none_match.split(","))
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class HTTPCacheMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self._compressed: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        start: Dict = {}
+        chunks: List[bytes] = []
+        size = 0
+        passthrough = False
+
+        async def buffered_send(message):
+            nonlocal size, passthrough
+            if passthrough:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                start.update(message)
+                if any(name.lower() == b"content-type" and value.startswith(b"text/event-stream")
+                       for name, value in message.get("headers", [])):
+                    passthrough = True
+                    await send(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                size += len(chunks[-1])
+                if size > MAX_BUFFER_BYTES:
+                    passthrough = True
+                    await send(start)
+                    await send({"type": "http.response.body", "body": b"".join(chunks),
+                                "more_body": message.get("more_body", False)})
+                elif not message.get("more_body", False):
+                    await self.finish(scope, request_headers, start, b"".join(chunks), send)
+            else:
+                await send(message)
+
+        await self.app(scope, receive, buffered_send)
+
+    async def finish(self, scope, request_headers: Dict[str, str], start: Dict, body: bytes, send):
+        status = start["status"]
+        headers = [(k.decode("latin-1").lower(), v.decode("latin-1")) for k, v in start.get("headers", [])]
+        names = {name for name, _ in headers}
+
+        route = scope.get("route")
+        policy = getattr(getattr(route, "endpoint", None), "cache_policy", REVALIDATE)
+
+        etag = None
+        if scope["method"] == "GET" and status == 200 and not policy.no_store:
+            if "etag" in names:
+                etag = next(value for name, value in headers if name == "etag")
+            else:
+                etag = weak_etag(body)
+                headers.append(("etag", etag))
+        if "cache-control" not in names and scope["method"] == "GET" and status < 400:
+            headers.append(("cache-control", policy.header))
+
+        content_type = next((v for n, v in headers if n == "content-type"), "")
+        compressible = content_type.startswith(COMPRESSIBLE_TYPES) and "content-encoding" not in names
+        if compressible:
+            vary = next((v for n, v in headers if n == "vary"), None)
+            if vary is None:
+                headers.append(("vary", "Accept-Encoding"))
+            elif "accept-encoding" not in vary.lower():
+                headers = [(n, f"{v}, Accept-Encoding" if n == "vary" else v) for n, v in headers]
+
+        if etag and etag_matches(request_headers.get("if-none-match", ""), etag):
+            keep = {"etag", "cache-control", "vary"}
+            await self.send(send, 304, [(n, v) for n, v in headers if n in keep], b"")
+            return
+
+        encoding = None
+        if compressible and len(body) >= MIN_SIZE:
+            encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        if encoding:
+            body = self.compressed(body, encoding, etag if policy.max_age else None)
+            headers = [(n, v) for n, v in headers if n != "content-length"]
+            headers += [("content-encoding", encoding), ("content-length", str(len(body)))]
+
+        await self.send(send, status, headers, body)
+
+    def compressed(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        """Compress; bodies of cacheable routes are compressed once per ETag"""
+        if etag is None:
+            return compress(body, encoding)
+        key = (etag, encoding)
+        if key in self._compressed:
+            self._compressed.move_to_end(key)
+            return self._compressed[key]
+        result = self._compressed[key] = compress(body, encoding)
+        while len(self._compressed) > COMPRESSED_CACHE_SIZE:
+            self._compressed.popitem(last=False)
+        return result
+
+    @staticmethod
+    async def send(send, status: int, headers: List[Tuple[str, str]], body: bytes):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(n.encode("latin-1"), v.encode("latin-1")) for n, v in headers],
+        })
+        await send({"type": "http.response.body", "body": body})
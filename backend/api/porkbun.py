@@ -0,0 +1,180 @@
+"""Porkbun DNS client for kurs24.io tenant records
+
+One shared HTTP client (keep-alive to the Porkbun API), idempotent upserts
+that look up the record by name first, a bulk reconcile of all tenant A
+records against the tenants table and retries with backoff when Porkbun
+rate-limits or fails. PORKBUN_API_URL can point at fake_porkbun.py for
+local tests.
+"""
+import asyncio
+import os
+import random
+import time
+from typing import Dict, Any, Iterable, List, Optional
+
+import httpx
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 1
+BACKOFF_MAX_SECONDS = 30
+
+# Porkbun allows only a few requests per second per key
+MAX_CONCURRENT_REQUESTS = 4
+
+# Platform names that point at the server but are no tenants
+INFRASTRUCTURE_NAMES = {"api", "admin", "www", "portal", "mail"}
+
+# Health checks reuse the last ping for this long
+PING_CACHE_SECONDS = 300
+
+
+class PorkbunError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Porkbun API {status_code}: {message}")
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        # 0 = connection error; Porkbun answers rate limits with 429/503
+        return self.status_code in (0, 429) or self.status_code >= 500
+
+
+class PorkbunClient:
+    def __init__(self):
+        self.api_key = os.getenv("PORKBUN_API_KEY", "")
+        self.secret_key = os.getenv("PORKBUN_SECRET_KEY", "")
+        self.base_url = os.getenv("PORKBUN_API_URL", "https://api.porkbun.com/api/json/v3")
+        self.domain = os.getenv("PORKBUN_DOMAIN", "kurs24.io")
+        self.server_ip = os.getenv("SERVER_IP", "152.53.150.111")
+        self.ttl = os.getenv("PORKBUN_TTL", "600")
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._ping = {"checked_at": 0.0, "result": None}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=15)
+            self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(self, path: str, **payload) -> Dict[str, Any]:
+        """POST with credentials; retries rate limits and server errors"""
+        body = {"apikey": self.api_key, "secretapikey": self.secret_key, **payload}
+        client = self.client
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            retry_after = None
+            async with self._semaphore:
+                try:
+                    response = await client.post(path, json=body)
+                except httpx.TransportError as e:
+                    error = PorkbunError(0, str(e))
+                else:
+                    try:
+                        data = response.json()
+                    except ValueError:
+                        data = {"message": response.text[:200]}
+                    if response.status_code == 200 and data.get("status") == "SUCCESS":
+                        return data
+                    error = PorkbunError(response.status_code, data.get("message", "unknown error"))
+                    retry_after = response.headers.get("Retry-After")
+
+            if not error.retryable or attempt == MAX_ATTEMPTS:
+                raise error
+            # Jitter so parallel reconcile calls don't retry in lockstep
+            delay = float(retry_after) if retry_after and retry_after.isdigit() \
+                else min(BACKOFF_BASE_SECONDS * 2 ** (attempt - 1), BACKOFF_MAX_SECONDS)
+            delay = round(delay * random.uniform(1, 1.5), 2)
+            print(f"⏳ Porkbun {path} failed ({error}), retry {attempt}/{MAX_ATTEMPTS - 1} in {delay}s")
+            await asyncio.sleep(delay)
+
+    async def ping(self) -> Dict[str, Any]:
+        """Credential check for health endpoints, cached for PING_CACHE_SECONDS"""
+        now = time.monotonic()
+        if self._ping["result"] is None or now - self._ping["checked_at"] > PING_CACHE_SECONDS:
+            try:
+                await self.request("/ping")
+                result = {"status": "connected", "response": "SUCCESS", "message": "API key valid"}
+            except PorkbunError as e:
+                result = {"status": "error", "error": str(e)[:100]}
+            self._ping.update(checked_at=now, result=result)
+        return self._ping["result"]
+
+    # Records
+
+    async def all_records(self) -> List[Dict[str, Any]]:
+        data = await self.request(f"/dns/retrieve/{self.domain}")
+        return data.get("records", [])
+
+    async def records_by_name(self, subdomain: str, record_type: str = "A") -> List[Dict[str, Any]]:
+        data = await self.request(f"/dns/retrieveByNameType/{self.domain}/{record_type}/{subdomain}")
+        return data.get("records", [])
+
+    async def upsert_a_record(self, subdomain: str, ip: str = None) -> str:
+        """Point subdomain at ip (default SERVER_IP): created/updated/unchanged
+
+        Safe to retry - an existing record is updated instead of duplicated.
+        """
+        return await self._sync_record(subdomain, ip or self.server_ip,
+                                       await self.records_by_name(subdomain))
+
+    async def _sync_record(self, subdomain: str, ip: str, records: List[Dict[str, Any]]) -> str:
+        if not records:
+            await self.request(f"/dns/create/{self.domain}", type="A", name=subdomain,
+                               content=ip, ttl=self.ttl)
+            return "created"
+
+        # Duplicates from earlier non-idempotent provisioning runs
+        for duplicate in records[1:]:
+            await self.request(f"/dns/delete/{self.domain}/{duplicate['id']}")
+
+        if records[0]["content"] == ip:
+            return "unchanged" if len(records) == 1 else "deduplicated"
+        await self.request(f"/dns/edit/{self.domain}/{records[0]['id']}", type="A",
+                           name=subdomain, content=ip, ttl=self.ttl)
+        return "updated"
+
+    async def delete_a_record(self, subdomain: str):
+        await self.request(f"/dns/deleteByNameType/{self.domain}/A/{subdomain}")
+
+    async def reconcile(self, subdomains: Iterable[str]) -> Dict[str, Any]:
+        """Sync the A records of all tenants in one listing
+
+        Only tenant names are touched; A records pointing at SERVER_IP without
+        a tenant are reported as orphans, not deleted.
+        """
+        by_name: Dict[str, List[Dict[str, Any]]] = {}
+        suffix = f".{self.domain}"
+        for record in await self.all_records():
+            if record["type"] == "A" and record["name"].endswith(suffix):
+                by_name.setdefault(record["name"][:-len(suffix)], []).append(record)
+
+        wanted = set(subdomains)
+        results = await asyncio.gather(*(
+            self._sync_record(subdomain, self.server_ip, by_name.get(subdomain, []))
+            for subdomain in sorted(wanted)
+        ), return_exceptions=True)
+
+        summary: Dict[str, Any] = {"created": 0, "updated": 0, "deduplicated": 0,
+                                   "unchanged": 0, "failed": {}}
+        for subdomain, result in zip(sorted(wanted), results):
+            if isinstance(result, Exception):
+                summary["failed"][subdomain] = str(result)
+            else:
+                summary[result] += 1
+        summary["orphans"] = sorted(
+            name for name, records in by_name.items()
+            if name not in wanted and name not in INFRASTRUCTURE_NAMES
+            and "." not in name and "*" not in name
+            and any(record["content"] == self.server_ip for record in records)
+        )
+        return summary
+
+
+porkbun = PorkbunClient()
@@ -0,0 +1,7 @@
+"""Gunicorn worker class for the production profile (see gunicorn.conf.py)"""
+from uvicorn_worker import UvicornWorker
+
+
+class ProductionWorker(UvicornWorker):
+    # Fail at boot instead of silently falling back to asyncio/h11
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
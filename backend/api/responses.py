@@ -0,0 +1,92 @@
+"""Response models and JSON encoding for the billing/invoice/tenant endpoints
+
+The list endpoints let PostgreSQL encode the rows (json_agg over exactly
+the model's fields) and embed the result unparsed in the response, so no
+per-row dicts, float()/isoformat() calls or jsonable_encoder walk happen
+in Python. The models document the payloads (response_model) and define
+the selected columns. benchmark_json.py compares the encoding paths.
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple, Type
+
+import orjson
+from pydantic import BaseModel
+
+
+class BillingEntry(BaseModel):
+    id: int
+    customer_email: str
+    customer_name: Optional[str] = None
+    plan: str
+    amount: float
+    currency: str
+    payment_method: str
+    payment_id: str
+    subdomain: Optional[str] = None
+    status: str
+    invoice_number: str
+    created_at: datetime
+    billing_date: datetime
+
+
+class BillingHistory(BaseModel):
+    status: str
+    customer_email: str
+    total_records: int
+    billing_history: List[BillingEntry]
+
+
+class InvoiceEntry(BaseModel):
+    invoice_number: str
+    customer_email: str
+    customer_name: Optional[str] = None
+    plan: str
+    amount: float
+    currency: str
+    payment_date: datetime
+    payment_method: str
+    subdomain: Optional[str] = None
+    status: str
+    pdf_url: Optional[str] = None
+
+
+class InvoiceHistory(BaseModel):
+    status: str
+    customer_email: Optional[str] = None
+    message: Optional[str] = None
+    total_invoices: int
+    invoices: List[InvoiceEntry]
+
+
+class TenantStatus(BaseModel):
+    status: str
+    subdomain: Optional[str] = None
+    progress: Optional[int] = None
+    domain: Optional[str] = None
+    ssl_status: Optional[str] = None
+    dns_status: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    message: Optional[str] = None
+
+
+def json_columns(model: Type[BaseModel]) -> str:
+    """Select list for model's fields; DECIMAL amounts as JSON numbers like float()"""
+    columns = []
+    for name, field in model.model_fields.items():
+        columns.append(f"{name}::float8 AS {name}" if field.annotation is float else name)
+    return ", ".join(columns)
+
+
+async def fetch_json_list(conn, model: Type[BaseModel], from_sql: str, order_by: str,
+                          *args) -> Tuple[int, orjson.Fragment]:
+    """(row count, JSON array of model-shaped rows) encoded by PostgreSQL
+
+    from_sql is the FROM/WHERE part of the query, order_by a column of model.
+    The array is an orjson.Fragment: ORJSONResponse embeds it as is.
+    """
+    row = await conn.fetchrow(f"""
+        SELECT count(*) AS total,
+               coalesce(json_agg(r ORDER BY r.{order_by} DESC), '[]')::text AS items
+        FROM (SELECT {json_columns(model)} FROM {from_sql}) r
+    """, *args)
+    return row["total"], orjson.Fragment(row["items"])
@@ -0,0 +1,199 @@
+"""Tenant configuration: themes, plan features and live pushes
+
+A tenant container pulls its config from /api/v1/tenant/<id>/config at
+start and every CATALOG_REFRESH_SECONDS. Theme, branding and plan changes
+are pushed right away instead of restarting the container: the change
+bumps tenants.config_version (from one sequence, so versions only grow)
+and the new config is POSTed to the container's /internal/config, signed
+with the tenant's SECRET_KEY. The tenant ignores versions older than the
+one it has, so a late push or pull can't undo a newer change. Hibernated
+or unreachable containers get the current config with their next pull.
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import secrets
+from typing import Dict, Any, Iterable, Optional
+
+import httpx
+
+from tenant_deployer import tenant_deployer, read_env_file
+
+# Theme definitions
+THEMES = {
+    "classic-royal": {
+        "name": "Classic Royal",
+        "primary": "#1e40af",
+        "secondary": "#fbbf24",
+        "description": "Klassisch königlich mit Blau und Gold"
+    },
+    "ocean-blue": {
+        "name": "Ocean Blue",
+        "primary": "#0891b2",
+        "secondary": "#06b6d4",
+        "description": "Frisches Ozean-Blau für moderne Akademien"
+    },
+    "forest-green": {
+        "name": "Forest Green",
+        "primary": "#059669",
+        "secondary": "#10b981",
+        "description": "Natürliches Grün für nachhaltige Bildung"
+    },
+    "sunset-orange": {
+        "name": "Sunset Orange",
+        "primary": "#ea580c",
+        "secondary": "#f97316",
+        "description": "Energetisches Orange für kreative Kurse"
+    },
+    "royal-purple": {
+        "name": "Royal Purple",
+        "primary": "#7c3aed",
+        "secondary": "#a855f7",
+        "description": "Elegantes Lila für Premium-Akademien"
+    }
+}
+
+# Plan features definition
+PLAN_FEATURES = {
+    "basis": {
+        "max_students": 50,
+        "max_courses": 10,
+        "max_storage_mb": 1024,
+        "max_memory_mb": 256,
+        "ai_features": False,
+        "advanced_analytics": False,
+        "custom_branding": True,
+        "api_access": False,
+        "white_label": False,
+        "priority_support": False
+    },
+    "pro": {
+        "max_students": "unlimited",
+        "max_courses": "unlimited",
+        "max_storage_mb": 10240,
+        "max_memory_mb": 1024,
+        "ai_features": True,
+        "advanced_analytics": True,
+        "custom_branding": True,
+        "api_access": True,
+        "white_label": True,
+        "priority_support": True
+    }
+}
+
+
+async def build_tenant_config(conn, tenant_id: str) -> Optional[Dict[str, Any]]:
+    """Complete config of a tenant container, None for unknown tenants"""
+    await config_pusher.ensure_schema(conn)
+    tenant_row = await conn.fetchrow("""
+        SELECT name, email, plan, subdomain, created_at, config_version
+        FROM tenants
+        WHERE subdomain = $1
+    """, tenant_id)
+    if not tenant_row:
+        return None
+
+    # Get tenant customization (if exists)
+    custom_row = await conn.fetchrow("""
+        SELECT color_scheme, academy_name, custom_logo
+        FROM tenant_customizations
+        WHERE tenant_id = $1
+    """, tenant_id)
+
+    color_scheme = custom_row["color_scheme"] if custom_row else "classic-royal"
+    theme = THEMES.get(color_scheme, THEMES["classic-royal"])
+
+    return {
+        "tenant_id": tenant_id,
+        "version": tenant_row["config_version"] or 0,
+        "auth": {
+            "admin_email": tenant_row["email"],
+            "api_key": f"tenant_{tenant_id}_{secrets.token_hex(16)}"
+        },
+        "branding": {
+            "academy_name": custom_row["academy_name"] if custom_row else tenant_row["name"],
+            "color_scheme": color_scheme,
+            "primary_color": theme["primary"],
+            "secondary_color": theme["secondary"],
+            "logo_url": f"/api/v1/tenant/{tenant_id}/logo",
+            "custom_css": f"/api/v1/tenant/{tenant_id}/theme.css",
+            "domain": f"{tenant_id}.kurs24.io"
+        },
+        "features": PLAN_FEATURES.get(tenant_row["plan"], {}),
+        "plan": tenant_row["plan"],
+        "created_at": tenant_row["created_at"].isoformat()
+    }
+
+
+def sign(secret: str, body: bytes) -> str:
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class ConfigPusher:
+    def __init__(self):
+        self.timeout = float(os.getenv("CONFIG_PUSH_TIMEOUT", "5"))
+        self._schema_ready = False
+
+    async def ensure_schema(self, conn):
+        if self._schema_ready:
+            return
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS tenant_customizations (
+                id SERIAL PRIMARY KEY,
+                tenant_id VARCHAR(255) UNIQUE NOT NULL,
+                color_scheme VARCHAR(50) DEFAULT 'classic-royal',
+                academy_name VARCHAR(255),
+                custom_logo BOOLEAN DEFAULT FALSE,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        await conn.execute("CREATE SEQUENCE IF NOT EXISTS tenant_config_version")
+        await conn.execute("ALTER TABLE tenants ADD COLUMN IF NOT EXISTS config_version BIGINT DEFAULT 0")
+        self._schema_ready = True
+
+    async def bump(self, conn, subdomains: Iterable[str]):
+        """New config versions for the given tenants (call in the changing transaction)"""
+        await self.ensure_schema(conn)
+        await conn.execute("""
+            UPDATE tenants SET config_version = nextval('tenant_config_version')
+            WHERE subdomain = ANY($1::text[])
+        """, list(subdomains))
+
+    async def push(self, subdomain: str, config: Dict[str, Any]) -> bool:
+        """POST the config to the running container; False if it didn't take it"""
+        secret = read_env_file(os.path.join(tenant_deployer.tenants_dir, subdomain, ".env")).get("SECRET_KEY")
+        if not secret:
+            print(f"⚠️ Config push to {subdomain} skipped: no SECRET_KEY in .env")
+            return False
+        body = json.dumps(config).encode()
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.post(
+                    f"http://{tenant_deployer.container_name(subdomain)}:5000/internal/config",
+                    content=body,
+                    headers={"Content-Type": "application/json",
+                             "X-Config-Signature": sign(secret, body)}
+                )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            # Hibernated/stopped containers pull the config when they start
+            print(f"⚠️ Config push to {subdomain} failed (picked up with the next pull): {e}")
+            return False
+        print(f"🔄 Config v{config['version']} pushed to {subdomain}")
+        return True
+
+    async def push_current(self, conn, subdomains: Iterable[str]) -> Dict[str, bool]:
+        """Build and push the current config of each tenant"""
+        configs = {}
+        for subdomain in subdomains:
+            config = await build_tenant_config(conn, subdomain)
+            if config is not None:
+                configs[subdomain] = config
+        results = await asyncio.gather(*(self.push(subdomain, config)
+                                         for subdomain, config in configs.items()))
+        return dict(zip(configs, results))
+
+
+config_pusher = ConfigPusher()
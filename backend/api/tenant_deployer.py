@@ -0,0 +1,230 @@
+"""Tenant container deployment for kurs24.io
+
+Renders the tenant's config from the master template in one pass and runs
+the shared tenant image through the Docker Engine API. The tenant directory
+only holds .env, docker-compose.yml (for manual ops) and data/ - the code
+lives in the versioned image all tenants share (TENANT_IMAGE, built by
+scripts/build-tenant-image.sh and pulled/warmed when the API starts).
+"""
+import asyncio
+import os
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from typing import Dict, Any
+
+import httpx
+
+from docker_api import docker_api, DockerError
+
+TEMPLATE_VAR = re.compile(r"\{\{(\w+)\}\}")
+
+# Files rendered from the master template into the tenant directory
+TEMPLATE_FILES = {
+    ".env.template": ".env",
+    "docker-compose.yml": "docker-compose.yml",
+}
+
+
+def render(template: str, variables: Dict[str, str]) -> str:
+    """Substitute all {{VAR}} placeholders in one pass (unknown ones fail)"""
+    return TEMPLATE_VAR.sub(lambda m: str(variables[m.group(1)]), template)
+
+
+def read_env_file(path: str) -> Dict[str, str]:
+    env = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, value = line.split("=", 1)
+                    env[key] = value.strip('"')
+    return env
+
+
+def write_env_file(path: str, env: Dict[str, str]):
+    with open(path, "w") as f:
+        f.writelines(f"{key}={value}\n" for key, value in env.items())
+
+
+class TenantDeployer:
+    def __init__(self):
+        # Paths as seen by the API container and by the Docker host (bind mounts)
+        self.master_dir = os.getenv("MASTER_TEMPLATE_DIR", "/platform/master-template")
+        self.tenants_dir = os.getenv("TENANTS_DIR", "/platform/tenants")
+        self.host_tenants_dir = os.getenv("HOST_TENANTS_DIR", "/home/tba/kurs24-platform/tenants")
+
+        self.image = os.getenv("TENANT_IMAGE", "kurs24-tenant:latest")
+        self.network = os.getenv("TENANT_NETWORK", "caddy-network")
+        self.api_base_url = os.getenv("TENANT_API_BASE_URL", "https://api.kurs24.io")
+        self.ready_timeout = int(os.getenv("TENANT_READY_TIMEOUT", "60"))
+
+        self._image_lock = asyncio.Lock()
+
+    @staticmethod
+    def container_name(subdomain: str) -> str:
+        return f"tenant-{subdomain}-app"
+
+    @contextmanager
+    def step(self, timings: Dict[str, float], name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = round(time.perf_counter() - started, 3)
+            print(f"⏱️ {name}: {timings[name]}s")
+
+    async def deploy(self, subdomain: str, plan: str, email: str = None,
+                     color: str = "classic-royal") -> Dict[str, Any]:
+        """Deploy (or redeploy) a tenant; returns container name and step timings"""
+        timings = {}
+        started = time.perf_counter()
+        print(f"🐳 Deploying tenant {subdomain} ({plan})")
+
+        with self.step(timings, "render_config"):
+            env = self.render_config(subdomain, plan, email, color)
+
+        with self.step(timings, "image"):
+            await self.ensure_image()
+
+        with self.step(timings, "container"):
+            await self.run_container(subdomain, env)
+
+        with self.step(timings, "ready"):
+            ready = await self.wait_until_ready(subdomain)
+
+        timings["total"] = round(time.perf_counter() - started, 3)
+        if ready:
+            print(f"✅ Tenant {subdomain} deployed in {timings['total']}s")
+        else:
+            print(f"⚠️ Tenant {subdomain} not answering after {self.ready_timeout}s")
+            try:
+                logs = await docker_api.container_logs(self.container_name(subdomain), tail=20)
+                print(f"📜 Last log lines of {self.container_name(subdomain)}:\n{logs}")
+            except DockerError as e:
+                print(f"⚠️ No logs of {self.container_name(subdomain)}: {e}")
+
+        return {"container": self.container_name(subdomain), "ready": ready, "timings": timings}
+
+    def render_config(self, subdomain: str, plan: str, email: str, color: str) -> Dict[str, str]:
+        """Write .env and docker-compose.yml; returns the container environment"""
+        tenant_dir = os.path.join(self.tenants_dir, subdomain)
+        os.makedirs(os.path.join(tenant_dir, "data"), exist_ok=True)
+
+        # Redeploys keep the secret so existing sessions stay valid
+        existing = read_env_file(os.path.join(tenant_dir, ".env"))
+        pro = plan == "pro"
+        variables = {
+            "TENANT_ID": subdomain,
+            "TENANT_PLAN": plan,
+            "TENANT_EMAIL": email or "",
+            "TENANT_COLOR": color,
+            "SECRET_KEY": existing.get("SECRET_KEY") or secrets.token_hex(32),
+            "API_BASE_URL": self.api_base_url,
+            "TENANT_IMAGE": self.image,
+            "ENABLE_AI_FEATURES": "true" if pro else "false",
+            "MAX_STUDENTS": "unlimited" if pro else "50",
+            "MAX_COURSES": "unlimited" if pro else "10",
+            "ACADEMY_NAME": subdomain.replace("-", " "),
+        }
+
+        for source, target in TEMPLATE_FILES.items():
+            with open(os.path.join(self.master_dir, source)) as f:
+                content = render(f.read(), variables)
+            with open(os.path.join(tenant_dir, target), "w") as f:
+                f.write(content)
+
+        return read_env_file(os.path.join(tenant_dir, ".env"))
+
+    async def ensure_image(self):
+        """Make the shared tenant image available locally
+
+        Registry images are pulled; a local tag that doesn't exist yet
+        (dev setups) is built from the master template once.
+        """
+        async with self._image_lock:
+            if await docker_api.image_exists(self.image):
+                return
+
+            name = self.image.rsplit(":", 1)[0]
+            if "/" in name:
+                print(f"📥 Pulling tenant image {self.image}")
+                await docker_api.pull_image(self.image)
+                return
+
+            version = self.image.rsplit(":", 1)[1] if ":" in self.image else "latest"
+            print(f"🔨 Building tenant image {self.image} from {self.master_dir}")
+            await docker_api.build_image(self.master_dir, self.image,
+                                         buildargs={"TENANT_IMAGE_VERSION": version})
+
+    def container_config(self, env: Dict[str, str], tenant_dir: str,
+                         labels: Dict[str, str]) -> Dict[str, Any]:
+        """Container config for the shared image; tenant_dir is relative to the tenants dir"""
+        return {
+            "Image": self.image,
+            "Env": [f"{key}={value}" for key, value in env.items()],
+            "Labels": {**labels, "kurs24.image": self.image},
+            "HostConfig": {
+                "Binds": [f"{self.host_tenants_dir}/{tenant_dir}/data:/app/data"],
+                "RestartPolicy": {"Name": "unless-stopped"},
+                "NetworkMode": self.network,
+            },
+        }
+
+    async def run_container(self, subdomain: str, env: Dict[str, str]):
+        """Create and start the tenant container (idempotent)"""
+        name = self.container_name(subdomain)
+        config = self.container_config(env, subdomain, {"kurs24.tenant": subdomain})
+
+        # Redeploys onto a new image version replace the container;
+        # the tenant's state is on the data volume
+        existing = await docker_api.inspect_container(name)
+        if existing is not None:
+            current_image = (existing["Config"].get("Labels") or {}).get("kurs24.image")
+            if current_image == self.image:
+                print(f"♻️ Container {name} exists - starting it")
+                await docker_api.start_container(name)
+                return
+            print(f"⬆️ Replacing {name}: {current_image} -> {self.image}")
+            await docker_api.remove_container(name, force=True)
+
+        await docker_api.create_container(name, config)
+        await docker_api.start_container(name)
+
+    async def wait_until_ready(self, subdomain: str) -> bool:
+        return await self.wait_for_container(self.container_name(subdomain))
+
+    async def wait_for_container(self, name: str) -> bool:
+        """Poll a tenant app over the shared network until it answers"""
+        url = f"http://{name}:5000/auth/login"
+        deadline = time.monotonic() + self.ready_timeout
+        async with httpx.AsyncClient(timeout=2) as client:
+            while time.monotonic() < deadline:
+                try:
+                    response = await client.get(url)
+                    if response.status_code < 500:
+                        return True
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.25)
+        return False
+
+
+tenant_deployer = TenantDeployer()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Deploy a tenant container")
+    parser.add_argument("subdomain")
+    parser.add_argument("plan", nargs="?", default="basis")
+    parser.add_argument("email", nargs="?")
+    parser.add_argument("color", nargs="?", default="classic-royal")
+    args = parser.parse_args()
+
+    result = asyncio.run(tenant_deployer.deploy(args.subdomain, args.plan, args.email, args.color))
+    print(json.dumps(result, indent=2))
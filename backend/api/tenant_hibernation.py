@@ -0,0 +1,107 @@
+"""Idle hibernation and wake-up of tenant containers
+
+The tenant app touches data/.last_request on requests (at most once a
+minute per worker). Running tenant containers whose marker - or start, if
+that is newer - is older than TENANT_IDLE_MINUTES are stopped; their
+memory is free for active academies.
+
+A request for a hibernated academy fails in Caddy with 502 (upstream not
+resolvable). Caddy's error route rewrites it to /internal/wake/<subdomain>/...
+on the API, which starts the container, waits until it answers and proxies
+the held request to it. Concurrent requests share one wake-up.
+"""
+import asyncio
+import os
+import re
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+from coalescing import Coalescer
+from docker_api import docker_api
+from tenant_deployer import tenant_deployer
+
+ACTIVITY_FILE = ".last_request"
+
+TENANT_CONTAINER = re.compile(r"^tenant-(.+)-app$")
+
+
+def parse_docker_time(value: str) -> Optional[float]:
+    """Docker timestamps carry nanoseconds: 2024-05-01T10:00:00.123456789Z"""
+    if not value or value.startswith("0001-"):
+        return None
+    main, _, fraction = value.rstrip("Z").partition(".")
+    started = datetime.fromisoformat(main).replace(tzinfo=timezone.utc)
+    return started.timestamp() + float(f"0.{fraction[:6] or 0}")
+
+
+class HibernationController:
+    def __init__(self):
+        # 0 disables hibernation (wake-up still works)
+        self.idle_minutes = int(os.getenv("TENANT_IDLE_MINUTES", "120"))
+        self.interval = int(os.getenv("TENANT_IDLE_CHECK_SECONDS", "60"))
+        self._wakeups = Coalescer()
+
+    def last_request(self, subdomain: str) -> Optional[float]:
+        path = os.path.join(tenant_deployer.tenants_dir, subdomain, "data", ACTIVITY_FILE)
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    async def last_activity(self, subdomain: str) -> Optional[float]:
+        """Newest of last request and container start (a fresh wake-up counts)"""
+        info = await docker_api.inspect_container(tenant_deployer.container_name(subdomain))
+        if info is None:
+            return None
+        started = parse_docker_time(info["State"].get("StartedAt", ""))
+        times = [t for t in (self.last_request(subdomain), started) if t is not None]
+        return max(times) if times else None
+
+    async def hibernate_idle(self) -> Dict[str, Any]:
+        """Stop running tenant containers idle for longer than idle_minutes"""
+        now = datetime.now(timezone.utc).timestamp()
+        limit = self.idle_minutes * 60
+        running = await docker_api.list_containers(all=False)
+        hibernated = []
+        for container in running:
+            # Claimed pool containers carry the pool label, so match by name
+            names = [name.lstrip("/") for name in container.get("Names", [])]
+            matches = [match for match in map(TENANT_CONTAINER.match, names) if match]
+            if not matches:
+                continue
+            subdomain = matches[0].group(1)
+            last = await self.last_activity(subdomain)
+            if last is None or now - last < limit:
+                continue
+            await docker_api.stop_container(tenant_deployer.container_name(subdomain))
+            hibernated.append(subdomain)
+            print(f"💤 Tenant {subdomain} hibernated (idle {int((now - last) / 60)} min)")
+        return {"running": len(running), "hibernated": hibernated}
+
+    async def wake(self, subdomain: str) -> bool:
+        """Start a hibernated tenant and wait until it answers"""
+        return await self._wakeups.run(subdomain, lambda: self._wake(subdomain))
+
+    async def _wake(self, subdomain: str) -> bool:
+        name = tenant_deployer.container_name(subdomain)
+        info = await docker_api.inspect_container(name)
+        if info is None:
+            return False
+        if not info["State"].get("Running"):
+            print(f"⏰ Waking tenant {subdomain}")
+            await docker_api.start_container(name)
+        return await tenant_deployer.wait_for_container(name)
+
+    async def run_forever(self):
+        if self.idle_minutes <= 0:
+            print("💤 Tenant hibernation disabled (TENANT_IDLE_MINUTES=0)")
+            return
+        while True:
+            try:
+                await self.hibernate_idle()
+            except Exception as e:
+                print(f"⚠️ Hibernation check failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+tenant_hibernation = HibernationController()
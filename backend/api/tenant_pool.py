@@ -0,0 +1,223 @@
+"""Warm pool of pre-started tenant containers for kurs24.io
+
+TENANT_POOL_SIZE idle containers of the shared tenant image are kept
+running with an initialized database. Provisioning claims one instead of
+booting a new container: the container is renamed to
+tenant-<subdomain>-app and the app is bound to the tenant through its
+/internal/claim endpoint (tenant id, branding, admin user); the app
+mails the owner a set-password link through the platform's MAIL_* SMTP
+settings, which pool containers receive in their environment. Pool data
+lives in tenants/_pool/<token>; a claimed tenant's directory is a symlink
+to it, so redeploys mount the same data.
+
+The pool state is Docker itself, so every API worker can claim: containers
+are started as tenant-warming-<token>, renamed to tenant-pool-<token> once
+the app answers, and the rename to the tenant name is atomic - two workers
+can never claim the same container. Refills run in one worker at a time.
+"""
+import asyncio
+import os
+import random
+import secrets
+import shutil
+import time
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+from docker_api import docker_api, DockerError
+from tenant_deployer import tenant_deployer, read_env_file, write_env_file
+from worker_lock import WorkerLock
+
+POOL_DIR = "_pool"
+POOL_PREFIX = "tenant-pool-"
+WARMING_PREFIX = "tenant-warming-"
+
+# How often the background worker checks the pool
+MAINTAIN_SECONDS = 15
+
+# Platform SMTP settings passed to pool containers: the claimed app sends
+# the owner's set-password link itself
+MAIL_SETTINGS = ("MAIL_SERVER", "MAIL_PORT", "MAIL_USE_TLS", "MAIL_USE_SSL",
+                 "MAIL_USERNAME", "MAIL_PASSWORD", "MAIL_DEFAULT_SENDER")
+
+
+class TenantPool:
+    def __init__(self):
+        self.size = int(os.getenv("TENANT_POOL_SIZE", "2"))
+        self._refill_lock = WorkerLock("tenant-pool")
+        self._refilling = asyncio.Lock()
+        self._refill_task: Optional[asyncio.Task] = None
+
+    def pool_dir(self, token: str) -> str:
+        return os.path.join(tenant_deployer.tenants_dir, POOL_DIR, token)
+
+    async def pool_containers(self) -> List[Dict[str, Any]]:
+        """Unclaimed pool containers (warming and ready) with their state"""
+        containers = []
+        for container in await docker_api.list_containers(labels=["kurs24.pool"]):
+            name = container["Names"][0].lstrip("/")
+            if name.startswith((POOL_PREFIX, WARMING_PREFIX)):
+                containers.append({
+                    "name": name,
+                    "token": container["Labels"]["kurs24.pool"],
+                    "ready": name.startswith(POOL_PREFIX),
+                    "current": (container["Labels"].get("kurs24.image") == tenant_deployer.image
+                                and container["State"] == "running"),
+                })
+        return containers
+
+    async def maintain(self):
+        """Background loop (one worker): drop outdated containers, refill"""
+        if self.size <= 0:
+            return
+        first_run = True
+        while True:
+            try:
+                for container in await self.pool_containers():
+                    # Warming leftovers of a crashed worker only on the first run
+                    stale = not container["ready"] and first_run
+                    if not container["current"] or stale:
+                        print(f"🗑️ Removing outdated pool container {container['name']}")
+                        await self.discard(container["name"], container["token"])
+                first_run = False
+                await self.refill()
+            except Exception as e:
+                print(f"⚠️ Pool maintenance failed: {e}")
+            await asyncio.sleep(MAINTAIN_SECONDS)
+
+    async def create(self, token: str) -> str:
+        """Start one idle container; it joins the pool once its app answers"""
+        warming = f"{WARMING_PREFIX}{token}"
+        pool_dir = self.pool_dir(token)
+        os.makedirs(os.path.join(pool_dir, "data"), exist_ok=True)
+
+        env = {
+            "TENANT_ID": f"{POOL_PREFIX}{token}",
+            "SECRET_KEY": secrets.token_hex(32),
+            "POOL_TOKEN": secrets.token_urlsafe(32),
+            "DATABASE_PATH": "/app/data/courses.db",
+            "API_BASE_URL": tenant_deployer.api_base_url,
+            "FLASK_ENV": "production",
+        }
+        env.update({key: os.environ[key] for key in MAIL_SETTINGS if os.getenv(key)})
+        write_env_file(os.path.join(pool_dir, ".env"), env)
+
+        config = tenant_deployer.container_config(env, f"{POOL_DIR}/{token}", {"kurs24.pool": token})
+        await docker_api.create_container(warming, config)
+        await docker_api.start_container(warming)
+
+        if not await tenant_deployer.wait_for_container(warming):
+            await self.discard(warming, token)
+            raise RuntimeError(f"{warming} not answering after {tenant_deployer.ready_timeout}s")
+
+        name = f"{POOL_PREFIX}{token}"
+        await docker_api.rename_container(warming, name)
+        return name
+
+    async def refill(self):
+        """Start containers until the pool is full (skipped if another worker refills)"""
+        if self.size <= 0 or self._refilling.locked() or not self._refill_lock.try_acquire():
+            return
+        try:
+            async with self._refilling:
+                missing = self.size - len(await self.pool_containers())
+                for _ in range(max(missing, 0)):
+                    try:
+                        name = await self.create(secrets.token_hex(6))
+                    except Exception as e:
+                        print(f"⚠️ Pool container start failed: {e}")
+                        return
+                    print(f"🔥 Pool container {name} ready")
+        finally:
+            self._refill_lock.release()
+
+    def schedule_refill(self):
+        """Refill in the background after a claim (one task at a time)"""
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self.refill())
+
+    async def discard(self, name: str, token: str):
+        await docker_api.remove_container(name, force=True)
+        shutil.rmtree(self.pool_dir(token), ignore_errors=True)
+
+    async def take(self, subdomain: str) -> Optional[str]:
+        """Atomically rename a ready pool container to the tenant's name; its token"""
+        ready = [c for c in await self.pool_containers() if c["ready"] and c["current"]]
+        random.shuffle(ready)
+        for container in ready:
+            try:
+                await docker_api.rename_container(container["name"],
+                                                  tenant_deployer.container_name(subdomain))
+                return container["token"]
+            except DockerError as e:
+                if e.status_code == 409:
+                    return None  # a container with the tenant's name exists
+                if e.status_code != 404:
+                    raise
+                # 404: another worker claimed it first
+        return None
+
+    async def claim(self, subdomain: str, plan: str, email: str = None,
+                    color: str = "classic-royal") -> Optional[Dict[str, Any]]:
+        """Bind a warm container to a new tenant
+
+        Returns the same result as TenantDeployer.deploy, or None if the
+        pool can't serve the request (empty pool, redeploy, no owner email)
+        and the caller has to deploy normally.
+        """
+        tenant_dir = os.path.join(tenant_deployer.tenants_dir, subdomain)
+        if self.size <= 0 or not email or os.path.lexists(tenant_dir):
+            return None
+
+        timings = {}
+        started = time.perf_counter()
+        name = tenant_deployer.container_name(subdomain)
+
+        with tenant_deployer.step(timings, "take"):
+            token = await self.take(subdomain)
+        if token is None:
+            return None
+        print(f"⚡ Claimed pool container {POOL_PREFIX}{token} for {subdomain} ({plan})")
+
+        try:
+            pool_env = read_env_file(os.path.join(self.pool_dir(token), ".env"))
+            os.symlink(os.path.join(POOL_DIR, token), tenant_dir)
+
+            # .env keeps the pool container's SECRET_KEY for later redeploys
+            with tenant_deployer.step(timings, "render_config"):
+                env = tenant_deployer.render_config(subdomain, plan, email, color)
+
+            with tenant_deployer.step(timings, "bind"):
+                await self.bind(name, pool_env["POOL_TOKEN"], {
+                    "tenant_id": subdomain,
+                    "plan": plan,
+                    "email": email,
+                    "color": color,
+                    "academy_name": env.get("ACADEMY_NAME"),
+                })
+        except Exception as e:
+            print(f"⚠️ Binding {name} failed: {e}")
+            if os.path.islink(tenant_dir):
+                os.unlink(tenant_dir)
+            await self.discard(name, token)
+            return None
+        finally:
+            self.schedule_refill()
+
+        timings["total"] = round(time.perf_counter() - started, 3)
+        print(f"✅ Tenant {subdomain} claimed in {timings['total']}s")
+        return {"container": name, "ready": True, "pooled": True, "timings": timings}
+
+    async def bind(self, name: str, pool_token: str, binding: Dict[str, str]):
+        """Hand the tenant identity to the app; it stores it on its data volume"""
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.post(
+                f"http://{name}:5000/internal/claim",
+                json=binding,
+                headers={"X-Pool-Token": pool_token}
+            )
+            response.raise_for_status()
+
+
+tenant_pool = TenantPool()
@@ -0,0 +1,43 @@
+"""File locks shared by the API worker processes of one container
+
+Background jobs (pool maintenance, Caddy reconcile) must run once per
+container, not once per gunicorn worker.
+"""
+import asyncio
+import fcntl
+import os
+
+LOCK_DIR = os.getenv("API_LOCK_DIR", "/tmp")
+
+
+class WorkerLock:
+    def __init__(self, name: str):
+        self.path = os.path.join(LOCK_DIR, f"kurs24-api-{name}.lock")
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        """Take the lock without blocking; True if this process holds it"""
+        if self._file is not None:
+            return True
+        lock_file = open(self.path, "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def wait(self, retry_seconds: float = 10):
+        """Wait until this process holds the lock (e.g. the holder exited)"""
+        while not self.try_acquire():
+            await asyncio.sleep(retry_seconds)
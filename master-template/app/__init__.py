@@ -8,14 +8,54 @@ from flask_cors import CORS
 import os
 import sqlite3
 
+from app.auth import TTLCache
+from app.catalog import init_catalog
+from app.assets import init_assets
+from app.translation import init_translation
+from app.mail_queue import create_mail_table, init_mail
+from app.email_templates import init_email_templates
+from app.sms import create_sms_table, init_sms
+from app.tenant_binding import init_tenant_binding
+from app.activity import init_activity
+from app.live_config import init_live_config
+
 def create_app():
     """Application Factory Pattern"""
     app = Flask(__name__)
     
     # Configuration
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
-    app.config['DATABASE'] = os.path.join(app.root_path, '..', 'data', 'courses.db')
+    app.config['DATABASE'] = os.environ.get(
+        'DATABASE_PATH', os.path.join(app.root_path, '..', 'data', 'courses.db'))
     app.config['TENANT_ID'] = os.environ.get('TENANT_ID', 'demo-tenant')
+    app.config['ACADEMY_NAME'] = os.environ.get('ACADEMY_NAME')
+    app.config['USER_CACHE_TTL'] = int(os.environ.get('USER_CACHE_TTL', 30))
+    app.config['API_BASE_URL'] = os.environ.get('API_BASE_URL')
+    app.config['CATALOG_REFRESH_SECONDS'] = int(os.environ.get('CATALOG_REFRESH_SECONDS', 300))
+    app.config['TRANSLATION_PROVIDER'] = os.environ.get('TRANSLATION_PROVIDER', 'mymemory')
+    app.config['TRANSLATION_MAX_CALLS'] = int(os.environ.get('TRANSLATION_MAX_CALLS', 20))
+    app.config['TRANSLATION_BUDGET_SECONDS'] = int(os.environ.get('TRANSLATION_BUDGET_SECONDS', 15))
+    app.config['MAIL_SERVER'] = os.environ.get('MAIL_SERVER')
+    app.config['MAIL_PORT'] = int(os.environ.get('MAIL_PORT', 587))
+    app.config['MAIL_USE_TLS'] = os.environ.get('MAIL_USE_TLS', 'true').lower() == 'true'
+    app.config['MAIL_USE_SSL'] = os.environ.get('MAIL_USE_SSL', 'false').lower() == 'true'
+    app.config['MAIL_USERNAME'] = os.environ.get('MAIL_USERNAME')
+    app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD')
+    app.config['MAIL_DEFAULT_SENDER'] = os.environ.get('MAIL_DEFAULT_SENDER', 'noreply@kurs24.io')
+    app.config['MAIL_IDLE_TIMEOUT'] = int(os.environ.get('MAIL_IDLE_TIMEOUT', 60))
+    app.config['SMS_PROVIDER'] = os.environ.get('SMS_PROVIDER', 'twilio')
+    app.config['TWILIO_ACCOUNT_SID'] = os.environ.get('TWILIO_ACCOUNT_SID')
+    app.config['TWILIO_AUTH_TOKEN'] = os.environ.get('TWILIO_AUTH_TOKEN')
+    app.config['TWILIO_PHONE_NUMBER'] = os.environ.get('TWILIO_PHONE_NUMBER')
+    app.config['SMS_RATE_PER_SECOND'] = float(os.environ.get('SMS_RATE_PER_SECOND', 1))
+    app.config['SMS_BURST'] = int(os.environ.get('SMS_BURST', 1))
+    app.config['SMS_STATUS_POLL_SECONDS'] = int(os.environ.get('SMS_STATUS_POLL_SECONDS', 60))
+    app.config['POOL_TOKEN'] = os.environ.get('POOL_TOKEN')
+    app.config['ACTIVITY_TOUCH_SECONDS'] = int(os.environ.get('ACTIVITY_TOUCH_SECONDS', 60))
+    app.config['CONFIG_CHECK_SECONDS'] = float(os.environ.get('CONFIG_CHECK_SECONDS', 1))
+    
+    # Warm pool containers: tenant identity from tenant.json once claimed
+    init_tenant_binding(app)
     
     # Enable CORS for API endpoints
     CORS(app, resources={r"/api/*": {"origins": "*"}})
@@ -23,18 +63,52 @@ def create_app():
     # Initialize database
     init_db(app)
     
+    # Per-process cache for session user lookups
+    app.extensions['user_cache'] = TTLCache(ttl=app.config['USER_CACHE_TTL'])
+    app.teardown_appcontext(close_db)
+    
+    # Branding and content stats snapshot for all templates
+    init_catalog(app)
+    
+    # Theme/plan updates pushed by the platform API (no restart)
+    init_live_config(app)
+    
+    # Fingerprinted static assets (built by build_assets.py)
+    init_assets(app)
+    
+    # Server-side translations stored in course_content
+    init_translation(app)
+    
+    # Outbound mail queue (outbound_mail table + sender thread)
+    init_mail(app)
+    
+    # Branded email templates (inlined by build_assets.py)
+    init_email_templates(app)
+    
+    # Outbound SMS queue (outbound_sms table + rate-limited dispatcher)
+    init_sms(app)
+    
+    # Last-request marker for idle hibernation by the platform API
+    init_activity(app)
+    
     # Register Blueprints
     from app.routes import main_bp, api_bp, auth_bp
+    from app.admin_routes import admin_bp
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
     app.register_blueprint(auth_bp, url_prefix='/auth')
+    app.register_blueprint(admin_bp)
     
     return app
 
 
 def init_db(app):
     """Initialize database with content-driven schema"""
-    db_path = app.config['DATABASE']
+    init_database(app.config['DATABASE'])
+
+
+def init_database(db_path):
+    """Create schema and apply column migrations for a database file"""
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
     
     if not os.path.exists(db_path):
@@ -125,6 +199,36 @@ def init_db(app):
         
         conn.commit()
         conn.close()
+    
+    conn = sqlite3.connect(db_path)
+    migrate_users_table(conn)
+    create_mail_table(conn)
+    create_sms_table(conn)
+    conn.commit()
+    conn.close()
+
+
+# Columns added to users after the initial schema: (name, definition)
+USER_COLUMNS = [
+    ('phone', 'TEXT'),
+    ('contact_type', "TEXT DEFAULT 'email'"),
+    ('is_approved', 'BOOLEAN DEFAULT TRUE'),
+    ('is_active', 'BOOLEAN DEFAULT TRUE'),
+    ('is_admin', 'BOOLEAN DEFAULT FALSE'),
+    ('last_login', 'TIMESTAMP'),
+    ('perm_version', 'INTEGER DEFAULT 0'),
+    ('password_token', 'TEXT'),
+    ('password_token_expires', 'REAL'),
+]
+
+
+def migrate_users_table(conn):
+    """Add missing users columns to existing databases"""
+    existing = {row[1] for row in conn.execute('PRAGMA table_info(users)')}
+    for name, definition in USER_COLUMNS:
+        if name not in existing:
+            conn.execute(f'ALTER TABLE users ADD COLUMN {name} {definition}')
+    conn.commit()
 
 
 def get_db():
@@ -139,4 +243,13 @@ def get_db():
         )
         g.db.row_factory = sqlite3.Row
     
-    return g.db
\ No newline at end of file
+    return g.db
+
+
+def close_db(exc=None):
+    """Close the request's database connection"""
+    from flask import g
+    
+    db = g.pop('db', None)
+    if db is not None:
+        db.close()
@@ -0,0 +1,49 @@
+"""
+Request activity marker
+The platform hibernates tenant containers without traffic; it reads the
+modification time of data/.last_request, which each worker touches at
+most once per ACTIVITY_TOUCH_SECONDS
+"""
+
+import os
+import time
+
+from flask import request
+
+ACTIVITY_FILE = '.last_request'
+
+
+def activity_path(db_path):
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), ACTIVITY_FILE)
+
+
+class ActivityMarker:
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self._touched = 0.0
+
+    def touch(self):
+        now = time.monotonic()
+        if now - self._touched < self.interval:
+            return
+        self._touched = now
+        try:
+            with open(self.path, 'a'):
+                os.utime(self.path, None)
+        except OSError:
+            pass
+
+
+def init_activity(app):
+    """Mark every request except the platform's internal calls"""
+    marker = ActivityMarker(activity_path(app.config['DATABASE']),
+                            app.config['ACTIVITY_TOUCH_SECONDS'])
+    app.extensions['activity'] = marker
+
+    @app.before_request
+    def mark_activity():
+        if not request.path.startswith('/internal/'):
+            marker.touch()
+
+    return marker
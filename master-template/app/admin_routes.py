@@ -1,54 +1,32 @@
 from flask import Blueprint, render_template, redirect, url_for, request, jsonify, session, flash
-from functools import wraps
-import sqlite3
-import os
 from werkzeug.security import generate_password_hash
 
-admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
+from app import get_db
+from app.auth import admin_required, bump_permissions, invalidate_user
 
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            return redirect(url_for('auth.login'))
-        
-        conn = sqlite3.connect(os.environ.get('DATABASE_PATH', '/app/data/begriffe.db'))
-        cursor = conn.cursor()
-        cursor.execute('SELECT is_admin FROM users WHERE id = ?', (session['user_id'],))
-        user = cursor.fetchone()
-        conn.close()
-        
-        if not user or not user[0]:
-            flash('Zugang verweigert. Admin-Berechtigung erforderlich.', 'error')
-            return redirect(url_for('main.index'))
-        
-        return f(*args, **kwargs)
-    return decorated_function
+admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
 @admin_bp.route('/users')
 @admin_required
 def users():
-    conn = sqlite3.connect(os.environ.get('DATABASE_PATH', '/app/data/begriffe.db'))
-    cursor = conn.cursor()
-    cursor.execute('''
+    db = get_db()
+    users = db.execute('''
         SELECT id, username, email, phone, contact_type, is_verified, is_approved, 
-               is_active, is_admin, created_at, last_login
+               is_active, is_admin, CAST(created_at AS TEXT) AS created_at,
+               CAST(last_login AS TEXT) AS last_login
         FROM users
         ORDER BY created_at DESC
-    ''')
-    users = cursor.fetchall()
-    conn.close()
+    ''').fetchall()
     
     return render_template('admin_users_new.html', users=users)
 
 @admin_bp.route('/users/<int:user_id>/approve', methods=['POST'])
 @admin_required
 def approve_user(user_id):
-    conn = sqlite3.connect(os.environ.get('DATABASE_PATH', '/app/data/begriffe.db'))
-    cursor = conn.cursor()
-    cursor.execute('UPDATE users SET is_approved = 1 WHERE id = ?', (user_id,))
-    conn.commit()
-    conn.close()
+    db = get_db()
+    db.execute('UPDATE users SET is_approved = 1 WHERE id = ?', (user_id,))
+    db.commit()
+    invalidate_user(user_id)
     
     flash('Benutzer wurde freigegeben.', 'success')
     return redirect(url_for('admin.users'))
@@ -56,11 +34,10 @@ def approve_user(user_id):
 @admin_bp.route('/users/<int:user_id>/reject', methods=['POST'])
 @admin_required
 def reject_user(user_id):
-    conn = sqlite3.connect(os.environ.get('DATABASE_PATH', '/app/data/begriffe.db'))
-    cursor = conn.cursor()
-    cursor.execute('UPDATE users SET is_approved = 0 WHERE id = ?', (user_id,))
-    conn.commit()
-    conn.close()
+    db = get_db()
+    db.execute('UPDATE users SET is_approved = 0 WHERE id = ?', (user_id,))
+    db.commit()
+    invalidate_user(user_id)
     
     flash('Benutzerfreigabe wurde zurückgenommen.', 'warning')
     return redirect(url_for('admin.users'))
@@ -73,18 +50,16 @@ def toggle_admin(user_id):
         flash('Sie können Ihre eigenen Admin-Rechte nicht ändern.', 'error')
         return redirect(url_for('admin.users'))
     
-    conn = sqlite3.connect(os.environ.get('DATABASE_PATH', '/app/data/begriffe.db'))
-    cursor = conn.cursor()
-    cursor.execute('SELECT is_admin FROM users WHERE id = ?', (user_id,))
-    user = cursor.fetchone()
+    db = get_db()
+    user = db.execute('SELECT is_admin FROM users WHERE id = ?', (user_id,)).fetchone()
     
     if user:
         new_admin_status = 0 if user[0] else 1
-        cursor.execute('UPDATE users SET is_admin = ? WHERE id = ?', (new_admin_status, user_id))
-        conn.commit()
+        db.execute('UPDATE users SET is_admin = ? WHERE id = ?', (new_admin_status, user_id))
+        bump_permissions(db, user_id)
+        db.commit()
         flash(f'Admin-Status wurde {"aktiviert" if new_admin_status else "deaktiviert"}.', 'success')
     
-    conn.close()
     return redirect(url_for('admin.users'))
 
 @admin_bp.route('/users/<int:user_id>/toggle-active', methods=['POST'])
@@ -95,33 +70,63 @@ def toggle_active(user_id):
         flash('Sie können Ihren eigenen Account nicht deaktivieren.', 'error')
         return redirect(url_for('admin.users'))
     
-    conn = sqlite3.connect(os.environ.get('DATABASE_PATH', '/app/data/begriffe.db'))
-    cursor = conn.cursor()
-    cursor.execute('SELECT is_active FROM users WHERE id = ?', (user_id,))
-    user = cursor.fetchone()
+    db = get_db()
+    user = db.execute('SELECT is_active FROM users WHERE id = ?', (user_id,)).fetchone()
     
     if user:
         new_active_status = 0 if user[0] else 1
-        cursor.execute('UPDATE users SET is_active = ? WHERE id = ?', (new_active_status, user_id))
-        conn.commit()
+        db.execute('UPDATE users SET is_active = ? WHERE id = ?', (new_active_status, user_id))
+        bump_permissions(db, user_id)
+        db.commit()
         flash(f'Benutzer wurde {"aktiviert" if new_active_status else "deaktiviert"}.', 'success')
     
-    conn.close()
     return redirect(url_for('admin.users'))
 
 @admin_bp.route('/make-dozent/<username>', methods=['POST'])
 @admin_required
 def make_dozent(username):
-    conn = sqlite3.connect(os.environ.get('DATABASE_PATH', '/app/data/begriffe.db'))
-    cursor = conn.cursor()
-    cursor.execute('UPDATE users SET is_admin = 1, is_approved = 1 WHERE username = ?', (username,))
-    affected = cursor.rowcount
-    conn.commit()
-    conn.close()
+    db = get_db()
+    user = db.execute('SELECT id FROM users WHERE username = ?', (username,)).fetchone()
     
-    if affected > 0:
+    if user:
+        db.execute('UPDATE users SET is_admin = 1, is_approved = 1 WHERE id = ?', (user['id'],))
+        bump_permissions(db, user['id'])
+        db.commit()
         flash(f'Benutzer "{username}" wurde als Dozent mit Admin-Rechten eingerichtet.', 'success')
     else:
         flash(f'Benutzer "{username}" wurde nicht gefunden.', 'error')
     
-    return redirect(url_for('admin.users'))
\ No newline at end of file
+    return redirect(url_for('admin.users'))
+
+@admin_bp.route('/announcements', methods=['POST'])
+@admin_required
+def send_announcement():
+    from app.email_service import send_announcement as queue_announcement
+    
+    title = request.form.get('title', '').strip()
+    message = request.form.get('message', '').strip()
+    if not title or not message:
+        flash('Bitte Betreff und Nachricht angeben.', 'error')
+        return redirect(url_for('admin.users'))
+    
+    count = queue_announcement(title, message)
+    flash(f'Ankündigung an {count} Teilnehmer wird versendet.', 'success')
+    return redirect(url_for('admin.users'))
+
+@admin_bp.route('/sms-reminders', methods=['POST'])
+@admin_required
+def send_sms_reminder():
+    from flask import current_app
+    from app.email_service import send_sms_reminder as queue_reminder
+    
+    message = request.form.get('message', '').strip()
+    if not message:
+        flash('Bitte eine Nachricht angeben.', 'error')
+        return redirect(url_for('admin.users'))
+    if current_app.extensions.get('sms_dispatcher') is None:
+        flash('SMS-Service nicht konfiguriert.', 'error')
+        return redirect(url_for('admin.users'))
+    
+    count = queue_reminder(message)
+    flash(f'SMS-Erinnerung an {count} Teilnehmer wird versendet.', 'success')
+    return redirect(url_for('admin.users'))
@@ -0,0 +1,173 @@
+"""
+Static asset pipeline
+Build step: bundle + minify CSS/JS, hashed filenames, manifest, gzip/brotli
+Runtime: asset_url() helper and immutable serving of the built files
+
+Build:  python build_assets.py
+"""
+
+from flask import current_app, request, send_from_directory, url_for
+import gzip
+import hashlib
+import json
+import os
+import re
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip variants are built without it
+    brotli = None
+
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+
+# Logical name -> source files (relative to app/static), concatenated in order
+BUNDLES = {
+    'css/theme.css': ['css/theme.css'],
+    'css/style.css': ['css/style.css'],
+    'css/styles.css': ['css/styles.css'],
+    'css/dozent.css': ['css/dozent.css'],
+    'css/content/flashcards.css': ['css/content/flashcards.css'],
+    'js/app.js': ['js/app.js'],
+    'js/dozent.js': ['js/dozent.js'],
+    'js/lernen.js': ['js/app.js', 'js/quiz.js'],
+    'js/settings.js': ['js/translations.js', 'js/settings.js'],
+    'js/content/begriffswand.js': ['js/translations.js', 'js/content/begriffswand.js'],
+    'js/content/quiz.js': ['js/content/quiz.js'],
+    'js/content/flashcards.js': ['js/translations.js', 'js/content/flashcards.js'],
+}
+
+# Smaller files gain nothing from compression
+COMPRESS_MIN_BYTES = 512
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+# =============================================================================
+# Build
+# =============================================================================
+
+def minify_css(css):
+    """Strip comments and redundant whitespace"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    # No space before ':' - it is significant in selectors ("a :hover")
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(js):
+    """Conservative: drop indentation, blank lines and whole-line comments
+
+    Anything inside a line is left alone so strings, regex literals and
+    URLs can't be broken without a real JS parser.
+    """
+    lines = []
+    in_block_comment = False
+    for line in js.splitlines():
+        stripped = line.strip()
+        if in_block_comment:
+            if '*/' in stripped:
+                in_block_comment = False
+            continue
+        if stripped.startswith('/*'):
+            in_block_comment = '*/' not in stripped
+            continue
+        if not stripped or stripped.startswith('//'):
+            continue
+        lines.append(stripped)
+    return '\n'.join(lines) + '\n'
+
+
+def build_assets(static_dir):
+    """Build all bundles into static/dist and write the manifest"""
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    manifest = {}
+    for name, sources in BUNDLES.items():
+        parts = []
+        for source in sources:
+            with open(os.path.join(static_dir, source), encoding='utf-8') as f:
+                parts.append(f.read())
+
+        if name.endswith('.css'):
+            content = minify_css('\n'.join(parts))
+        else:
+            # Separate files with ';' so ASI quirks can't join statements
+            content = ';\n'.join(minify_js(part) for part in parts)
+
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        stem, ext = os.path.splitext(name)
+        hashed_name = f'{stem}.{digest}{ext}'
+
+        target = os.path.join(dist_dir, hashed_name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+
+        if len(data) >= COMPRESS_MIN_BYTES:
+            with open(target + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(target + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+
+        manifest[name] = hashed_name
+        print(f"📦 {name} -> {DIST_DIR}/{hashed_name} ({len(data)} bytes)")
+
+    with open(os.path.join(dist_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
+
+
+# =============================================================================
+# Runtime
+# =============================================================================
+
+def load_manifest(static_dir):
+    try:
+        with open(os.path.join(static_dir, DIST_DIR, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def asset_url(name):
+    """URL of the built asset, falling back to the unbuilt source file"""
+    hashed_name = current_app.extensions['asset_manifest'].get(name)
+    if hashed_name is None:
+        return url_for('static', filename=name)
+    return url_for('dist_asset', filename=hashed_name)
+
+
+def serve_dist_asset(filename):
+    """Serve a fingerprinted file, precompressed if the client accepts it"""
+    dist_dir = os.path.join(current_app.static_folder, DIST_DIR)
+    # Quality lookup: 'br;q=0' refuses br, '*' matches any coding
+    accepted = request.accept_encodings
+
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if accepted[encoding] > 0 and os.path.isfile(os.path.join(dist_dir, filename + suffix)):
+            response = send_from_directory(dist_dir, filename + suffix, max_age=IMMUTABLE_MAX_AGE)
+            response.headers['Content-Encoding'] = encoding
+            response.mimetype = 'text/css' if filename.endswith('.css') else 'application/javascript'
+            break
+    else:
+        response = send_from_directory(dist_dir, filename, max_age=IMMUTABLE_MAX_AGE)
+
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_assets(app):
+    """Load the manifest and register asset_url / the dist route"""
+    app.extensions['asset_manifest'] = load_manifest(app.static_folder)
+    app.add_url_rule(f'{app.static_url_path}/{DIST_DIR}/<path:filename>',
+                     'dist_asset', serve_dist_asset)
+    app.add_template_global(asset_url)
@@ -0,0 +1,172 @@
+"""
+Session user loading and permission checks
+Request-scoped user lookup backed by a small per-process TTL cache
+"""
+
+from flask import g, session, current_app, redirect, url_for, flash
+from functools import wraps
+import hashlib
+import secrets
+import threading
+import time
+
+# Validity of a one-time set-password link
+PASSWORD_TOKEN_SECONDS = 7 * 24 * 3600
+
+
+class TTLCache:
+    """Tiny thread-safe key/value cache with per-entry expiry"""
+
+    def __init__(self, ttl=30, max_size=1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.max_size:
+                # Drop the entry closest to expiry to make room
+                oldest = min(self._data, key=lambda k: self._data[k][0])
+                del self._data[oldest]
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def _user_cache():
+    return current_app.extensions['user_cache']
+
+
+def is_admin_user(user):
+    """Admin rights come from the legacy is_admin flag or the admin role"""
+    return bool(user['is_admin']) or user['role'] == 'admin'
+
+
+def login_user(user):
+    """Store identity and permission stamp in the signed session"""
+    session['user_id'] = user['id']
+    session['username'] = user['username']
+    session['role'] = user['role']
+    session['is_admin'] = is_admin_user(user)
+    session['perm_version'] = user['perm_version']
+    session['user_language'] = user['preferred_language']
+    session['translate_to'] = user['translate_to']
+
+
+def load_user():
+    """Return the logged-in user as dict, or None
+
+    Looked up once per request (g.user) and cached per process for
+    USER_CACHE_TTL seconds. If the user's perm_version moved on since
+    login, the session permissions are refreshed from the row; inactive
+    or deleted users are logged out.
+    """
+    if 'user' in g:
+        return g.user
+
+    user_id = session.get('user_id')
+    if user_id is None:
+        g.user = None
+        return None
+
+    cache = _user_cache()
+    user = cache.get(user_id)
+    if user is None:
+        from app import get_db
+        row = get_db().execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
+        user = dict(row) if row else None
+        if user is not None:
+            user.pop('password_hash', None)
+            cache.set(user_id, user)
+
+    if user is None or not user['is_active']:
+        session.clear()
+        g.user = None
+        return None
+
+    if session.get('perm_version') != user['perm_version']:
+        session['role'] = user['role']
+        session['is_admin'] = is_admin_user(user)
+        session['perm_version'] = user['perm_version']
+
+    g.user = user
+    return user
+
+
+def invalidate_user(user_id):
+    """Drop a user from the cache after their row changed"""
+    _user_cache().delete(user_id)
+    if g.get('user') and g.user['id'] == user_id:
+        g.pop('user')
+
+
+def bump_permissions(db, user_id):
+    """Increase perm_version so existing sessions pick up role changes"""
+    db.execute('UPDATE users SET perm_version = perm_version + 1 WHERE id = ?', (user_id,))
+    invalidate_user(user_id)
+
+
+def admin_required(f):
+    """Require a logged-in admin, checked against the session stamp"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if load_user() is None:
+            return redirect(url_for('auth.login'))
+
+        if not session.get('is_admin'):
+            flash('Zugang verweigert. Admin-Berechtigung erforderlich.', 'error')
+            return redirect(url_for('main.index'))
+
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def _token_hash(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def create_password_token(db, user_id):
+    """One-time token for a set-password link; only its hash is stored"""
+    token = secrets.token_urlsafe(32)
+    db.execute('''
+        UPDATE users SET password_token = ?, password_token_expires = ?
+        WHERE id = ?
+    ''', (_token_hash(token), time.time() + PASSWORD_TOKEN_SECONDS, user_id))
+    return token
+
+
+def find_password_token(db, token):
+    """User row of a valid set-password token, else None"""
+    user = db.execute('SELECT * FROM users WHERE password_token = ?',
+                      (_token_hash(token),)).fetchone()
+    if user is None or (user['password_token_expires'] or 0) < time.time():
+        return None
+    return user
+
+
+def use_password_token(db, user_id, password_hash):
+    """Set the password and invalidate the token"""
+    db.execute('''
+        UPDATE users SET password_hash = ?, password_token = NULL,
+                         password_token_expires = NULL
+        WHERE id = ?
+    ''', (password_hash, user_id))
+    invalidate_user(user_id)
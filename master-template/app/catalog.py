@@ -0,0 +1,160 @@
+"""
+Course catalog snapshot
+Branding and content stats held in memory so public pages skip SQLite
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+
+import requests
+
+
+class CatalogSnapshot:
+    """In-memory copy of course metadata, content counts and theme
+
+    Loaded at startup, refreshed by a background thread every
+    CATALOG_REFRESH_SECONDS and whenever request_refresh() is called
+    after a write. Branding and plan also arrive as pushed, versioned
+    updates (see live_config); older versions never replace newer ones.
+    """
+
+    def __init__(self, app):
+        self.db_path = app.config['DATABASE']
+        self.tenant_id = app.config['TENANT_ID']
+        self.api_base_url = app.config.get('API_BASE_URL')
+        self.interval = app.config['CATALOG_REFRESH_SECONDS']
+
+        self.course = None
+        self.content_counts = {}
+        self.total_content = 0
+        self.active_users = 0
+        self.branding = {}
+        self.plan = app.config.get('TENANT_PLAN')
+        self.features = {}
+        self.config_version = 0
+        self.loaded_at = None
+
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+
+    def refresh(self, fetch_theme=True):
+        """Reload the snapshot from SQLite (and the backend config)"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            course = conn.execute('SELECT * FROM courses LIMIT 1').fetchone()
+            counts = conn.execute('''
+                SELECT type, COUNT(*) as count FROM course_content
+                WHERE status = 'active'
+                GROUP BY type
+            ''').fetchall()
+            users = conn.execute('SELECT COUNT(*) as count FROM users').fetchone()
+        finally:
+            conn.close()
+
+        config = self.fetch_config() if fetch_theme else None
+
+        with self._lock:
+            self.course = dict(course) if course else None
+            self.content_counts = {row['type']: row['count'] for row in counts}
+            self.total_content = sum(self.content_counts.values())
+            self.active_users = users['count']
+            self.loaded_at = time.time()
+        if config is not None:
+            self.apply_config(config)
+
+    def apply_config(self, config):
+        """Take branding, plan and features from a tenant config
+
+        False if a newer version is already applied. Configs without a
+        version (0) are applied as long as no pushed version arrived.
+        """
+        version = int(config.get('version') or 0)
+        with self._lock:
+            if version < self.config_version:
+                return False
+            self.config_version = version
+            if config.get('branding') is not None:
+                self.branding = config['branding']
+            if config.get('plan'):
+                self.plan = config['plan']
+            if config.get('features') is not None:
+                self.features = config['features']
+        return True
+
+    def plan_limit(self, name):
+        """Numeric plan limit (max_students, ...), None if unlimited or unknown"""
+        value = self.features.get(name)
+        if isinstance(value, bool) or not isinstance(value, int):
+            return None
+        return value
+
+    def has_feature(self, name):
+        """Plan feature flag; everything is allowed until a config arrived"""
+        if not self.features:
+            return True
+        return bool(self.features.get(name))
+
+    def fetch_config(self):
+        """Get the backend tenant config, None on failure"""
+        if not self.api_base_url:
+            return None
+        try:
+            response = requests.get(
+                f"{self.api_base_url}/api/v1/tenant/{self.tenant_id}/config",
+                timeout=5
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logging.warning(f"Tenant config fetch failed: {e}")
+            return None
+
+    def request_refresh(self):
+        """Ask the background thread to reload soon (after writes)"""
+        self._wakeup.set()
+
+    def start(self):
+        """Start the background refresh thread"""
+        if self.interval <= 0:
+            return
+        thread = threading.Thread(target=self._run, name='catalog-refresh', daemon=True)
+        thread.start()
+
+    def _run(self):
+        while True:
+            woken = self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                # Writes only change DB counts; the theme follows the timer
+                self.refresh(fetch_theme=not woken)
+            except Exception as e:
+                logging.error(f"Catalog refresh failed: {e}")
+
+    def template_context(self):
+        return {
+            'course': self.course,
+            'catalog': self,
+            'branding': self.branding,
+        }
+
+
+def init_catalog(app):
+    """Load the snapshot and expose it to all templates"""
+    catalog = CatalogSnapshot(app)
+    try:
+        catalog.refresh()
+    except sqlite3.Error as e:
+        logging.error(f"Initial catalog load failed: {e}")
+    catalog.start()
+
+    app.extensions['catalog'] = catalog
+    app.context_processor(catalog.template_context)
+    return catalog
+
+
+def get_catalog():
+    from flask import current_app
+    return current_app.extensions['catalog']
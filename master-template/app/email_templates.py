@@ -0,0 +1,230 @@
+"""
+Email templates
+Jinja templates in templates/email with CSS inlined at build time, per
+tenant branding from the catalog and a bulk path for announcements
+
+Build:  python build_assets.py  (writes templates/email/compiled)
+"""
+
+from flask import current_app
+import logging
+import os
+import re
+
+from jinja2 import (BaseLoader, Environment, FileSystemBytecodeCache,
+                    TemplateNotFound, select_autoescape)
+
+SOURCE_DIR = os.path.join(os.path.dirname(__file__), 'templates', 'email')
+COMPILED_DIR = os.path.join(SOURCE_DIR, 'compiled')
+BYTECODE_DIR = os.path.join(COMPILED_DIR, '__bytecode__')
+STYLESHEET = 'email.css'
+
+# Emails: (subject template, body template name without extension)
+EMAILS = {
+    'verification': '{{ academy_name }} - Bestätigen Sie Ihr Konto',
+    'announcement': '{{ academy_name }}: {{ title }}',
+    'welcome': 'Ihre Akademie {{ academy_name }} ist bereit',
+}
+
+# CSS custom properties replaced by branding values after inlining
+BRAND_VARS = {
+    '--primary': 'primary_color',
+    '--secondary': 'secondary_color',
+}
+
+DEFAULT_PRIMARY = '#2563eb'
+DEFAULT_SECONDARY = '#1d4ed8'
+
+
+# =============================================================================
+# CSS inlining (build time)
+# =============================================================================
+
+def parse_css(css):
+    """[(specificity, order, tag, class, declarations)] for simple selectors
+
+    Only 'tag', '.class' and 'tag.class' selectors are supported - email
+    templates don't need more and anything else is skipped.
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    rules = []
+    for order, (selectors, body) in enumerate(re.findall(r'([^{}]+)\{([^{}]*)\}', css)):
+        declarations = ';'.join(d.strip() for d in body.split(';') if d.strip())
+        for selector in selectors.split(','):
+            match = re.fullmatch(r'([a-z][a-z0-9]*)?(?:\.([\w-]+))?', selector.strip())
+            if not match or not any(match.groups()):
+                logging.warning(f"Email CSS: unsupported selector '{selector.strip()}'")
+                continue
+            tag, cls = match.groups()
+            specificity = (10 if cls else 0) + (1 if tag else 0)
+            rules.append((specificity, order, tag, cls, declarations))
+    return sorted(rules, key=lambda rule: rule[:2])
+
+
+def brand_declarations(declarations):
+    """var(--primary) -> {{ primary_color }}"""
+    return re.sub(r'var\((--[\w-]+)\)',
+                  lambda m: '{{ %s }}' % BRAND_VARS[m.group(1)], declarations)
+
+
+def inline_css(html, css):
+    """Move stylesheet rules into style attributes of matching start tags"""
+    rules = parse_css(css)
+
+    def inline_tag(match):
+        tag, attrs = match.group(1), match.group(2) or ''
+        classes = re.search(r'\bclass="([^"]*)"', attrs)
+        classes = set(classes.group(1).split()) if classes else set()
+
+        styles = [declarations for _, _, rule_tag, rule_cls, declarations in rules
+                  if (rule_tag is None or rule_tag == tag.lower())
+                  and (rule_cls is None or rule_cls in classes)]
+        if not styles:
+            return match.group(0)
+
+        # Existing style attribute wins over the stylesheet
+        existing = re.search(r'\bstyle="([^"]*)"', attrs)
+        if existing:
+            styles.append(existing.group(1))
+            attrs = attrs[:existing.start()].rstrip() + attrs[existing.end():]
+        style = brand_declarations(';'.join(styles))
+        return f'<{tag}{attrs.rstrip()} style="{style}"{match.group(3)}>'
+
+    return re.sub(r'<([a-zA-Z][a-zA-Z0-9]*)(\s[^<>]*?)?(\s*/?)>', inline_tag, html)
+
+
+def read_stylesheet():
+    with open(os.path.join(SOURCE_DIR, STYLESHEET), encoding='utf-8') as f:
+        return f.read()
+
+
+def build_email_templates():
+    """Write inlined templates to COMPILED_DIR and warm the bytecode cache"""
+    css = read_stylesheet()
+    os.makedirs(BYTECODE_DIR, exist_ok=True)
+
+    for name in sorted(os.listdir(SOURCE_DIR)):
+        if not name.endswith(('.html', '.txt')):
+            continue
+        with open(os.path.join(SOURCE_DIR, name), encoding='utf-8') as f:
+            source = f.read()
+        if name.endswith('.html'):
+            source = inline_css(source, css)
+        with open(os.path.join(COMPILED_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(source)
+        print(f"✉️  email/{name} -> email/compiled/{name}")
+
+    env = create_environment()
+    for name in env.list_templates():
+        env.get_template(name)
+
+
+def create_subject_environment():
+    """Subjects are plain text (mail header): no HTML escaping"""
+    return Environment(autoescape=False)
+
+
+# =============================================================================
+# Runtime
+# =============================================================================
+
+class EmailTemplateLoader(BaseLoader):
+    """Prefer compiled (inlined) templates, inline sources on first load"""
+
+    def __init__(self):
+        self._css = None
+
+    def get_source(self, environment, template):
+        path = os.path.join(COMPILED_DIR, template)
+        compiled = os.path.isfile(path)
+        if not compiled:
+            path = os.path.join(SOURCE_DIR, template)
+            if not os.path.isfile(path):
+                raise TemplateNotFound(template)
+
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        if not compiled and template.endswith('.html'):
+            if self._css is None:
+                self._css = read_stylesheet()
+            source = inline_css(source, self._css)
+
+        mtime = os.path.getmtime(path)
+        return source, path, lambda: os.path.getmtime(path) == mtime
+
+    def list_templates(self):
+        return sorted(name for name in os.listdir(SOURCE_DIR)
+                      if name.endswith(('.html', '.txt')))
+
+
+def create_environment():
+    bytecode_cache = None
+    if os.path.isdir(BYTECODE_DIR):
+        bytecode_cache = FileSystemBytecodeCache(BYTECODE_DIR)
+    return Environment(
+        loader=EmailTemplateLoader(),
+        autoescape=select_autoescape(['html']),
+        bytecode_cache=bytecode_cache,
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+
+
+class EmailRenderer:
+
+    def __init__(self, app):
+        self.env = create_environment()
+        self.tenant_id = app.config['TENANT_ID']
+        subject_env = create_subject_environment()
+        self.subjects = {name: subject_env.from_string(subject)
+                         for name, subject in EMAILS.items()}
+
+    def branding_context(self):
+        """Tenant branding for all mails, from the catalog snapshot"""
+        catalog = current_app.extensions['catalog']
+        branding = catalog.branding or {}
+        course = catalog.course or {}
+        academy_name = (branding.get('academy_name') or course.get('title')
+                         or current_app.config.get('ACADEMY_NAME') or self.tenant_id)
+        domain = branding.get('domain') or f'{self.tenant_id}.kurs24.io'
+        return {
+            'academy_name': academy_name,
+            'course_title': course.get('title') or academy_name,
+            'domain': domain,
+            'site_url': f'https://{domain}',
+            'primary_color': branding.get('primary_color') or DEFAULT_PRIMARY,
+            'secondary_color': branding.get('secondary_color') or DEFAULT_SECONDARY,
+            'total_content': catalog.total_content,
+        }
+
+    def render(self, name, **context):
+        """(subject, text_body, html_body) of one mail"""
+        return self.render_bulk(name, [context])[0]
+
+    def render_bulk(self, name, recipients, **shared):
+        """Render one mail per recipient context
+
+        Templates and the branding/shared context are resolved once; each
+        recipient only adds its own fields (e.g. username).
+        """
+        subject = self.subjects[name]
+        text = self.env.get_template(f'{name}.txt')
+        html = self.env.get_template(f'{name}.html')
+
+        base = self.branding_context()
+        base.update(shared)
+
+        rendered = []
+        for recipient in recipients:
+            context = {**base, **recipient}
+            rendered.append((subject.render(context), text.render(context), html.render(context)))
+        return rendered
+
+
+def init_email_templates(app):
+    app.extensions['email_renderer'] = EmailRenderer(app)
+
+
+def get_email_renderer():
+    return current_app.extensions['email_renderer']
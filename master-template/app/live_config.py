@@ -0,0 +1,112 @@
+"""
+Live config updates
+The platform API pushes theme, branding and plan changes to
+/internal/config instead of restarting the container. Pushes are signed
+with the tenant's SECRET_KEY and carry a version; the catalog ignores
+versions older than the one it has. The worker that receives a push
+stores it in data/config.json, the other workers load it on their next
+request.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import Blueprint, current_app, jsonify, request
+
+CONFIG_FILE = 'config.json'
+
+config_bp = Blueprint('live_config', __name__)
+
+
+def config_path(db_path):
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), CONFIG_FILE)
+
+
+def signature(secret, body):
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class LiveConfig:
+    """Shares pushed configs between the workers through config.json"""
+
+    def __init__(self, path, catalog, check_interval):
+        self.path = path
+        self.catalog = catalog
+        self.check_interval = check_interval
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def receive(self, config):
+        """Apply a pushed config here and store it for the other workers"""
+        if not self.catalog.apply_config(config):
+            return False
+        with self._lock:
+            stored = self.read() or {}
+            if int(stored.get('version') or 0) < int(config.get('version') or 0):
+                tmp = f'{self.path}.{os.getpid()}.tmp'
+                with open(tmp, 'w') as f:
+                    json.dump(config, f)
+                os.replace(tmp, self.path)
+        return True
+
+    def read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logging.warning(f"Ignoring unreadable {CONFIG_FILE}: {e}")
+            return None
+
+    def check(self):
+        """Load config.json if another worker replaced it (one stat per interval)"""
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return
+        self._checked = now
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        config = self.read()
+        if config is not None:
+            self.catalog.apply_config(config)
+
+
+@config_bp.route('/config', methods=['POST'])
+def push_config():
+    """Apply a config update (called by the backend only)"""
+    body = request.get_data()
+    expected = signature(current_app.config['SECRET_KEY'], body)
+    if not hmac.compare_digest(request.headers.get('X-Config-Signature', ''), expected):
+        return jsonify({'error': 'Nicht autorisiert'}), 403
+
+    config = json.loads(body or b'{}')
+    if config.get('tenant_id') not in (None, current_app.config['TENANT_ID']):
+        return jsonify({'error': 'Falscher Tenant'}), 409
+
+    live_config = current_app.extensions['live_config']
+    applied = live_config.receive(config)
+    logging.info(f"Config v{config.get('version')} {'applied' if applied else 'ignored (stale)'}")
+    return jsonify({'applied': applied, 'version': live_config.catalog.config_version})
+
+
+def init_live_config(app):
+    """Register the push endpoint and the per-request check (after init_catalog)"""
+    live_config = LiveConfig(config_path(app.config['DATABASE']),
+                             app.extensions['catalog'],
+                             app.config['CONFIG_CHECK_SECONDS'])
+    app.extensions['live_config'] = live_config
+    app.register_blueprint(config_bp, url_prefix='/internal')
+    app.before_request(live_config.check)
+    return live_config
@@ -0,0 +1,271 @@
+"""
+Outbound mail queue
+Mails are stored in the tenant DB and sent by a background thread that
+keeps one SMTP connection open, with retry and exponential backoff
+"""
+
+from email.message import EmailMessage
+import logging
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+import uuid
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+
+# Rows stuck in 'sending' longer than this belong to a dead process
+STALE_CLAIM_SECONDS = 600
+
+BATCH_SIZE = 50
+
+
+def create_mail_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS outbound_mail (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipient TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            text_body TEXT NOT NULL,
+            html_body TEXT,
+            status TEXT DEFAULT 'queued',
+            attempts INTEGER DEFAULT 0,
+            next_attempt_at REAL DEFAULT 0,
+            claimed_by TEXT,
+            claimed_at REAL,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            sent_at TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_outbound_mail_due
+        ON outbound_mail (status, next_attempt_at)
+    ''')
+
+
+def wake_sender():
+    from flask import current_app
+    sender = current_app.extensions.get('mail_sender')
+    if sender is not None:
+        sender.wake()
+
+
+def enqueue_mail(db, recipient, subject, text_body, html_body=None):
+    """Queue a mail (commits) and wake the sender"""
+    cursor = db.execute('''
+        INSERT INTO outbound_mail (recipient, subject, text_body, html_body)
+        VALUES (?, ?, ?, ?)
+    ''', (recipient, subject, text_body, html_body))
+    db.commit()
+
+    wake_sender()
+    return cursor.lastrowid
+
+
+def enqueue_many(db, messages):
+    """Queue [(recipient, subject, text_body, html_body)] in one transaction"""
+    db.executemany('''
+        INSERT INTO outbound_mail (recipient, subject, text_body, html_body)
+        VALUES (?, ?, ?, ?)
+    ''', messages)
+    db.commit()
+
+    wake_sender()
+    return len(messages)
+
+
+def backoff_seconds(attempts):
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+class MailSender:
+    """Background thread draining outbound_mail over a reused SMTP connection"""
+
+    def __init__(self, db_path, config):
+        self.db_path = db_path
+        self.server = config['MAIL_SERVER']
+        self.port = config['MAIL_PORT']
+        self.use_tls = config['MAIL_USE_TLS']
+        self.use_ssl = config['MAIL_USE_SSL']
+        self.username = config['MAIL_USERNAME']
+        self.password = config['MAIL_PASSWORD']
+        self.default_sender = config['MAIL_DEFAULT_SENDER']
+        self.idle_timeout = config['MAIL_IDLE_TIMEOUT']
+
+        self.worker_id = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self._smtp = None
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    # -- SMTP connection ------------------------------------------------------
+
+    def connect(self):
+        if self._smtp is not None:
+            return self._smtp
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        smtp = smtp_class(self.server, self.port, timeout=30)
+        if self.use_tls and not self.use_ssl:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password)
+        self._smtp = smtp
+        return smtp
+
+    def disconnect(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except smtplib.SMTPException:
+            pass
+        except OSError:
+            pass
+        self._smtp = None
+
+    def build_message(self, row):
+        msg = EmailMessage()
+        msg['Subject'] = row['subject']
+        msg['From'] = self.default_sender
+        msg['To'] = row['recipient']
+        msg.set_content(row['text_body'])
+        if row['html_body']:
+            msg.add_alternative(row['html_body'], subtype='html')
+        return msg
+
+    def send(self, row):
+        """Send one row, reconnecting once if the server dropped us"""
+        msg = self.build_message(row)
+        try:
+            self.connect().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._smtp = None
+            self.connect().send_message(msg)
+
+    # -- Queue handling -------------------------------------------------------
+
+    def open_db(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def claim_batch(self, conn):
+        """Mark due mails as ours; several processes may drain the queue"""
+        now = time.time()
+        conn.execute('''
+            UPDATE outbound_mail SET status = 'queued', claimed_by = NULL
+            WHERE status = 'sending' AND claimed_at < ?
+        ''', (now - STALE_CLAIM_SECONDS,))
+        conn.execute('''
+            UPDATE outbound_mail SET status = 'sending', claimed_by = ?, claimed_at = ?
+            WHERE id IN (
+                SELECT id FROM outbound_mail
+                WHERE status = 'queued' AND next_attempt_at <= ?
+                ORDER BY id LIMIT ?
+            )
+        ''', (self.worker_id, now, now, BATCH_SIZE))
+        conn.commit()
+        return conn.execute('''
+            SELECT * FROM outbound_mail
+            WHERE status = 'sending' AND claimed_by = ?
+            ORDER BY id
+        ''', (self.worker_id,)).fetchall()
+
+    def drain(self, conn):
+        """Send everything that is due; returns number of rows handled"""
+        handled = 0
+        while True:
+            rows = self.claim_batch(conn)
+            if not rows:
+                return handled
+
+            # Server unreachable: back off the whole batch instead of
+            # waiting for a connect timeout per mail
+            try:
+                self.connect()
+            except (smtplib.SMTPException, OSError) as e:
+                self.disconnect()
+                for row in rows:
+                    self.mark_failed(conn, row, e)
+                conn.commit()
+                return handled + len(rows)
+
+            for row in rows:
+                try:
+                    self.send(row)
+                except (smtplib.SMTPException, OSError) as e:
+                    self.disconnect()
+                    self.mark_failed(conn, row, e)
+                except Exception as e:
+                    # Mail can't be built/encoded: count it as an attempt
+                    # instead of leaving the row in 'sending'
+                    self.mark_failed(conn, row, f'{type(e).__name__}: {e}')
+                else:
+                    conn.execute('''
+                        UPDATE outbound_mail
+                        SET status = 'sent', attempts = attempts + 1,
+                            claimed_by = NULL, sent_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (row['id'],))
+                conn.commit()
+                handled += 1
+
+    def mark_failed(self, conn, row, error):
+        attempts = row['attempts'] + 1
+        if attempts >= MAX_ATTEMPTS:
+            status, next_attempt_at = 'failed', None
+            logging.error(f"Mail {row['id']} to {row['recipient']} failed permanently: {error}")
+        else:
+            status, next_attempt_at = 'queued', time.time() + backoff_seconds(attempts)
+            logging.warning(f"Mail {row['id']} failed (attempt {attempts}), retrying: {error}")
+        conn.execute('''
+            UPDATE outbound_mail
+            SET status = ?, attempts = ?, next_attempt_at = ?, claimed_by = NULL, last_error = ?
+            WHERE id = ?
+        ''', (status, attempts, next_attempt_at, str(error)[:500], row['id']))
+
+    # -- Thread ---------------------------------------------------------------
+
+    def wake(self):
+        self._wakeup.set()
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name='mail-sender', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def run(self):
+        conn = self.open_db()
+        try:
+            while not self._stopped.is_set():
+                try:
+                    self.drain(conn)
+                except sqlite3.Error as e:
+                    logging.error(f"Mail queue error: {e}")
+
+                # Keep the SMTP connection for bursts, drop it when idle
+                if not self._wakeup.wait(self.idle_timeout):
+                    self.disconnect()
+                    self._wakeup.wait(BACKOFF_BASE_SECONDS)
+                self._wakeup.clear()
+        finally:
+            self.disconnect()
+            conn.close()
+
+
+def init_mail(app):
+    """Start the sender thread if an SMTP server is configured"""
+    if not app.config['MAIL_SERVER']:
+        logging.warning("MAIL_SERVER not set - mails stay queued in outbound_mail")
+        return None
+    sender = MailSender(app.config['DATABASE'], app.config)
+    sender.start()
+    app.extensions['mail_sender'] = sender
+    return sender
@@ -7,11 +7,24 @@ from flask import Blueprint, render_template, request, jsonify, session, redirec
 from werkzeug.security import generate_password_hash, check_password_hash
 import json
 
+from app.auth import load_user, login_user, find_password_token, use_password_token
+from app.catalog import get_catalog
+from app.translation import get_translation_service
+
 # Blueprint definitions
 main_bp = Blueprint('main', __name__)
 api_bp = Blueprint('api', __name__)
 auth_bp = Blueprint('auth', __name__)
 
+MIN_PASSWORD_LENGTH = 8
+
+
+@main_bp.before_request
+@api_bp.before_request
+def refresh_session_user():
+    """Validate the session user (cached) so revoked rights take effect"""
+    load_user()
+
 
 # =============================================================================
 # Main Routes - Page Rendering
@@ -20,18 +33,12 @@ auth_bp = Blueprint('auth', __name__)
 @main_bp.route('/')
 def index():
     """Landing page - shows course overview or login"""
-    if 'user_id' not in session:
+    user = load_user()
+    if user is None:
         return redirect(url_for('auth.login'))
     
-    from app import get_db
-    db = get_db()
-    
-    # Get user's course
-    user = db.execute('SELECT * FROM users WHERE id = ?', (session['user_id'],)).fetchone()
-    course = db.execute('SELECT * FROM courses WHERE tenant_id = ? LIMIT 1', 
-                       (user['tenant_id'],)).fetchone()
-    
-    return render_template('index.html', user=user, course=course)
+    # Course branding comes from the catalog snapshot
+    return render_template('index.html', user=user)
 
 
 @main_bp.route('/content/<content_type>')
@@ -122,9 +129,6 @@ def dozent_dashboard():
     from app import get_db
     db = get_db()
     
-    # Get course info
-    course = db.execute('SELECT * FROM courses LIMIT 1').fetchone()
-    
     # Get statistics
     stats = db.execute('''
         SELECT 
@@ -140,7 +144,7 @@ def dozent_dashboard():
         WHERE u.role = 'student'
     ''').fetchone()
     
-    return render_template('dashboard/dozent.html', course=course, stats=stats)
+    return render_template('dashboard/dozent.html', stats=stats)
 
 
 # =============================================================================
@@ -185,6 +189,9 @@ def extend_content():
     if 'user_id' not in session:
         return jsonify({'error': 'Not authenticated'}), 401
     
+    if not get_catalog().has_feature('ai_features'):
+        return jsonify({'error': 'KI-Funktionen sind in Ihrem Tarif nicht enthalten'}), 403
+    
     # TODO: Implement credit check
     # TODO: Call AI service to generate content
     # TODO: Insert new content into database
@@ -195,25 +202,67 @@ def extend_content():
 @api_bp.route('/content/stats')
 def content_stats():
     """Get course statistics for login page"""
-    from app import get_db
-    db = get_db()
+    catalog = get_catalog()
     
-    try:
-        # Get content count
-        content_count = db.execute('SELECT COUNT(*) as count FROM course_content WHERE status = "active"').fetchone()
-        
-        # Get user count
-        user_count = db.execute('SELECT COUNT(*) as count FROM users').fetchone()
-        
-        return jsonify({
-            'total_content': content_count['count'] if content_count else 200,
-            'active_users': user_count['count'] if user_count else 50
-        })
-    except Exception:
+    if catalog.loaded_at is None:
         return jsonify({
             'total_content': 200,
             'active_users': 50
         })
+    
+    return jsonify({
+        'total_content': catalog.total_content,
+        'active_users': catalog.active_users,
+        'content_by_type': catalog.content_counts
+    })
+
+
+@api_bp.route('/translations', methods=['POST'])
+def content_translations():
+    """Translations of course content items (stored, else translated once)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    data = request.get_json() or {}
+    target = data.get('lang')
+    # Content is written in the course language
+    course = get_catalog().course or {}
+    source = course.get('language') or 'de'
+    try:
+        content_ids = [int(i) for i in data.get('content_ids', [])][:200]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid content_ids'}), 400
+    
+    if not target or target == source:
+        return jsonify({'error': 'Invalid target language'}), 400
+    
+    from app import get_db
+    translations, pending = get_translation_service().translate_content(
+        get_db(), content_ids, target, source)
+    
+    # pending: not translated yet within this request's budget, ask again
+    return jsonify({'lang': target, 'translations': translations, 'pending': pending})
+
+
+@api_bp.route('/translate', methods=['POST'])
+def translate_text():
+    """Translate free text through the shared server-side cache"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    data = request.get_json() or {}
+    text = (data.get('text') or '')[:2000]
+    source = data.get('source', 'de')
+    target = data.get('target')
+    if not target:
+        return jsonify({'error': 'Invalid target language'}), 400
+    
+    try:
+        translation = get_translation_service().translate_text(text, source, target)
+    except Exception:
+        translation = text
+    
+    return jsonify({'translation': translation})
 
 
 # =============================================================================
@@ -312,31 +361,24 @@ def dozent_content():
 @auth_bp.route('/login', methods=['GET', 'POST'])
 def login():
     """User login"""
-    from app import get_db
-    db = get_db()
-    
-    # Get course for dynamic branding
-    course = db.execute('SELECT * FROM courses LIMIT 1').fetchone()
-    
     if request.method == 'POST':
+        from app import get_db
+        db = get_db()
+        
         username = request.form.get('username')
         password = request.form.get('password')
         
         user = db.execute('SELECT * FROM users WHERE username = ?', 
                          (username,)).fetchone()
         
-        if user and check_password_hash(user['password_hash'], password):
-            session['user_id'] = user['id']
-            session['username'] = user['username']
-            session['role'] = user['role']
-            session['user_language'] = user['preferred_language']
-            session['translate_to'] = user['translate_to']
+        if user and user['is_active'] and check_password_hash(user['password_hash'], password):
+            login_user(user)
             
             return redirect(url_for('main.index'))
         
-        return render_template('auth/login.html', error='Invalid credentials', course=course)
+        return render_template('auth/login.html', error='Invalid credentials')
     
-    return render_template('auth/login.html', course=course)
+    return render_template('auth/login.html')
 
 
 @auth_bp.route('/logout')
@@ -346,16 +388,40 @@ def logout():
     return redirect(url_for('auth.login'))
 
 
-@auth_bp.route('/register', methods=['GET', 'POST'])
-def register():
-    """User registration with language preference"""
+@auth_bp.route('/set-password/<token>', methods=['GET', 'POST'])
+def set_password(token):
+    """Set a password through a one-time link (academy owner after claim)"""
     from app import get_db
     db = get_db()
     
-    # Get course for dynamic branding
-    course = db.execute('SELECT * FROM courses LIMIT 1').fetchone()
+    user = find_password_token(db, token)
+    if user is None:
+        return render_template('auth/login.html',
+                             error='Der Link ist ungültig oder abgelaufen'), 404
     
+    error = None
     if request.method == 'POST':
+        password = request.form.get('password', '')
+        if len(password) < MIN_PASSWORD_LENGTH:
+            error = f'Das Passwort muss mindestens {MIN_PASSWORD_LENGTH} Zeichen lang sein'
+        elif password != request.form.get('password_confirm'):
+            error = 'Die Passwörter stimmen nicht überein'
+        else:
+            use_password_token(db, user['id'], generate_password_hash(password))
+            db.commit()
+            return redirect(url_for('auth.login'))
+    
+    return render_template('auth/set_password.html', username=user['username'],
+                         error=error, min_length=MIN_PASSWORD_LENGTH)
+
+
+@auth_bp.route('/register', methods=['GET', 'POST'])
+def register():
+    """User registration with language preference"""
+    if request.method == 'POST':
+        from app import get_db
+        db = get_db()
+        
         username = request.form.get('username')
         email = request.form.get('email')
         password = request.form.get('password')
@@ -365,6 +431,15 @@ def register():
         # Get tenant from environment or subdomain
         tenant_id = request.host.split('.')[0] if '.' in request.host else 'demo-tenant'
         
+        # Student limit of the tenant's plan (pushed with the live config)
+        max_students = get_catalog().plan_limit('max_students')
+        if max_students is not None:
+            students = db.execute(
+                "SELECT COUNT(*) FROM users WHERE role = 'student'").fetchone()[0]
+            if students >= max_students:
+                return render_template('auth/login.html',
+                                     error='Die maximale Teilnehmerzahl dieser Akademie ist erreicht')
+        
         try:
             db.execute('''
                 INSERT INTO users (tenant_id, username, email, password_hash, 
@@ -373,11 +448,12 @@ def register():
             ''', (tenant_id, username, email, generate_password_hash(password),
                   preferred_language, translate_to))
             db.commit()
+            get_catalog().request_refresh()
             
             return redirect(url_for('auth.login'))
             
         except Exception as e:
             return render_template('auth/login.html', 
-                                 error='Username already exists', course=course)
+                                 error='Username already exists')
     
-    return render_template('auth/login.html', course=course)
\ No newline at end of file
+    return render_template('auth/login.html')
\ No newline at end of file
@@ -0,0 +1,335 @@
+"""
+SMS dispatcher
+SMS are stored in the tenant DB and sent by one background thread per
+tenant over a shared provider session, rate-limited to the provider's
+throughput, with retry/backoff and batched delivery status polling
+"""
+
+from datetime import datetime, timedelta, timezone
+import fcntl
+import itertools
+import logging
+import sqlite3
+import threading
+import time
+
+import requests
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 1800
+
+# Only one process per tenant sends; the others retry taking the lock
+LEADER_RETRY_SECONDS = 30
+
+# SMS queued by other workers are picked up within this time
+QUEUE_POLL_SECONDS = 2
+
+# Small batches so a verification code overtakes a running class reminder
+BATCH_SIZE = 10
+
+# Verification codes go out before class-wide reminders
+PRIORITY_VERIFICATION = 0
+PRIORITY_BULK = 10
+
+# Provider states that won't change any more
+FINAL_STATUSES = ('delivered', 'undelivered', 'failed')
+
+class SmsError(Exception):
+    """Provider error; retryable ones are queued again with backoff"""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class TwilioProvider:
+    """Twilio REST API over one shared HTTP session"""
+
+    base_url = 'https://api.twilio.com/2010-04-01'
+
+    def __init__(self, account_sid, auth_token, from_phone):
+        self.account_sid = account_sid
+        self.from_phone = from_phone
+        self.session = requests.Session()
+        self.session.auth = (account_sid, auth_token)
+
+    def request(self, method, path, **kwargs):
+        try:
+            response = self.session.request(method, f'{self.base_url}{path}', timeout=15, **kwargs)
+        except requests.RequestException as e:
+            raise SmsError(str(e))
+        if response.status_code >= 400:
+            # 429 and 5xx are temporary, everything else (invalid number, ...) is not
+            retryable = response.status_code == 429 or response.status_code >= 500
+            raise SmsError(f'{response.status_code}: {response.text[:200]}', retryable)
+        return response.json()
+
+    def send(self, to, body):
+        """Send one SMS, returns the provider message id"""
+        data = self.request('POST', f'/Accounts/{self.account_sid}/Messages.json',
+                            data={'From': self.from_phone, 'To': to, 'Body': body})
+        return data['sid']
+
+    def fetch_statuses(self, sids, since):
+        """{sid: status} for messages sent since `since` - one listing, not one call per SMS"""
+        wanted = set(sids)
+        statuses = {}
+        path = f'/Accounts/{self.account_sid}/Messages.json'
+        params = {'From': self.from_phone, 'DateSent>': since.strftime('%Y-%m-%d'), 'PageSize': 1000}
+        while path and len(statuses) < len(wanted):
+            data = self.request('GET', path, params=params)
+            for message in data.get('messages', []):
+                if message['sid'] in wanted:
+                    statuses[message['sid']] = message['status']
+            path = (data.get('next_page_uri') or '').replace('/2010-04-01', '', 1) or None
+            params = None
+        return statuses
+
+
+class FakeProvider:
+    """In-memory provider for tests and local development"""
+
+    def __init__(self):
+        self.sent = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def send(self, to, body):
+        with self._lock:
+            sid = f'SMfake{next(self._ids):08d}'
+            self.sent.append({'sid': sid, 'to': to, 'body': body})
+        logging.info(f"Fake SMS {sid} to {to}: {body}")
+        return sid
+
+    def fetch_statuses(self, sids, since):
+        return {sid: 'delivered' for sid in sids}
+
+
+PROVIDERS = {
+    'twilio': TwilioProvider,
+    'fake': FakeProvider,
+}
+
+
+def create_sms_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS outbound_sms (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipient TEXT NOT NULL,
+            body TEXT NOT NULL,
+            priority INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'queued',
+            provider_sid TEXT,
+            provider_status TEXT,
+            attempts INTEGER DEFAULT 0,
+            next_attempt_at REAL DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            sent_at TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_outbound_sms_due
+        ON outbound_sms (status, next_attempt_at)
+    ''')
+
+
+def enqueue_sms(db, messages, priority=PRIORITY_VERIFICATION):
+    """Queue [(recipient, body)] in one transaction and wake the dispatcher"""
+    db.executemany('INSERT INTO outbound_sms (recipient, body, priority) VALUES (?, ?, ?)',
+                   [(recipient, body, priority) for recipient, body in messages])
+    db.commit()
+
+    from flask import current_app
+    dispatcher = current_app.extensions.get('sms_dispatcher')
+    if dispatcher is not None:
+        dispatcher.wake()
+    return len(messages)
+
+
+def backoff_seconds(attempts):
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+class RateLimiter:
+    """Token bucket: `rate` messages per second, bursts up to `burst`"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
+
+
+class SmsDispatcher:
+    """Background thread draining outbound_sms and polling delivery status"""
+
+    def __init__(self, db_path, provider, config):
+        self.db_path = db_path
+        self.provider = provider
+        self.limiter = RateLimiter(config['SMS_RATE_PER_SECOND'], config['SMS_BURST'])
+        self.poll_interval = config['SMS_STATUS_POLL_SECONDS']
+
+        self._last_poll = 0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    def open_db(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def due_batch(self, conn):
+        # Single sender per tenant (see acquire_leadership), no claiming needed
+        return conn.execute('''
+            SELECT * FROM outbound_sms
+            WHERE status = 'queued' AND next_attempt_at <= ? AND provider_sid IS NULL
+            ORDER BY priority, id LIMIT ?
+        ''', (time.time(), BATCH_SIZE)).fetchall()
+
+    def drain(self, conn):
+        """Send everything that is due at the provider's rate"""
+        while not self._stopped.is_set():
+            rows = self.due_batch(conn)
+            if not rows:
+                return
+
+            for row in rows:
+                self.limiter.acquire()
+                try:
+                    sid = self.provider.send(row['recipient'], row['body'])
+                except SmsError as e:
+                    self.mark_failed(conn, row, e)
+                except Exception as e:
+                    # Unexpected provider response: retried with backoff up to MAX_ATTEMPTS
+                    self.mark_failed(conn, row, SmsError(f'{type(e).__name__}: {e}'))
+                else:
+                    conn.execute('''
+                        UPDATE outbound_sms
+                        SET status = 'sent', provider_sid = ?, attempts = attempts + 1,
+                            sent_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (sid, row['id']))
+                conn.commit()
+
+    def mark_failed(self, conn, row, error):
+        attempts = row['attempts'] + 1
+        if not error.retryable or attempts >= MAX_ATTEMPTS:
+            status, next_attempt_at = 'failed', None
+            logging.error(f"SMS {row['id']} to {row['recipient']} failed permanently: {error}")
+        else:
+            status, next_attempt_at = 'queued', time.time() + backoff_seconds(attempts)
+            logging.warning(f"SMS {row['id']} failed (attempt {attempts}), retrying: {error}")
+        conn.execute('''
+            UPDATE outbound_sms SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?
+            WHERE id = ?
+        ''', (status, attempts, next_attempt_at, str(error)[:500], row['id']))
+
+    def poll_statuses(self, conn):
+        """Update delivery status of recently sent SMS in one provider listing
+
+        The provider's state goes to provider_status; status stays 'sent'
+        (Twilio's 'queued' must not put the SMS back into the local queue).
+        """
+        since = datetime.now(timezone.utc) - timedelta(days=1)
+        placeholders = ','.join('?' * len(FINAL_STATUSES))
+        rows = conn.execute(f'''
+            SELECT provider_sid FROM outbound_sms
+            WHERE provider_sid IS NOT NULL
+              AND (provider_status IS NULL OR provider_status NOT IN ({placeholders}))
+              AND sent_at >= ?
+        ''', (*FINAL_STATUSES, since.strftime('%Y-%m-%d %H:%M:%S'))).fetchall()
+        if not rows:
+            return
+
+        try:
+            statuses = self.provider.fetch_statuses([row['provider_sid'] for row in rows], since)
+        except SmsError as e:
+            logging.warning(f"SMS status poll failed: {e}")
+            return
+        conn.executemany('UPDATE outbound_sms SET provider_status = ? WHERE provider_sid = ?',
+                         [(status, sid) for sid, status in statuses.items()])
+        conn.commit()
+
+    def acquire_leadership(self):
+        """Block until this process holds the tenant's SMS lock file"""
+        lock_file = open(f'{self.db_path}.sms.lock', 'w')
+        while not self._stopped.is_set():
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return lock_file
+            except BlockingIOError:
+                self._stopped.wait(LEADER_RETRY_SECONDS)
+        lock_file.close()
+        return None
+
+    def wake(self):
+        self._wakeup.set()
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name='sms-dispatcher', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def run(self):
+        lock_file = self.acquire_leadership()
+        if lock_file is None:
+            return
+
+        conn = self.open_db()
+        try:
+            while not self._stopped.is_set():
+                try:
+                    self.drain(conn)
+                    if time.time() - self._last_poll >= self.poll_interval:
+                        self._last_poll = time.time()
+                        self.poll_statuses(conn)
+                except sqlite3.Error as e:
+                    logging.error(f"SMS queue error: {e}")
+                except Exception:
+                    # Keep the thread (and the leader lock); the next round retries
+                    logging.exception("SMS dispatcher error")
+
+                self._wakeup.wait(QUEUE_POLL_SECONDS)
+                self._wakeup.clear()
+        finally:
+            conn.close()
+            lock_file.close()
+
+
+def create_provider(config):
+    """Provider instance for SMS_PROVIDER, None if not configured"""
+    name = config['SMS_PROVIDER']
+    if name == 'fake':
+        return FakeProvider()
+    credentials = (config['TWILIO_ACCOUNT_SID'], config['TWILIO_AUTH_TOKEN'],
+                   config['TWILIO_PHONE_NUMBER'])
+    if not all(credentials):
+        return None
+    return PROVIDERS[name](*credentials)
+
+
+def init_sms(app):
+    """Start the dispatcher if an SMS provider is configured"""
+    provider = create_provider(app.config)
+    if provider is None:
+        return None
+    dispatcher = SmsDispatcher(app.config['DATABASE'], provider, app.config)
+    dispatcher.start()
+    app.extensions['sms_dispatcher'] = dispatcher
+    return dispatcher
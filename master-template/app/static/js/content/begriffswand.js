@@ -0,0 +1,326 @@
+// Page data rendered by the template (see #page-data)
+const pageData = JSON.parse(document.getElementById('page-data').textContent);
+
+// Global variables
+let currentBegriffId = null;
+let begriffeData = pageData.content;
+let currentTranslationLanguage = '';
+
+// Language mappings
+const languageLabels = {
+    'de': '🇩🇪 Deutsch',
+    'en': '🇬🇧 English',
+    'ar': '🇸🇦 العربية',  
+    'tr': '🇹🇷 Türkçe',
+    'ru': '🇷🇺 Русский',
+    'pl': '🇵🇱 Polski',
+    'it': '🇮🇹 Italiano',
+    'fr': '🇫🇷 Français',
+    'es': '🇪🇸 Español',
+    'pt': '🇵🇹 Português',
+    'nl': '🇳🇱 Nederlands',
+    'fa': '🇮🇷 فارسی',
+    'ur': '🇵🇰 اردو',
+    'hi': '🇮🇳 हिन्दी',
+    'zh': '🇨🇳 中文',
+    'vi': '🇻🇳 Tiếng Việt',
+    'th': '🇹🇭 ไทย'
+};
+
+// Search functionality
+function searchBegriffe() {
+    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
+    const cards = document.querySelectorAll('.begriff-item');
+    
+    cards.forEach(card => {
+        const title = card.querySelector('.title').textContent.toLowerCase();
+        const content = card.querySelector('.content p').textContent.toLowerCase();
+        
+        if (title.includes(searchTerm) || content.includes(searchTerm)) {
+            card.style.display = 'block';
+        } else {
+            card.style.display = 'none';
+        }
+    });
+}
+
+// Filter functionality
+function filterBegriffe() {
+    const category = document.getElementById('categoryFilter').value;
+    const statusFilter = document.querySelector('input[name="statusFilter"]:checked').value;
+    const cards = document.querySelectorAll('.begriff-item');
+    
+    cards.forEach(card => {
+        let showCard = true;
+        
+        // Category filter
+        if (category && card.dataset.category !== category) {
+            showCard = false;
+        }
+        
+        // Status filter
+        if (statusFilter === 'completed' && card.dataset.completed !== 'true') {
+            showCard = false;
+        } else if (statusFilter === 'todo' && card.dataset.completed === 'true') {
+            showCard = false;
+        }
+        
+        card.style.display = showCard ? 'block' : 'none';
+    });
+}
+
+// Modal functions
+function openBegriffModal(begriffId) {
+    currentBegriffId = begriffId;
+    const begriff = begriffeData.find(b => b.id === begriffId);
+    
+    if (!begriff) return;
+    
+    // Populate modal
+    document.getElementById('modalTitle').textContent = begriff.title;
+    document.getElementById('modalBegriff').textContent = begriff.title;
+    document.getElementById('modalDefinition').textContent = begriff.content_data.definition;
+    document.getElementById('modalCategory').textContent = begriff.content_data.kategorie || 'Allgemein';
+    document.getElementById('modalDifficulty').textContent = begriff.content_data.schwierigkeit || 'Mittel';
+    
+    // Example
+    if (begriff.content_data.beispiel) {
+        document.getElementById('modalExample').textContent = begriff.content_data.beispiel;
+        document.getElementById('modalExampleBox').style.display = 'block';
+    } else {
+        document.getElementById('modalExampleBox').style.display = 'none';
+    }
+    
+    // Load translations
+    loadTranslations(begriff);
+    
+    // Notes
+    document.getElementById('modalNotes').value = begriff.notes || '';
+    
+    // Toggle button
+    const toggleBtn = document.getElementById('toggleLearnedBtn');
+    if (begriff.is_completed) {
+        toggleBtn.innerHTML = '<span class="icon"><i class="fas fa-times"></i></span><span>Als ungelernt markieren</span>';
+        toggleBtn.className = 'button is-warning';
+    } else {
+        toggleBtn.innerHTML = '<span class="icon"><i class="fas fa-check"></i></span><span>Als gelernt markieren</span>';
+        toggleBtn.className = 'button is-success';
+    }
+    
+    // Show modal
+    document.getElementById('begriffModal').classList.add('is-active');
+}
+
+function closeBegriffModal() {
+    document.getElementById('begriffModal').classList.remove('is-active');
+    currentBegriffId = null;
+}
+
+async function loadTranslations(begriff) {
+    const translationsDiv = document.getElementById('modalTranslations');
+    const translationsBox = document.getElementById('modalTranslationsBox');
+    
+    if (!translationsDiv || !currentTranslationLanguage) {
+        translationsBox.style.display = 'none';
+        return;
+    }
+    
+    translationsBox.style.display = 'block';
+    translationsDiv.innerHTML = '<p class="has-text-grey">Übersetzung wird geladen...</p>';
+    
+    try {
+        // Term, definition and example (stored server-side after first use)
+        const translation = await getContentTranslation(begriff.id, currentTranslationLanguage);
+        const translatedTerm = translation.title || begriff.title;
+        const translatedDefinition = translation.definition || begriff.content_data.definition;
+        const translatedExample = begriff.content_data.beispiel ? (translation.beispiel || '') : '';
+        
+        translationsDiv.innerHTML = `
+            <div class="translation-item mb-3">
+                <div class="columns is-mobile">
+                    <div class="column is-narrow">
+                        <strong>Begriff:</strong>
+                    </div>
+                    <div class="column">
+                        ${translatedTerm}
+                    </div>
+                </div>
+            </div>
+            <div class="translation-item mb-3">
+                <div class="columns is-mobile">
+                    <div class="column is-narrow">
+                        <strong>Definition:</strong>
+                    </div>
+                    <div class="column">
+                        ${translatedDefinition}
+                    </div>
+                </div>
+            </div>
+            ${translatedExample ? `
+                <div class="translation-item">
+                    <div class="columns is-mobile">
+                        <div class="column is-narrow">
+                            <strong>Beispiel:</strong>
+                        </div>
+                        <div class="column">
+                            ${translatedExample}
+                        </div>
+                    </div>
+                </div>
+            ` : ''}
+        `;
+        
+    } catch (error) {
+        console.error('Translation error:', error);
+        translationsDiv.innerHTML = '<p class="has-text-danger">Übersetzung fehlgeschlagen</p>';
+    }
+}
+
+// Change translation language
+async function changeTranslationLanguage(language) {
+    currentTranslationLanguage = language;
+    
+    if (language) {
+        // Show translations in cards
+        document.querySelectorAll('.translation-preview').forEach(preview => {
+            preview.style.display = 'block';
+            const langSpan = preview.querySelector('.translation-lang');
+            const textSpan = preview.querySelector('.translation-text');
+            
+            langSpan.textContent = language.toUpperCase();
+            textSpan.textContent = 'Übersetzung wird geladen...';
+        });
+        
+        // Translate all visible cards
+        await translateVisibleCards();
+    } else {
+        // Hide all translations
+        document.querySelectorAll('.translation-preview').forEach(preview => {
+            preview.style.display = 'none';
+        });
+    }
+    
+    // Update modal if open
+    if (currentBegriffId) {
+        const begriff = begriffeData.find(b => b.id === currentBegriffId);
+        if (begriff) {
+            await loadTranslations(begriff);
+        }
+    }
+}
+
+// Translate visible cards
+async function translateVisibleCards() {
+    if (!currentTranslationLanguage) return;
+    
+    const visibleCards = document.querySelectorAll('.begriff-item[style*="block"], .begriff-item:not([style*="none"])');
+    const cards = [];
+    
+    for (const card of visibleCards) {
+        const begriffId = parseInt(card.querySelector('[onclick]').getAttribute('onclick').match(/\d+/)[0]);
+        if (begriffeData.find(b => b.id === begriffId)) {
+            cards.push({ id: begriffId, textSpan: card.querySelector('.translation-preview .translation-text') });
+        }
+    }
+    
+    // One request for all visible cards
+    try {
+        const translations = await fetchContentTranslations(cards.map(c => c.id), currentTranslationLanguage);
+        for (const card of cards) {
+            card.textSpan.textContent = translations[card.id].title || 'Übersetzung fehlgeschlagen';
+        }
+    } catch (error) {
+        for (const card of cards) {
+            card.textSpan.textContent = 'Übersetzung fehlgeschlagen';
+        }
+    }
+}
+
+async function toggleLearned() {
+    if (!currentBegriffId) return;
+    
+    const begriff = begriffeData.find(b => b.id === currentBegriffId);
+    const newStatus = !begriff.is_completed;
+    
+    try {
+        const response = await fetch(`/api/content/${currentBegriffId}/progress`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ completed: newStatus })
+        });
+        
+        if (response.ok) {
+            // Update local data
+            begriff.is_completed = newStatus;
+            
+            // Update UI
+            const card = document.querySelector(`[onclick="openBegriffModal(${currentBegriffId})"]`);
+            if (newStatus) {
+                card.classList.add('completed');
+                card.parentElement.dataset.completed = 'true';
+            } else {
+                card.classList.remove('completed');
+                card.parentElement.dataset.completed = 'false';
+            }
+            
+            // Show success toast
+            bulmaToast.toast({
+                message: newStatus ? 'Begriff als gelernt markiert! 🎉' : 'Begriff als ungelernt markiert',
+                type: newStatus ? 'is-success' : 'is-warning',
+                duration: 2000,
+                position: 'top-right'
+            });
+            
+            closeBegriffModal();
+            location.reload(); // Refresh to update progress bar
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        bulmaToast.toast({
+            message: 'Fehler beim Speichern',
+            type: 'is-danger',
+            duration: 3000
+        });
+    }
+}
+
+async function saveNotes() {
+    if (!currentBegriffId) return;
+    
+    const notes = document.getElementById('modalNotes').value;
+    
+    try {
+        const response = await fetch(`/api/content/${currentBegriffId}/progress`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ notes: notes })
+        });
+        
+        if (response.ok) {
+            bulmaToast.toast({
+                message: 'Notizen gespeichert! 📝',
+                type: 'is-success',
+                duration: 2000
+            });
+        }
+    } catch (error) {
+        bulmaToast.toast({
+            message: 'Fehler beim Speichern',
+            type: 'is-danger',
+            duration: 3000
+        });
+    }
+}
+
+// Event listeners
+document.getElementById('searchInput').addEventListener('input', searchBegriffe);
+document.querySelectorAll('input[name="statusFilter"]').forEach(radio => {
+    radio.addEventListener('change', filterBegriffe);
+});
+
+// Keyboard shortcuts
+document.addEventListener('keydown', (e) => {
+    if (e.key === 'Escape') {
+        closeBegriffModal();
+    }
+});
@@ -0,0 +1,285 @@
+// Page data rendered by the template (see #page-data)
+const pageData = JSON.parse(document.getElementById('page-data').textContent);
+
+let begriffe = [];
+let currentCardIndex = 0;
+let sessionCards = [];
+let difficultyStats = { easy: 0, medium: 0, hard: 0 };
+let isFlipped = false;
+let sourceLanguage = pageData.userLanguage;
+let targetLanguage = pageData.translateTo;
+
+// Language mappings
+const languageLabels = {
+    'de': '🇩🇪 Deutsch',
+    'en': '🇬🇧 English',
+    'ar': '🇸🇦 العربية',  
+    'tr': '🇹🇷 Türkçe',
+    'ru': '🇷🇺 Русский',
+    'pl': '🇵🇱 Polski',
+    'it': '🇮🇹 Italiano',
+    'fr': '🇫🇷 Français',
+    'es': '🇪🇸 Español',
+    'pt': '🇵🇹 Português',
+    'nl': '🇳🇱 Nederlands',
+    'fa': '🇮🇷 فارسی',
+    'ur': '🇵🇰 اردو',
+    'hi': '🇮🇳 हिन्दी',
+    'zh': '🇨🇳 中文',
+    'vi': '🇻🇳 Tiếng Việt',
+    'th': '🇹🇭 ไทย'
+};
+
+
+// Load begriffe data
+async function loadBegriffe() {
+    try {
+        begriffe = pageData.content;
+        console.log('Loaded begriffe:', begriffe.length);
+        startNewSession();
+    } catch (error) {
+        console.error('Error loading begriffe:', error);
+    }
+}
+
+// Start new learning session
+function startNewSession() {
+    difficultyStats = { easy: 0, medium: 0, hard: 0 };
+    sessionCards = [...begriffe].sort(() => Math.random() - 0.5).slice(0, 10);
+    currentCardIndex = 0;
+    
+    document.getElementById('cardSession').style.display = 'block';
+    document.getElementById('sessionComplete').style.display = 'none';
+    
+    displayCard();
+    updateProgress();
+}
+
+// Display current card
+async function displayCard() {
+    if (currentCardIndex >= sessionCards.length) {
+        endSession();
+        return;
+    }
+    
+    const card = sessionCards[currentCardIndex];
+    
+    // Reset flip state
+    document.getElementById('flashcard').classList.remove('flipped');
+    isFlipped = false;
+    
+    // Update card content
+    document.getElementById('cardCategory').textContent = card.content_data.kategorie || 'Allgemein';
+    document.getElementById('cardTerm').textContent = card.title;
+    
+    if (targetLanguage) {
+        await updateBilingualCard(card);
+    } else {
+        updateMonolingualCard(card);
+    }
+    
+    updateProgress();
+    updateNavigation();
+}
+
+// Update monolingual card content
+function updateMonolingualCard(card) {
+    document.getElementById('monolingualContent').style.display = 'block';
+    document.getElementById('bilingualContent').style.display = 'none';
+    
+    document.getElementById('cardDefinition').textContent = card.content_data.definition;
+    document.getElementById('cardExample').textContent = card.content_data.beispiel ? `Beispiel: ${card.content_data.beispiel}` : '';
+}
+
+// Update bilingual card content with live translation
+async function updateBilingualCard(card) {
+    document.getElementById('monolingualContent').style.display = 'none';
+    document.getElementById('bilingualContent').style.display = 'block';
+    
+    // Source language side
+    document.getElementById('germanTerm').textContent = card.title;
+    document.getElementById('germanDefinition').textContent = card.content_data.definition;
+    document.getElementById('germanExample').textContent = card.content_data.beispiel || '';
+    document.getElementById('germanLabel').textContent = languageLabels[sourceLanguage];
+    
+    // Target language side - show loading first
+    document.getElementById('foreignLabel').textContent = languageLabels[targetLanguage];
+    document.getElementById('foreignTerm').textContent = 'Übersetze...';
+    document.getElementById('foreignDefinition').textContent = 'Übersetzung wird geladen...';
+    document.getElementById('foreignExample').textContent = '';
+    
+    console.log('Card data for debugging:', card);
+    console.log('Beispiel field:', card.content_data.beispiel);
+    
+    try {
+        // Translate all content (stored server-side after first use)
+        const translation = await getContentTranslation(card.id, targetLanguage);
+        const translatedTerm = translation.title || card.title;
+        const translatedDefinition = translation.definition || card.content_data.definition;
+        const translatedExample = card.content_data.beispiel ? (translation.beispiel || '') : '';
+        
+        // Update with translations
+        document.getElementById('foreignTerm').textContent = translatedTerm;
+        document.getElementById('foreignDefinition').textContent = translatedDefinition;
+        
+        // Only show example if it exists and is not undefined/empty
+        const exampleElement = document.getElementById('foreignExample');
+        if (translatedExample && translatedExample !== 'undefined' && translatedExample.trim() !== '') {
+            exampleElement.textContent = translatedExample;
+            exampleElement.style.display = 'block';
+        } else {
+            exampleElement.textContent = '';
+            exampleElement.style.display = 'none';
+        }
+        
+        console.log('Translation results:', { translatedTerm, translatedDefinition, translatedExample });
+        
+    } catch (error) {
+        console.error('Translation error:', error);
+        document.getElementById('foreignTerm').textContent = card.title;
+        document.getElementById('foreignDefinition').textContent = 'Übersetzung fehlgeschlagen';
+        document.getElementById('foreignExample').textContent = '';
+    }
+}
+
+// Flip card
+function flipCard() {
+    const flashcard = document.getElementById('flashcard');
+    flashcard.classList.toggle('flipped');
+    isFlipped = !isFlipped;
+}
+
+// Mark difficulty and advance
+function markDifficulty(difficulty) {
+    difficultyStats[difficulty]++;
+    
+    // Move to next card
+    if (currentCardIndex < sessionCards.length - 1) {
+        currentCardIndex++;
+        displayCard();
+    } else {
+        endSession();
+    }
+}
+
+// Update progress indicator
+function updateProgress() {
+    const progress = ((currentCardIndex + 1) / sessionCards.length) * 100;
+    document.getElementById('sessionProgress').value = progress;
+    document.getElementById('cardCounter').textContent = `Karte ${currentCardIndex + 1} von ${sessionCards.length}`;
+}
+
+// Update navigation buttons
+function updateNavigation() {
+    document.getElementById('prevCard').disabled = currentCardIndex === 0;
+    document.getElementById('nextCard').disabled = currentCardIndex >= sessionCards.length - 1;
+}
+
+// Navigation functions
+document.getElementById('prevCard').addEventListener('click', function() {
+    if (currentCardIndex > 0) {
+        currentCardIndex--;
+        displayCard();
+    }
+});
+
+document.getElementById('nextCard').addEventListener('click', function() {
+    if (currentCardIndex < sessionCards.length - 1) {
+        currentCardIndex++;
+        displayCard();
+    }
+});
+
+document.getElementById('shuffleCards').addEventListener('click', function() {
+    sessionCards = sessionCards.sort(() => Math.random() - 0.5);
+    currentCardIndex = 0;
+    displayCard();
+});
+
+// End session
+function endSession() {
+    document.getElementById('cardSession').style.display = 'none';
+    document.getElementById('sessionComplete').style.display = 'block';
+    
+    // Update stats
+    document.getElementById('easyCount').textContent = difficultyStats.easy;
+    document.getElementById('mediumCount').textContent = difficultyStats.medium;
+    document.getElementById('hardCount').textContent = difficultyStats.hard;
+}
+
+// Language change handlers
+function changeSourceLanguage(value) {
+    sourceLanguage = value;
+    
+    if (targetLanguage === sourceLanguage) {
+        targetLanguage = '';
+        document.getElementById('targetLanguageSelect').value = '';
+        showLanguageWarning('Zielsprache wurde geleert, da sie identisch mit der Ausgangssprache war.');
+    }
+    
+    if (sessionCards.length > 0) {
+        displayCard();
+    }
+}
+
+function changeTargetLanguage(value) {
+    if (value && value === sourceLanguage) {
+        showLanguageWarning('Ausgangs- und Zielsprache können nicht identisch sein!');
+        document.getElementById('targetLanguageSelect').value = '';
+        return;
+    }
+    
+    targetLanguage = value;
+    
+    if (sessionCards.length > 0) {
+        displayCard();
+    }
+}
+
+// Show language warning message
+function showLanguageWarning(message) {
+    bulmaToast.toast({
+        message: message,
+        type: 'is-warning',
+        duration: 4000,
+        position: 'top-right'
+    });
+}
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    // Set language selects from session
+    document.getElementById('sourceLanguageSelect').value = sourceLanguage;
+    if (targetLanguage) {
+        document.getElementById('targetLanguageSelect').value = targetLanguage;
+    }
+    
+    console.log('Initialized with languages:', { sourceLanguage, targetLanguage });
+    loadBegriffe();
+});
+
+// Keyboard shortcuts
+document.addEventListener('keydown', function(e) {
+    switch(e.key) {
+        case ' ':
+        case 'Enter':
+            e.preventDefault();
+            flipCard();
+            break;
+        case '1':
+            markDifficulty('easy');
+            break;
+        case '2':
+            markDifficulty('medium');
+            break;
+        case '3':
+            markDifficulty('hard');
+            break;
+        case 'ArrowLeft':
+            document.getElementById('prevCard').click();
+            break;
+        case 'ArrowRight':
+            document.getElementById('nextCard').click();
+            break;
+    }
+});
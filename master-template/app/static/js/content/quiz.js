@@ -0,0 +1,380 @@
+// Page data rendered by the template (see #page-data)
+const pageData = JSON.parse(document.getElementById('page-data').textContent);
+
+// Quiz State
+let quizData = pageData.content;
+let currentQuiz = [];
+let currentQuestionIndex = 0;
+let selectedAnswer = null;
+let quizMode = 'practice';
+let score = 0;
+let correctAnswers = 0;
+let startTime = null;
+let timeRemaining = 30;
+let timerInterval = null;
+let userAnswers = [];
+
+// Initialize quiz system
+document.addEventListener('DOMContentLoaded', () => {
+    updateStats();
+});
+
+function startQuiz(mode) {
+    quizMode = mode;
+    currentQuestionIndex = 0;
+    score = 0;
+    correctAnswers = 0;
+    userAnswers = [];
+    startTime = new Date();
+    
+    // Filter and shuffle questions
+    currentQuiz = quizData.filter(q => q.content_data.fragen && q.content_data.fragen.length > 0);
+    currentQuiz = shuffleArray([...currentQuiz]).slice(0, 10); // Take 10 random questions
+    
+    // Show quiz interface
+    document.getElementById('modeSelection').style.display = 'none';
+    document.getElementById('quizInterface').style.display = 'block';
+    
+    // Setup timer for timed/exam mode
+    if (mode === 'timed' || mode === 'exam') {
+        document.getElementById('timerSection').style.display = 'block';
+    }
+    
+    loadQuestion();
+}
+
+function loadQuestion() {
+    if (currentQuestionIndex >= currentQuiz.length) {
+        endQuiz();
+        return;
+    }
+    
+    const question = currentQuiz[currentQuestionIndex];
+    const questionData = question.content_data.fragen[0]; // Take first question
+    
+    // Update counters
+    document.getElementById('questionCounter').textContent = `${currentQuestionIndex + 1} / ${currentQuiz.length}`;
+    document.getElementById('quizProgress').value = (currentQuestionIndex / currentQuiz.length) * 100;
+    
+    // Load question content
+    document.getElementById('questionText').textContent = questionData.frage;
+    document.getElementById('questionCategory').textContent = question.content_data.kategorie || 'Allgemein';
+    
+    // Set difficulty
+    const difficulty = question.content_data.schwierigkeit || 'mittel';
+    const difficultyEmoji = {
+        'leicht': '🟢 Leicht',
+        'mittel': '🟡 Mittel',
+        'schwer': '🔴 Schwer'
+    };
+    document.getElementById('questionDifficulty').textContent = difficultyEmoji[difficulty];
+    
+    // Load translation if needed
+    if (pageData.translateTo) {
+        loadQuestionTranslation(questionData.frage);
+    }
+    
+    // Generate answer options
+    generateAnswerOptions(questionData);
+    
+    // Reset UI state
+    selectedAnswer = null;
+    document.getElementById('submitAnswer').disabled = true;
+    document.getElementById('nextSection').style.display = 'none';
+    document.getElementById('quizActions').style.display = 'block';
+    
+    // Start timer if needed
+    if (quizMode === 'timed' || quizMode === 'exam') {
+        startTimer();
+    }
+}
+
+function generateAnswerOptions(questionData) {
+    const container = document.getElementById('answerOptions');
+    container.innerHTML = '';
+    
+    const options = questionData.antworten || [];
+    
+    options.forEach((option, index) => {
+        const optionDiv = document.createElement('div');
+        optionDiv.className = 'quiz-option';
+        optionDiv.setAttribute('data-index', index);
+        optionDiv.innerHTML = `
+            <div class="level is-mobile">
+                <div class="level-left">
+                    <div class="level-item">
+                        <span class="tag is-light">${String.fromCharCode(65 + index)}</span>
+                        <span class="ml-3">${option.text}</span>
+                    </div>
+                </div>
+                <div class="level-right">
+                    <div class="level-item">
+                        <span class="icon">
+                            <i class="fas fa-circle-o"></i>
+                        </span>
+                    </div>
+                </div>
+            </div>
+        `;
+        
+        optionDiv.addEventListener('click', () => selectAnswer(index, optionDiv));
+        container.appendChild(optionDiv);
+    });
+}
+
+function selectAnswer(index, element) {
+    // Remove previous selection
+    document.querySelectorAll('.quiz-option').forEach(opt => {
+        opt.classList.remove('is-selected');
+        opt.querySelector('.fa-circle-o').className = 'fas fa-circle-o';
+    });
+    
+    // Mark new selection
+    element.classList.add('is-selected');
+    element.querySelector('.fa-circle-o').className = 'fas fa-dot-circle';
+    
+    selectedAnswer = index;
+    document.getElementById('submitAnswer').disabled = false;
+}
+
+function submitAnswer() {
+    if (selectedAnswer === null) return;
+    
+    clearInterval(timerInterval);
+    
+    const question = currentQuiz[currentQuestionIndex];
+    const questionData = question.content_data.fragen[0];
+    const correctIndex = questionData.antworten.findIndex(a => a.correct);
+    const isCorrect = selectedAnswer === correctIndex;
+    
+    // Store answer
+    userAnswers.push({
+        questionId: question.id,
+        selectedAnswer: selectedAnswer,
+        correctAnswer: correctIndex,
+        isCorrect: isCorrect,
+        timeSpent: quizMode === 'timed' ? (30 - timeRemaining) : null
+    });
+    
+    if (isCorrect) {
+        correctAnswers++;
+        score += question.content_data.schwierigkeit === 'schwer' ? 3 : 
+                question.content_data.schwierigkeit === 'mittel' ? 2 : 1;
+    }
+    
+    // Show feedback
+    showAnswerFeedback(isCorrect, correctIndex);
+    
+    // Update UI
+    document.getElementById('quizActions').style.display = 'none';
+    document.getElementById('nextSection').style.display = 'block';
+    
+    updateStats();
+}
+
+function showAnswerFeedback(isCorrect, correctIndex) {
+    const options = document.querySelectorAll('.quiz-option');
+    
+    options.forEach((option, index) => {
+        if (index === correctIndex) {
+            option.classList.add('correct');
+        } else if (index === selectedAnswer && !isCorrect) {
+            option.classList.add('wrong');
+        }
+        option.style.pointerEvents = 'none';
+    });
+    
+    // Show toast
+    const message = isCorrect ? 'Richtig! 🎉' : 'Leider falsch 😞';
+    const type = isCorrect ? 'is-success' : 'is-danger';
+    
+    bulmaToast.toast({
+        message: message,
+        type: type,
+        duration: 2000,
+        position: 'top-right'
+    });
+}
+
+function nextQuestion() {
+    currentQuestionIndex++;
+    loadQuestion();
+}
+
+function skipQuestion() {
+    userAnswers.push({
+        questionId: currentQuiz[currentQuestionIndex].id,
+        selectedAnswer: null,
+        correctAnswer: null,
+        isCorrect: false,
+        skipped: true
+    });
+    
+    nextQuestion();
+}
+
+function startTimer() {
+    timeRemaining = 30;
+    updateTimerDisplay();
+    
+    timerInterval = setInterval(() => {
+        timeRemaining--;
+        updateTimerDisplay();
+        
+        if (timeRemaining <= 0) {
+            clearInterval(timerInterval);
+            // Auto-submit or skip
+            if (selectedAnswer !== null) {
+                submitAnswer();
+            } else {
+                skipQuestion();
+            }
+        }
+    }, 1000);
+}
+
+function updateTimerDisplay() {
+    const timer = document.getElementById('timer');
+    timer.textContent = `${timeRemaining}s`;
+    
+    if (timeRemaining <= 10) {
+        timer.className = 'tag is-danger';
+    } else if (timeRemaining <= 20) {
+        timer.className = 'tag is-warning';
+    } else {
+        timer.className = 'tag is-success';
+    }
+}
+
+function endQuiz() {
+    const endTime = new Date();
+    const timeSpent = Math.round((endTime - startTime) / 1000 / 60); // minutes
+    const percentage = Math.round((correctAnswers / currentQuiz.length) * 100);
+    
+    // Hide quiz interface
+    document.getElementById('quizInterface').style.display = 'none';
+    document.getElementById('quizResults').style.display = 'block';
+    
+    // Update results
+    document.getElementById('finalScore').textContent = `${percentage}%`;
+    document.getElementById('correctCount').textContent = `${correctAnswers}/${currentQuiz.length}`;
+    document.getElementById('timeSpent').textContent = `${timeSpent}m`;
+    
+    // Motivational message
+    const motivation = getMotivationalMessage(percentage);
+    document.getElementById('motivationMessage').innerHTML = motivation;
+    
+    // Save progress to backend
+    saveQuizResults();
+}
+
+function getMotivationalMessage(percentage) {
+    if (percentage >= 90) {
+        return '<p class="has-text-weight-bold">Perfekt! 🏆</p><p>Du beherrschst den Stoff ausgezeichnet!</p>';
+    } else if (percentage >= 80) {
+        return '<p class="has-text-weight-bold">Sehr gut! 🌟</p><p>Du bist auf dem richtigen Weg!</p>';
+    } else if (percentage >= 70) {
+        return '<p class="has-text-weight-bold">Gut gemacht! 👍</p><p>Mit etwas Übung wirst du noch besser!</p>';
+    } else if (percentage >= 60) {
+        return '<p class="has-text-weight-bold">Nicht schlecht! 📚</p><p>Wiederhole die Begriffe und versuche es erneut!</p>';
+    } else {
+        return '<p class="has-text-weight-bold">Übung macht den Meister! 💪</p><p>Gehe die Begriffe nochmal durch und probiere es erneut!</p>';
+    }
+}
+
+async function saveQuizResults() {
+    try {
+        const response = await fetch('/api/quiz/results', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                mode: quizMode,
+                score: score,
+                correctAnswers: correctAnswers,
+                totalQuestions: currentQuiz.length,
+                answers: userAnswers,
+                timeSpent: Math.round((new Date() - startTime) / 1000)
+            })
+        });
+        
+        if (response.ok) {
+            console.log('Quiz results saved successfully');
+        }
+    } catch (error) {
+        console.error('Error saving quiz results:', error);
+    }
+}
+
+function startNewQuiz() {
+    document.getElementById('quizResults').style.display = 'none';
+    document.getElementById('modeSelection').style.display = 'block';
+}
+
+function reviewAnswers() {
+    // TODO: Implement answer review interface
+    bulmaToast.toast({
+        message: 'Antwort-Review wird implementiert...',
+        type: 'is-info',
+        duration: 3000
+    });
+}
+
+function loadQuestionTranslation(question) {
+    // TODO: Call translation API
+    const translationDiv = document.getElementById('questionTranslation');
+    translationDiv.style.display = 'block';
+    document.getElementById('translatedQuestion').textContent = 'Translation loading...';
+}
+
+function updateStats() {
+    document.getElementById('correctAnswers').textContent = correctAnswers;
+    document.getElementById('currentStreak').textContent = getUserStreak();
+}
+
+function getUserStreak() {
+    // Calculate current streak from recent answers
+    let streak = 0;
+    for (let i = userAnswers.length - 1; i >= 0; i--) {
+        if (userAnswers[i].isCorrect) {
+            streak++;
+        } else {
+            break;
+        }
+    }
+    return streak;
+}
+
+// Utility functions
+function shuffleArray(array) {
+    const shuffled = [...array];
+    for (let i = shuffled.length - 1; i > 0; i--) {
+        const j = Math.floor(Math.random() * (i + 1));
+        [shuffled[i], shuffled[j]] = [shuffled[j], shuffled[i]];
+    }
+    return shuffled;
+}
+
+// Keyboard shortcuts
+document.addEventListener('keydown', (e) => {
+    if (document.getElementById('quizInterface').style.display !== 'none') {
+        // Number keys for answer selection
+        if (e.key >= '1' && e.key <= '4') {
+            const index = parseInt(e.key) - 1;
+            const option = document.querySelector(`[data-index="${index}"]`);
+            if (option) {
+                selectAnswer(index, option);
+            }
+        }
+        
+        // Enter to submit
+        if (e.key === 'Enter' && selectedAnswer !== null) {
+            submitAnswer();
+        }
+        
+        // Space for next question
+        if (e.key === ' ' && document.getElementById('nextSection').style.display !== 'none') {
+            e.preventDefault();
+            nextQuestion();
+        }
+    }
+});
@@ -4,9 +4,6 @@ let darkMode = JSON.parse(localStorage.getItem('darkMode') || 'false');
 let animationsEnabled = JSON.parse(localStorage.getItem('animationsEnabled') || 'true');
 let defaultTargetLanguage = localStorage.getItem('defaultTargetLanguage') || 'en';
 
-// Translation cache for live translations
-let translationCache = new Map();
-
 // Top 20 Migrantensprachen in Deutschland
 const languages = [
     { code: 'en', name: 'English', flag: '🇬🇧', native: 'English' },
@@ -242,33 +239,6 @@ async function updateModalTranslations() {
     }
 }
 
-// Live translation function using MyMemory API
-async function translateText(text, fromLang, toLang) {
-    // Create cache key
-    const cacheKey = `${fromLang}-${toLang}-${text}`;
-    
-    // Check cache first
-    if (translationCache.has(cacheKey)) {
-        return translationCache.get(cacheKey);
-    }
-    
-    try {
-        // Use MyMemory Translation API (free alternative to Google Translate)
-        const response = await fetch(`https://api.mymemory.translated.net/get?q=${encodeURIComponent(text)}&langpair=${fromLang}|${toLang}`);
-        const data = await response.json();
-        
-        let translation = data.responseData.translatedText;
-        
-        // Store in cache
-        translationCache.set(cacheKey, translation);
-        
-        return translation;
-    } catch (error) {
-        console.log('Translation failed:', error);
-        return text; // Return original text if translation fails
-    }
-}
-
 async function getTranslationForLanguage(begriff, langCode) {
     // For German, return original content
     if (langCode === 'de') {
@@ -0,0 +1,68 @@
+// Server-side translations
+// Content translations are stored per tenant (/api/translations), free text
+// goes through the shared server cache (/api/translate).
+
+const contentTranslationCache = new Map();
+const textTranslationCache = new Map();
+
+// Fetch translations for several content items in one request
+async function fetchContentTranslations(contentIds, lang) {
+    let missing = contentIds.filter(id => !contentTranslationCache.has(`${lang}-${id}`));
+
+    // The server translates a limited amount per request and returns the
+    // rest as pending; ask again while it makes progress
+    while (missing.length > 0) {
+        const response = await fetch('/api/translations', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ content_ids: missing, lang: lang })
+        });
+        if (!response.ok) {
+            throw new Error(`Translation request failed: ${response.status}`);
+        }
+        const data = await response.json();
+        for (const [id, fields] of Object.entries(data.translations)) {
+            contentTranslationCache.set(`${lang}-${id}`, fields);
+        }
+        const pending = data.pending || [];
+        if (pending.length >= missing.length) break;
+        missing = pending;
+    }
+
+    const result = {};
+    for (const id of contentIds) {
+        result[id] = contentTranslationCache.get(`${lang}-${id}`) || {};
+    }
+    return result;
+}
+
+// Translated fields ({title, definition, beispiel, ...}) of one content item
+async function getContentTranslation(contentId, lang) {
+    const translations = await fetchContentTranslations([contentId], lang);
+    return translations[contentId];
+}
+
+// Translate free text (not stored in course content)
+async function translateText(text, fromLang, toLang) {
+    if (!text || fromLang === toLang) return text;
+
+    const cacheKey = `${fromLang}-${toLang}-${text}`;
+    if (textTranslationCache.has(cacheKey)) {
+        return textTranslationCache.get(cacheKey);
+    }
+
+    try {
+        const response = await fetch('/api/translate', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ text: text, source: fromLang, target: toLang })
+        });
+        const data = await response.json();
+        const translation = data.translation || text;
+        textTranslationCache.set(cacheKey, translation);
+        return translation;
+    } catch (error) {
+        console.log('Translation failed:', error);
+        return text;
+    }
+}
@@ -0,0 +1,136 @@
+"""
+Tenant binding for warm pool containers
+Pool containers boot without a tenant; the backend claims one after
+payment and binds it to a subdomain. The binding lives in tenant.json on
+the data volume and overrides the environment on every start.
+"""
+
+import hmac
+import json
+import logging
+import os
+import secrets
+import signal
+import sqlite3
+
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.security import generate_password_hash
+
+from app.auth import create_password_token
+
+BINDING_FILE = 'tenant.json'
+
+# Binding fields -> app.config keys
+BINDING_CONFIG = {
+    'tenant_id': 'TENANT_ID',
+    'plan': 'TENANT_PLAN',
+    'email': 'TENANT_EMAIL',
+    'color': 'TENANT_COLOR',
+    'academy_name': 'ACADEMY_NAME',
+}
+
+pool_bp = Blueprint('pool', __name__)
+
+
+def binding_path(db_path):
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), BINDING_FILE)
+
+
+def read_binding(db_path):
+    """The stored binding, None for an unclaimed pool container"""
+    try:
+        with open(binding_path(db_path)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def load_binding(app):
+    """Apply a stored binding to the config (before extensions read it)"""
+    binding = read_binding(app.config['DATABASE'])
+    if binding is not None:
+        for field, key in BINDING_CONFIG.items():
+            if binding.get(field):
+                app.config[key] = binding[field]
+    return binding
+
+
+def bind_tenant(db_path, binding):
+    """Store tenant row, admin user and tenant.json for a claimed container
+
+    The admin account starts without a usable password; returns the
+    one-time token of its set-password link.
+    """
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.execute('''
+            INSERT OR REPLACE INTO tenants (id, name, subdomain) VALUES (?, ?, ?)
+        ''', (binding['tenant_id'], binding['academy_name'], binding['tenant_id']))
+        cursor = conn.execute('''
+            INSERT INTO users (tenant_id, username, email, password_hash, role,
+                               is_verified, is_approved, is_admin)
+            VALUES (?, ?, ?, ?, 'admin', 1, 1, 1)
+        ''', (binding['tenant_id'], binding['email'], binding['email'],
+              generate_password_hash(secrets.token_urlsafe(32))))
+        token = create_password_token(conn, cursor.lastrowid)
+        conn.commit()
+    finally:
+        conn.close()
+
+    # Written last and atomically: a container counts as claimed only
+    # once its tenant data exists
+    path = binding_path(db_path)
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump(binding, f)
+    os.replace(f'{path}.tmp', path)
+    return token
+
+
+def apply_binding(app):
+    """Switch this worker to the new tenant without waiting for the reload"""
+    load_binding(app)
+    tenant_id = app.config['TENANT_ID']
+    app.extensions['email_renderer'].tenant_id = tenant_id
+    catalog = app.extensions['catalog']
+    catalog.tenant_id = tenant_id
+    catalog.refresh()
+
+
+@pool_bp.route('/claim', methods=['POST'])
+def claim():
+    """Bind this pool container to a tenant (called by the backend only)"""
+    token = current_app.config.get('POOL_TOKEN')
+    if not token:
+        return jsonify({'error': 'Kein Pool-Container'}), 404
+    if not hmac.compare_digest(request.headers.get('X-Pool-Token', ''), token):
+        return jsonify({'error': 'Nicht autorisiert'}), 403
+    if read_binding(current_app.config['DATABASE']) is not None:
+        return jsonify({'error': 'Container bereits vergeben'}), 409
+
+    data = request.get_json(silent=True) or {}
+    missing = [field for field in ('tenant_id', 'email') if not data.get(field)]
+    if missing:
+        return jsonify({'error': f'Fehlende Felder: {", ".join(missing)}'}), 400
+
+    binding = {field: data.get(field) for field in BINDING_CONFIG}
+    binding['academy_name'] = binding['academy_name'] or binding['tenant_id']
+    token = bind_tenant(current_app.config['DATABASE'], binding)
+    apply_binding(current_app)
+
+    from app.email_service import send_welcome_email
+    send_welcome_email(binding['email'], token)
+
+    # All other workers still run as the pool tenant: graceful gunicorn
+    # reload, the new workers read tenant.json in create_app
+    if request.environ.get('SERVER_SOFTWARE', '').startswith('gunicorn'):
+        os.kill(os.getppid(), signal.SIGHUP)
+
+    logging.info(f"Pool container claimed by tenant {binding['tenant_id']}")
+    return jsonify({'tenant_id': binding['tenant_id']})
+
+
+def init_tenant_binding(app):
+    """Apply a stored binding and register the claim endpoint"""
+    binding = load_binding(app)
+    app.register_blueprint(pool_bp, url_prefix='/internal')
+    return binding
@@ -0,0 +1,202 @@
+"""
+Translation service
+Serves translations from course_content.translations, fills gaps through a
+pluggable provider and stores the result so each term/language is
+translated once per tenant
+"""
+
+from flask import current_app
+import html
+import json
+import logging
+import time
+
+import requests
+
+from app.auth import TTLCache
+
+# Fields that get translated: 'title' is a column, the rest live in content_data
+TRANSLATABLE_FIELDS = ('title', 'definition', 'beispiel', 'frage')
+
+
+class TranslationError(Exception):
+    """Provider answered without a usable translation (never stored)"""
+
+
+class MyMemoryProvider:
+    """MyMemory translation API over one shared HTTP session"""
+
+    url = 'https://api.mymemory.translated.net/get'
+
+    def __init__(self):
+        self.session = requests.Session()
+
+    def translate(self, text, source, target):
+        response = self.session.get(
+            self.url,
+            params={'q': text, 'langpair': f'{source}|{target}'},
+            timeout=10
+        )
+        response.raise_for_status()
+        data = response.json()
+        translation = (data.get('responseData') or {}).get('translatedText')
+
+        # Errors and the daily quota arrive as HTTP 200 with the message
+        # as "translation"
+        if str(data.get('responseStatus')) != '200':
+            raise TranslationError(f"MyMemory status {data.get('responseStatus')}: {translation}")
+        if not translation or translation.lower() == 'undefined':
+            raise TranslationError('MyMemory returned no translation')
+        if 'MYMEMORY WARNING' in translation:
+            raise TranslationError(translation)
+
+        # MyMemory quirks: HTML entities and placeholder answers
+        translation = html.unescape(translation).replace('\xa0', ' ')
+        return translation.replace('UNTRANSLATED', text).replace('NO QUERY SPECIFIED', text)
+
+
+class StubProvider:
+    """Offline provider for tests and local development"""
+
+    def translate(self, text, source, target):
+        return f'[{target}] {text}'
+
+
+PROVIDERS = {
+    'mymemory': MyMemoryProvider,
+    'stub': StubProvider,
+}
+
+
+class TranslationService:
+
+    def __init__(self, provider, max_calls=20, budget_seconds=15):
+        self.provider = provider
+        # Per request: provider calls block the worker (gunicorn timeout 30 s)
+        self.max_calls = max_calls
+        self.budget_seconds = budget_seconds
+        # Free text that isn't stored in course_content
+        self.text_cache = TTLCache(ttl=24 * 3600, max_size=4096)
+
+    def translate_text(self, text, source, target):
+        """Translate free text, cached per process"""
+        if not text or source == target:
+            return text
+        key = (source, target, text)
+        translation = self.text_cache.get(key)
+        if translation is None:
+            translation = self.provider.translate(text, source, target)
+            self.text_cache.set(key, translation)
+        return translation
+
+    def translate_content(self, db, content_ids, target, source='de'):
+        """Return ({content_id: {field: text}}, pending ids) for target
+
+        Gaps are translated until max_calls or budget_seconds is used up;
+        unfinished rows are returned as pending for the client to ask again.
+        Each row's new fields are stored as soon as the row is done.
+        """
+        if not content_ids:
+            return {}, []
+
+        placeholders = ','.join('?' * len(content_ids))
+        rows = db.execute(f'''
+            SELECT id, title, content_data, translations FROM course_content
+            WHERE id IN ({placeholders})
+        ''', list(content_ids)).fetchall()
+
+        result = {}
+        pending = []
+        calls = 0
+        deadline = time.monotonic() + self.budget_seconds
+        for row in rows:
+            stored = load_translations(row['translations']).get(target, {})
+            source_fields = translatable_fields(row)
+
+            translated = {}
+            new_fields = {}
+            complete = True
+            for field, text in source_fields.items():
+                if field in stored:
+                    translated[field] = stored[field]
+                    continue
+                # Checked per field; the first call always goes through, so
+                # every request makes progress
+                if calls and (calls >= self.max_calls or time.monotonic() >= deadline):
+                    complete = False
+                    break
+                calls += 1
+                try:
+                    translated[field] = self.provider.translate(text, source, target)
+                except Exception as e:
+                    logging.warning(f"Translation failed for content {row['id']}: {e}")
+                    translated[field] = text
+                    continue
+                new_fields[field] = translated[field]
+
+            if new_fields:
+                store_translations(db, {row['id']: new_fields}, target)
+            if complete:
+                result[row['id']] = translated
+            else:
+                pending.append(row['id'])
+
+        return result, pending
+
+
+def load_translations(raw):
+    """Parse the translations column into {lang: {field: text}}
+
+    Migrated rows store {lang: "<translated title>"}; those are read as
+    the title translation.
+    """
+    try:
+        data = json.loads(raw) if raw else {}
+    except json.JSONDecodeError:
+        return {}
+    return {lang: value if isinstance(value, dict) else {'title': value}
+            for lang, value in data.items()}
+
+
+def translatable_fields(row):
+    """Non-empty source texts of a course_content row"""
+    try:
+        content_data = json.loads(row['content_data']) if row['content_data'] else {}
+    except json.JSONDecodeError:
+        content_data = {}
+
+    fields = {'title': row['title']}
+    for field in TRANSLATABLE_FIELDS[1:]:
+        value = content_data.get(field)
+        if isinstance(value, str) and value.strip():
+            fields[field] = value
+    return fields
+
+
+def store_translations(db, new_fields, target):
+    """Merge new field translations into the rows (re-read under lock)"""
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        for content_id, fields in new_fields.items():
+            row = db.execute('SELECT translations FROM course_content WHERE id = ?',
+                             (content_id,)).fetchone()
+            translations = load_translations(row['translations'] if row else None)
+            translations.setdefault(target, {}).update(fields)
+            db.execute('UPDATE course_content SET translations = ? WHERE id = ?',
+                       (json.dumps(translations, ensure_ascii=False), content_id))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def init_translation(app):
+    provider_name = app.config['TRANSLATION_PROVIDER']
+    app.extensions['translation'] = TranslationService(
+        PROVIDERS[provider_name](),
+        max_calls=app.config['TRANSLATION_MAX_CALLS'],
+        budget_seconds=app.config['TRANSLATION_BUDGET_SECONDS'])
+
+
+def get_translation_service():
+    return current_app.extensions['translation']
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Server Benchmark - Flask dev server vs. gunicorn
+Starts each server against a throwaway database and measures requests/s
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PATHS = ['/auth/login', '/api/content/stats']
+
+
+def start_server(kind, port, env):
+    """Start the dev server or gunicorn on the given port"""
+    if kind == 'dev':
+        cmd = [sys.executable, '-c',
+               f"from run import app; app.run(host='127.0.0.1', port={port}, debug=False)"]
+    else:
+        cmd = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+               '--bind', f'127.0.0.1:{port}', 'run:app']
+
+    proc = subprocess.Popen(cmd, cwd=BASE_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Wait until the server answers
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}{PATHS[0]}', timeout=1)
+            return proc
+        except OSError:
+            time.sleep(0.1)
+
+    proc.kill()
+    raise RuntimeError(f'{kind} server did not start')
+
+
+def run_load(port, path, requests_total, concurrency):
+    """Fire requests with a thread pool, return requests per second"""
+    url = f'http://127.0.0.1:{port}{path}'
+
+    def fetch(_):
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(fetch, range(requests_total)))
+    return requests_total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ,
+                   DATABASE_PATH=os.path.join(tmp, 'courses.db'),
+                   CATALOG_REFRESH_SECONDS='0')
+
+        print(f"📊 {args.requests} requests, concurrency {args.concurrency}")
+        for kind in ('dev', 'gunicorn'):
+            proc = start_server(kind, args.port, env)
+            try:
+                for path in PATHS:
+                    run_load(args.port, path, 100, args.concurrency)  # warm-up
+                    rps = run_load(args.port, path, args.requests, args.concurrency)
+                    print(f"  {kind:<9} {path:<22} {rps:8.0f} req/s")
+            finally:
+                proc.terminate()
+                proc.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Asset Build Script - bundles, minifies and fingerprints app/static
+Writes app/static/dist/ and its manifest.json, and the CSS-inlined email
+templates in app/templates/email/compiled/ (run at image build time)
+"""
+
+import os
+
+from app.assets import build_assets
+from app.email_templates import build_email_templates
+
+if __name__ == '__main__':
+    build_assets(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'static'))
+    build_email_templates()
@@ -0,0 +1,38 @@
+"""
+Email subject check
+Subjects are mail headers, not HTML: renders every subject with values
+containing &, ' and < and fails if any of them comes out escaped
+
+    python check_email_subjects.py
+"""
+
+import sys
+from types import SimpleNamespace
+
+from app.email_templates import EMAILS, EmailRenderer
+
+CONTEXT = {
+    'academy_name': "Müller & Söhne",
+    'title': "Kurs 'A' <neu>",
+    'username': "o'brien <admin>",
+}
+
+ESCAPES = ('&amp;', '&#39;', '&lt;', '&gt;', '&#34;')
+
+
+def main():
+    renderer = EmailRenderer(SimpleNamespace(config={'TENANT_ID': 'check'}))
+    failed = 0
+    for name in sorted(EMAILS):
+        subject = renderer.subjects[name].render(CONTEXT)
+        escaped = [entity for entity in ESCAPES if entity in subject]
+        print(f"{'❌' if escaped else '✅'} {name}: {subject}")
+        failed += bool(escaped)
+    if renderer.subjects['announcement'].render(CONTEXT) != "Müller & Söhne: Kurs 'A' <neu>":
+        print("❌ announcement subject changed unexpectedly")
+        failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Gunicorn configuration for tenant containers
+Worker count follows the container's CPU quota, not the host's cores
+"""
+
+import multiprocessing
+import os
+
+
+def container_cpu_count():
+    """CPUs available to this container (cgroup v2/v1 quota, else host count)"""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            return max(1, int(quota) // int(period))
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, quota // period)
+    except (OSError, ValueError):
+        pass
+
+    return multiprocessing.cpu_count()
+
+
+cpus = container_cpu_count()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# SQLite + templates: processes for CPU, threads to overlap I/O waits
+workers = int(os.environ.get('WEB_CONCURRENCY', min(2 * cpus + 1, int(os.environ.get('MAX_WORKERS', 8)))))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Each worker builds its own app (catalog refresh thread, user cache)
+preload_app = False
+
+# Timeouts: kill stuck requests, drain in-flight ones on reload/stop
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Caddy keeps upstream connections open; stay above its idle timeout
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 75))
+
+# Optional worker recycling to cap memory growth (0 = off; recycling
+# gthread workers can reset connections that are queued on them)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """Create/migrate the database once before workers fork"""
+    from app import init_database
+
+    db_path = os.environ.get(
+        'DATABASE_PATH', os.path.join(os.path.dirname(__file__), 'data', 'courses.db'))
+    init_database(db_path)
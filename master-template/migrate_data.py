@@ -1,383 +1,408 @@
 #!/usr/bin/env python3
 """
-Data Migration Script - IHK Privatrecht to Kurs-Master
-Migrates users and begriffe to new multi-tenant structure
+Data Migration Script - legacy course databases to Kurs-Master
+Streams users and begriffe in chunks into the multi-tenant structure,
+derives quiz and flashcard content in the same pass and records progress
+in a checkpoint table so an interrupted run resumes where it stopped
+
+Usage:
+    python migrate_data.py                                  # legacy default paths
+    python migrate_data.py TENANT:OLD_DB:NEW_DB [...] --jobs 4
+    python migrate_data.py --manifest tenants.json --jobs 4
+
+Manifest: [{"tenant_id": "...", "old_db": "...", "new_db": "...",
+            "course": {"title": "...", ...}}, ...]
 """
 
+import argparse
+from multiprocessing import Pool
 import sqlite3
 import json
 import os
-from datetime import datetime
+import sys
+import time
+
+from app import init_database
 
-# Database paths
+# Database paths (single legacy academy)
 OLD_DB = '/home/tba/docker/ihk-privatrecht/data/begriffe.db'
 NEW_DB = '/home/tba/docker/kurs-master/data/courses.db'
+DEFAULT_TENANT = 'demo-tenant'
 
-def migrate_data():
-    """Migrate users and content from old system to new multi-tenant structure"""
-    
-    # Connect to databases
-    old_conn = sqlite3.connect(OLD_DB)
-    old_conn.row_factory = sqlite3.Row
-    
-    # Create new database directory
-    os.makedirs(os.path.dirname(NEW_DB), exist_ok=True)
-    
-    new_conn = sqlite3.connect(NEW_DB)
-    new_conn.row_factory = sqlite3.Row
-    
-    print("🚀 Starting data migration...")
-    
-    try:
-        # 0. Create database schema
-        print("🏗️ Creating database schema...")
-        create_schema(new_conn)
-        
-        # 1. Create course entry
-        print("📚 Creating course entry...")
-        course_id = create_course(new_conn)
-        
-        # 2. Migrate users
-        print("👥 Migrating users...")
-        migrate_users(old_conn, new_conn)
-        
-        # 3. Migrate begriffe as course content
-        print("📖 Migrating begriffe to course content...")
-        migrate_begriffe(old_conn, new_conn, course_id)
-        
-        # 4. Create sample quiz content
-        print("🧠 Creating sample quiz content...")
-        create_quiz_content(new_conn, course_id)
-        
-        # 5. Create sample flashcard content
-        print("💳 Creating sample flashcard content...")
-        create_flashcard_content(new_conn, course_id)
-        
-        new_conn.commit()
-        print("✅ Migration completed successfully!")
-        
-        # Print statistics
-        print_statistics(new_conn)
-        
-    except Exception as e:
-        print(f"❌ Migration failed: {e}")
-        new_conn.rollback()
-        raise
-    finally:
-        old_conn.close()
-        new_conn.close()
+DEFAULT_COURSE = {
+    'title': 'IHK Privatrecht',
+    'description': 'Interaktive Lernplattform für Privatrecht - Grundlagen des Vertragsrechts, Kaufvertrags und Gewährleistung',
+    'target_audience': 'Auszubildende und Studierende',
+    'level': 'Grundkurs',
+    'language': 'de',
+}
 
-def create_schema(conn):
-    """Create database schema"""
-    cursor = conn.cursor()
-    
-    # Tenant information
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tenants (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            subdomain TEXT UNIQUE NOT NULL,
-            branding_config TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Courses per tenant
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS courses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tenant_id TEXT NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            target_audience TEXT,
-            level TEXT,
-            language TEXT DEFAULT 'de',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (tenant_id) REFERENCES tenants(id)
-        )
-    ''')
-    
-    # Dynamic content storage
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS course_content (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            course_id INTEGER NOT NULL,
-            type TEXT NOT NULL,
-            title TEXT NOT NULL,
-            content_data TEXT NOT NULL,
-            translations TEXT,
-            order_index INTEGER DEFAULT 0,
-            status TEXT DEFAULT 'active',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (course_id) REFERENCES courses(id)
-        )
-    ''')
-    
-    # Users with multi-language support
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tenant_id TEXT NOT NULL,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT,
-            password_hash TEXT NOT NULL,
-            role TEXT DEFAULT 'student',
-            preferred_language TEXT DEFAULT 'de',
-            translate_to TEXT,
-            is_verified BOOLEAN DEFAULT TRUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (tenant_id) REFERENCES tenants(id)
-        )
-    ''')
-    
-    # User progress tracking
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_progress (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            content_id INTEGER NOT NULL,
+CHUNK_SIZE = 1000
+
+# Rows per transaction; progress is checkpointed with each commit
+COMMIT_EVERY = 50000
+
+# Quiz questions are generated for the first begriffe only
+QUIZ_LIMIT = 10
+
+# order_index offsets per derived content type
+QUIZ_ORDER_OFFSET = 100
+FLASHCARD_ORDER_OFFSET = 200
+
+CONTENT_INSERT = '''
+    INSERT INTO course_content (
+        course_id, type, title, content_data, translations, order_index, status
+    ) VALUES (?, ?, ?, ?, ?, ?, 'active')
+'''
+
+USER_INSERT = '''
+    INSERT OR IGNORE INTO users (
+        tenant_id, username, email, password_hash,
+        preferred_language, translate_to, role,
+        is_verified, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+# =============================================================================
+# Connections and checkpoints
+# =============================================================================
+
+def open_target(db_path):
+    """Open the new database with pragmas tuned for bulk loading"""
+    init_database(db_path)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA cache_size = -65536')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS migration_checkpoints (
+            source TEXT NOT NULL,
+            phase TEXT NOT NULL,
+            last_id INTEGER DEFAULT 0,
+            rows INTEGER DEFAULT 0,
             completed BOOLEAN DEFAULT FALSE,
-            score INTEGER,
-            attempts INTEGER DEFAULT 0,
-            notes TEXT,
-            last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id),
-            FOREIGN KEY (content_id) REFERENCES course_content(id),
-            UNIQUE(user_id, content_id)
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, phase)
         )
     ''')
-    
-    # Insert demo tenant
-    cursor.execute('''
-        INSERT OR IGNORE INTO tenants (id, name, subdomain) 
-        VALUES ('demo-tenant', 'Demo Academy', 'demo')
-    ''')
-    
-    conn.commit()
-
-def create_course(conn):
-    """Create main course entry"""
-    cursor = conn.cursor()
-    
-    cursor.execute('''
+    return conn
+
+
+def open_source(db_path):
+    # Read-only: a migration must never touch the legacy database
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def get_checkpoint(conn, source, phase):
+    row = conn.execute('''
+        SELECT last_id, rows, completed FROM migration_checkpoints
+        WHERE source = ? AND phase = ?
+    ''', (source, phase)).fetchone()
+    if row is None:
+        return 0, 0, False
+    return row['last_id'], row['rows'], bool(row['completed'])
+
+
+def save_checkpoint(conn, source, phase, last_id, rows, completed=False):
+    conn.execute('''
+        INSERT INTO migration_checkpoints (source, phase, last_id, rows, completed, updated_at)
+        VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT (source, phase) DO UPDATE SET
+            last_id = excluded.last_id, rows = excluded.rows,
+            completed = excluded.completed, updated_at = excluded.updated_at
+    ''', (source, phase, last_id, rows, completed))
+
+
+def stream(conn, query, after_id, chunk_size):
+    """Yield chunks of rows with id > after_id, never the whole table"""
+    cursor = conn.execute(query, (after_id,))
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+def migrate_phase(new_conn, source, phase, chunks, convert):
+    """Insert converted chunks; commit + checkpoint every COMMIT_EVERY rows
+
+    convert(rows, done) returns {sql: [params, ...]} for one chunk, where
+    done is the number of rows migrated before it.
+    """
+    last_id, done, completed = get_checkpoint(new_conn, source, phase)
+    if completed:
+        print(f"   ⏭️  {phase}: already migrated ({done} rows)")
+        return done
+
+    since_commit = 0
+    new_conn.execute('BEGIN')
+    try:
+        for rows in chunks(last_id):
+            for sql, params in convert(rows, done).items():
+                new_conn.executemany(sql, params)
+            done += len(rows)
+            last_id = rows[-1]['id']
+            since_commit += len(rows)
+
+            if since_commit >= COMMIT_EVERY:
+                save_checkpoint(new_conn, source, phase, last_id, done)
+                new_conn.execute('COMMIT')
+                new_conn.execute('BEGIN')
+                since_commit = 0
+
+        save_checkpoint(new_conn, source, phase, last_id, done, completed=True)
+        new_conn.execute('COMMIT')
+    except BaseException:
+        new_conn.execute('ROLLBACK')
+        raise
+
+    return done
+
+
+# =============================================================================
+# Phases
+# =============================================================================
+
+def create_course(new_conn, source, tenant_id, course):
+    """Create tenant + course entry once; the course id is kept in the checkpoint"""
+    course_id, _, completed = get_checkpoint(new_conn, source, 'course')
+    if completed:
+        return course_id
+
+    course = {**DEFAULT_COURSE, **(course or {})}
+    new_conn.execute('BEGIN')
+    new_conn.execute('''
+        INSERT OR IGNORE INTO tenants (id, name, subdomain) VALUES (?, ?, ?)
+    ''', (tenant_id, course['title'], tenant_id))
+    cursor = new_conn.execute('''
         INSERT INTO courses (tenant_id, title, description, target_audience, level, language)
         VALUES (?, ?, ?, ?, ?, ?)
-    ''', (
-        'demo-tenant',
-        'IHK Privatrecht',
-        'Interaktive Lernplattform für Privatrecht - Grundlagen des Vertragsrechts, Kaufvertrags und Gewährleistung',
-        'Auszubildende und Studierende',
-        'Grundkurs',
-        'de'
-    ))
-    
-    return cursor.lastrowid
-
-def migrate_users(old_conn, new_conn):
-    """Migrate users from old system"""
-    old_cursor = old_conn.cursor()
-    new_cursor = new_conn.cursor()
-    
-    # Get all users from old system
-    old_cursor.execute('SELECT * FROM users')
-    users = old_cursor.fetchall()
-    
-    for user in users:
-        # Map old fields to new structure
-        translate_to = None
-        if user['preferred_language'] != 'de':
-            translate_to = user['preferred_language']
-        
-        new_cursor.execute('''
-            INSERT INTO users (
-                tenant_id, username, email, password_hash, 
-                preferred_language, translate_to, role,
-                is_verified, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            'demo-tenant',
-            user['username'],
-            user['email'] or f"{user['username']}@example.com",
-            user['password_hash'],
-            'de',  # Default to German
-            translate_to,
-            'admin' if user['is_admin'] else 'student',
-            user['is_verified'],
-            user['created_at']
-        ))
-    
-    print(f"   Migrated {len(users)} users")
-
-def migrate_begriffe(old_conn, new_conn, course_id):
-    """Migrate begriffe to course_content"""
-    old_cursor = old_conn.cursor()
-    new_cursor = new_conn.cursor()
-    
-    # Get all begriffe
-    old_cursor.execute('SELECT * FROM begriffe ORDER BY id')
-    begriffe = old_cursor.fetchall()
-    
-    for idx, begriff in enumerate(begriffe):
-        # Create content_data JSON
-        content_data = {
-            'definition': begriff['erklaerung'],
-            'beispiel': begriff['beispiel'],
-            'tipp': begriff['tipp'],
-            'kategorie': begriff['kategorie'],
-            'schwierigkeit': begriff['schwierigkeit']
-        }
-        
-        # Create translations JSON
-        translations = {}
-        if begriff['englisch']:
-            translations['en'] = begriff['englisch']
-        if begriff['arabisch']:
-            translations['ar'] = begriff['arabisch']
-        if begriff['tuerkisch']:
-            translations['tr'] = begriff['tuerkisch']
-        
-        new_cursor.execute('''
-            INSERT INTO course_content (
-                course_id, type, title, content_data, translations, order_index, status
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            course_id,
-            'begriff',
-            begriff['begriff'],
-            json.dumps(content_data),
-            json.dumps(translations),
-            idx + 1,
-            'active'
-        ))
-    
-    print(f"   Migrated {len(begriffe)} begriffe to course content")
-
-def create_quiz_content(conn, course_id):
-    """Create sample quiz questions based on begriffe"""
-    cursor = conn.cursor()
-    
-    # Get some begriffe to create quiz questions
-    cursor.execute('SELECT * FROM course_content WHERE type = "begriff" LIMIT 10')
-    begriffe = cursor.fetchall()
-    
-    quiz_questions = []
-    for idx, begriff in enumerate(begriffe):
-        content_data = json.loads(begriff['content_data'])
-        
-        # Create multiple choice question
-        question_data = {
-            'fragen': [{
-                'frage': f"Was bedeutet '{begriff['title']}'?",
-                'antworten': [
-                    {'text': content_data['definition'], 'correct': True},
-                    {'text': 'Eine Form der Rechnungsstellung', 'correct': False},
-                    {'text': 'Ein Verfahren zur Steuerberechnung', 'correct': False},
-                    {'text': 'Eine Art der Buchführung', 'correct': False}
-                ]
-            }],
-            'kategorie': content_data.get('kategorie', 'Allgemein'),
-            'schwierigkeit': content_data.get('schwierigkeit', 'mittel'),
-            'punkte': 1
-        }
-        
-        cursor.execute('''
-            INSERT INTO course_content (
-                course_id, type, title, content_data, translations, order_index, status
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            course_id,
-            'quiz',
-            f"Quiz: {begriff['title']}",
-            json.dumps(question_data),
-            json.dumps({}),
-            100 + idx,
-            'active'
-        ))
-    
-    print(f"   Created {len(begriffe)} quiz questions")
-
-def create_flashcard_content(conn, course_id):
-    """Create flashcard content based on begriffe"""
-    cursor = conn.cursor()
-    
-    # Get begriffe for flashcards
-    cursor.execute('SELECT * FROM course_content WHERE type = "begriff"')
-    begriffe = cursor.fetchall()
-    
-    for idx, begriff in enumerate(begriffe):
-        content_data = json.loads(begriff['content_data'])
-        
-        # Create flashcard data
-        flashcard_data = {
-            'front': begriff['title'],
-            'back': content_data['definition'],
-            'beispiel': content_data.get('beispiel', ''),
-            'kategorie': content_data.get('kategorie', 'Allgemein'),
-            'schwierigkeit': content_data.get('schwierigkeit', 'mittel'),
-            'interval': 1,  # Starting interval for spaced repetition
-            'ease_factor': 2.5,  # Starting ease factor
-            'repetition_count': 0
-        }
-        
-        cursor.execute('''
-            INSERT INTO course_content (
-                course_id, type, title, content_data, translations, order_index, status
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            course_id,
-            'lernkarte',
-            begriff['title'],
-            json.dumps(flashcard_data),
-            begriff['translations'],
-            200 + idx,
-            'active'
-        ))
-    
-    print(f"   Created {len(begriffe)} flashcards")
-
-def print_statistics(conn):
+    ''', (tenant_id, course['title'], course['description'],
+          course['target_audience'], course['level'], course['language']))
+    course_id = cursor.lastrowid
+    save_checkpoint(new_conn, source, 'course', course_id, 1, completed=True)
+    new_conn.execute('COMMIT')
+    return course_id
+
+
+def convert_users(tenant_id):
+    def convert(rows, done):
+        users = []
+        for user in rows:
+            # Map old fields to new structure
+            translate_to = None
+            if user['preferred_language'] != 'de':
+                translate_to = user['preferred_language']
+
+            users.append((
+                tenant_id,
+                user['username'],
+                user['email'] or f"{user['username']}@example.com",
+                user['password_hash'],
+                'de',  # Default to German
+                translate_to,
+                'admin' if user['is_admin'] else 'student',
+                user['is_verified'],
+                user['created_at']
+            ))
+        return {USER_INSERT: users}
+    return convert
+
+
+def quiz_item(course_id, title, content_data, idx):
+    """Multiple choice question for one begriff"""
+    question_data = {
+        'fragen': [{
+            'frage': f"Was bedeutet '{title}'?",
+            'antworten': [
+                {'text': content_data['definition'], 'correct': True},
+                {'text': 'Eine Form der Rechnungsstellung', 'correct': False},
+                {'text': 'Ein Verfahren zur Steuerberechnung', 'correct': False},
+                {'text': 'Eine Art der Buchführung', 'correct': False}
+            ]
+        }],
+        'kategorie': content_data.get('kategorie', 'Allgemein'),
+        'schwierigkeit': content_data.get('schwierigkeit', 'mittel'),
+        'punkte': 1
+    }
+    return (course_id, 'quiz', f"Quiz: {title}", json.dumps(question_data),
+            json.dumps({}), QUIZ_ORDER_OFFSET + idx)
+
+
+def flashcard_item(course_id, title, content_data, translations, idx):
+    """Spaced-repetition flashcard for one begriff"""
+    flashcard_data = {
+        'front': title,
+        'back': content_data['definition'],
+        'beispiel': content_data.get('beispiel', ''),
+        'kategorie': content_data.get('kategorie', 'Allgemein'),
+        'schwierigkeit': content_data.get('schwierigkeit', 'mittel'),
+        'interval': 1,  # Starting interval for spaced repetition
+        'ease_factor': 2.5,  # Starting ease factor
+        'repetition_count': 0
+    }
+    return (course_id, 'lernkarte', title, json.dumps(flashcard_data),
+            translations, FLASHCARD_ORDER_OFFSET + idx)
+
+
+def convert_begriffe(course_id):
+    """Begriff content plus derived quiz/flashcard items in one pass"""
+    def convert(rows, done):
+        items = []
+        for idx, begriff in enumerate(rows, start=done):
+            content_data = {
+                'definition': begriff['erklaerung'],
+                'beispiel': begriff['beispiel'],
+                'tipp': begriff['tipp'],
+                'kategorie': begriff['kategorie'],
+                'schwierigkeit': begriff['schwierigkeit']
+            }
+
+            translations = {}
+            if begriff['englisch']:
+                translations['en'] = begriff['englisch']
+            if begriff['arabisch']:
+                translations['ar'] = begriff['arabisch']
+            if begriff['tuerkisch']:
+                translations['tr'] = begriff['tuerkisch']
+            translations = json.dumps(translations)
+
+            title = begriff['begriff']
+            items.append((course_id, 'begriff', title, json.dumps(content_data),
+                          translations, idx + 1))
+            if idx < QUIZ_LIMIT:
+                items.append(quiz_item(course_id, title, content_data, idx))
+            items.append(flashcard_item(course_id, title, content_data, translations, idx))
+        return {CONTENT_INSERT: items}
+    return convert
+
+
+# =============================================================================
+# Tenant migration
+# =============================================================================
+
+def migrate_tenant(job):
+    """Migrate one legacy database; runs in a worker process"""
+    tenant_id, old_db, new_db = job['tenant_id'], job['old_db'], job['new_db']
+    chunk_size = job.get('chunk_size', CHUNK_SIZE)
+    source = f"{tenant_id}:{os.path.abspath(old_db)}"
+    started = time.perf_counter()
+
+    old_conn = open_source(old_db)
+    new_conn = open_target(new_db)
+    try:
+        print(f"🚀 [{tenant_id}] {old_db} -> {new_db}")
+        course_id = create_course(new_conn, source, tenant_id, job.get('course'))
+
+        users = migrate_phase(
+            new_conn, source, 'users',
+            lambda after: stream(old_conn, 'SELECT * FROM users WHERE id > ? ORDER BY id',
+                                 after, chunk_size),
+            convert_users(tenant_id))
+        print(f"   👥 [{tenant_id}] {users} users")
+
+        begriffe = migrate_phase(
+            new_conn, source, 'begriffe',
+            lambda after: stream(old_conn, 'SELECT * FROM begriffe WHERE id > ? ORDER BY id',
+                                 after, chunk_size),
+            convert_begriffe(course_id))
+        print(f"   📖 [{tenant_id}] {begriffe} begriffe (+ quiz/flashcards)")
+
+        new_conn.execute('PRAGMA optimize')
+    finally:
+        old_conn.close()
+        new_conn.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ [{tenant_id}] done in {elapsed:.2f}s")
+    return tenant_id, new_db, elapsed
+
+
+def print_statistics(db_path):
     """Print migration statistics"""
-    cursor = conn.cursor()
-    
-    print("\n📊 Migration Statistics:")
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+
+    print(f"\n📊 Migration Statistics ({db_path}):")
     print("=" * 40)
-    
-    # Users
-    cursor.execute('SELECT COUNT(*) as count FROM users')
-    user_count = cursor.fetchone()['count']
+
+    user_count = conn.execute('SELECT COUNT(*) as count FROM users').fetchone()['count']
     print(f"👥 Users: {user_count}")
-    
-    # Courses
-    cursor.execute('SELECT COUNT(*) as count FROM courses')
-    course_count = cursor.fetchone()['count']
+
+    course_count = conn.execute('SELECT COUNT(*) as count FROM courses').fetchone()['count']
     print(f"📚 Courses: {course_count}")
-    
-    # Content by type
-    cursor.execute('''
-        SELECT type, COUNT(*) as count 
-        FROM course_content 
+
+    content_stats = conn.execute('''
+        SELECT type, COUNT(*) as count
+        FROM course_content
         GROUP BY type
-    ''')
-    content_stats = cursor.fetchall()
-    
+    ''').fetchall()
+
     print("📖 Content:")
+    total_content = 0
     for stat in content_stats:
         print(f"   {stat['type'].capitalize()}: {stat['count']}")
-    
-    # Total content
-    cursor.execute('SELECT COUNT(*) as count FROM course_content')
-    total_content = cursor.fetchone()['count']
+        total_content += stat['count']
     print(f"📋 Total Content Items: {total_content}")
 
+    conn.close()
+
+
+def parse_jobs(args):
+    if args.manifest:
+        with open(args.manifest) as f:
+            jobs = json.load(f)
+    elif args.tenants:
+        jobs = []
+        for spec in args.tenants:
+            try:
+                tenant_id, old_db, new_db = spec.split(':', 2)
+            except ValueError:
+                sys.exit(f"❌ Invalid tenant spec '{spec}' (expected TENANT:OLD_DB:NEW_DB)")
+            jobs.append({'tenant_id': tenant_id, 'old_db': old_db, 'new_db': new_db})
+    else:
+        jobs = [{'tenant_id': DEFAULT_TENANT, 'old_db': OLD_DB, 'new_db': NEW_DB}]
+
+    for job in jobs:
+        job['chunk_size'] = args.chunk_size
+        job['new_db'] = os.path.abspath(job['new_db'])
+        if not os.path.exists(job['old_db']):
+            sys.exit(f"❌ Old database not found: {job['old_db']}")
+
+    targets = [job['new_db'] for job in jobs]
+    if len(set(targets)) != len(targets):
+        sys.exit("❌ Each tenant needs its own target database")
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate legacy course databases')
+    parser.add_argument('tenants', nargs='*', metavar='TENANT:OLD_DB:NEW_DB')
+    parser.add_argument('--manifest', help='JSON list of tenant jobs')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help='tenants migrated in parallel (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    jobs = parse_jobs(args)
+    started = time.perf_counter()
+
+    if len(jobs) == 1 or args.jobs <= 1:
+        results = [migrate_tenant(job) for job in jobs]
+    else:
+        with Pool(min(args.jobs, len(jobs))) as pool:
+            results = list(pool.imap_unordered(migrate_tenant, jobs))
+
+    for _, new_db, _ in results:
+        print_statistics(new_db)
+
+    print(f"\n🎉 Migrated {len(results)} tenant(s) in {time.perf_counter() - started:.2f}s")
+
+
 if __name__ == '__main__':
-    # Check if old database exists
-    if not os.path.exists(OLD_DB):
-        print(f"❌ Old database not found: {OLD_DB}")
-        exit(1)
-    
-    # Create new database directory if needed
-    os.makedirs(os.path.dirname(NEW_DB), exist_ok=True)
-    
-    migrate_data()
-    print("\n🎉 Data migration completed successfully!")
-    print(f"New database created at: {NEW_DB}")
\ No newline at end of file
+    main()
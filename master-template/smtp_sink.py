@@ -0,0 +1,117 @@
+"""
+Local debugging SMTP sink
+Accepts every mail, keeps it in memory and prints a summary - for
+development and tests of the outbound mail queue
+
+    python smtp_sink.py [port]
+
+then start the app with MAIL_SERVER=localhost MAIL_PORT=1025 MAIL_USE_TLS=false
+"""
+
+from email import message_from_bytes, policy
+import socketserver
+import sys
+import threading
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.reply('220 smtp-sink ready')
+        sender, recipients = None, []
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command[:4].upper()
+
+            if verb == 'EHLO':
+                self.wfile.write(b'250-smtp-sink\r\n250-PIPELINING\r\n250 8BITMIME\r\n')
+            elif verb == 'HELO':
+                self.reply('250 smtp-sink')
+            elif verb == 'MAIL':
+                sender, recipients = command[10:].split()[0].strip('<>'), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command[8:].split()[0].strip('<>'))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                self.server.sink.store(sender, recipients, self.read_data())
+                sender, recipients = None, []
+                self.reply('250 OK: queued')
+            elif verb == 'RSET':
+                sender, recipients = None, []
+                self.reply('250 OK')
+            elif verb == 'NOOP':
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+    def read_data(self):
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b'.\r\n', b'.\n'):
+                break
+            # Undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b'..') else line)
+        return b''.join(lines)
+
+
+class ThreadedSMTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class SMTPSink:
+    """In-memory SMTP server; messages are email.message.EmailMessage objects"""
+
+    def __init__(self, host='127.0.0.1', port=1025, verbose=False):
+        self.messages = []
+        self.connections = 0
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        self._server = ThreadedSMTPServer((host, port), SMTPSinkHandler)
+        self._server.sink = self
+        self._server.verify_request = self._count_connection
+        self.host, self.port = self._server.server_address
+
+    def _count_connection(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        return True
+
+    def store(self, sender, recipients, data):
+        message = message_from_bytes(data, policy=policy.default)
+        with self._lock:
+            self.messages.append(message)
+        if self.verbose:
+            print(f"📧 {sender} -> {', '.join(recipients)}: {message['Subject']}")
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 1025
+    sink = SMTPSink(port=port, verbose=True)
+    print(f"📭 SMTP sink listening on {sink.host}:{sink.port}")
+    try:
+        sink._server.serve_forever()
+    except KeyboardInterrupt:
+        sink.stop()
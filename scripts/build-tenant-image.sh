@@ -0,0 +1,49 @@
+#!/bin/bash
+
+# 🐳 Tenant Image Build Script für kurs24.io
+# Baut das gemeinsame Tenant-Image aus dem MASTER Template (einmal pro Release,
+# nicht pro Kunde) und taggt es versioniert + als latest
+
+set -e
+
+# Colors for output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+NC='\033[0m'
+
+# Configuration
+BASE_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+MASTER_DIR="${BASE_DIR}/master-template"
+IMAGE_NAME="${TENANT_IMAGE_NAME:-kurs24-tenant}"
+
+# Arguments
+VERSION=${1:-$(git -C "$BASE_DIR" rev-parse --short HEAD)}
+PUSH=$2
+
+if [ -z "$VERSION" ]; then
+    echo -e "${RED}Error: Version required!${NC}"
+    echo "Usage: $0 [version] [--push]"
+    echo "Example: $0 1.4.0 --push"
+    exit 1
+fi
+
+echo -e "${GREEN}🏰 Building tenant image ${IMAGE_NAME}:${VERSION}${NC}"
+echo "=============================================="
+
+docker build \
+    --build-arg TENANT_IMAGE_VERSION="${VERSION}" \
+    -t "${IMAGE_NAME}:${VERSION}" \
+    -t "${IMAGE_NAME}:latest" \
+    "${MASTER_DIR}"
+
+if [ "$PUSH" = "--push" ]; then
+    echo -e "${YELLOW}📤 Pushing ${IMAGE_NAME}:${VERSION}...${NC}"
+    docker push "${IMAGE_NAME}:${VERSION}"
+    docker push "${IMAGE_NAME}:latest"
+fi
+
+echo ""
+echo -e "${GREEN}✅ Tenant image ready: ${IMAGE_NAME}:${VERSION}${NC}"
+echo "Set TENANT_IMAGE=${IMAGE_NAME}:${VERSION} in .env.production and restart the API;"
+echo "new tenants use it immediately, existing ones on their next redeploy."
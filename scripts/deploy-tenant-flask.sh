@@ -39,80 +39,22 @@ echo "Email: $TENANT_EMAIL"
 echo "Color: $TENANT_COLOR"
 echo ""
 
-# Step 1: Create tenant directory
+# Step 1: Refuse to overwrite an existing tenant
 TENANT_DIR="${TENANTS_DIR}/${TENANT_SUBDOMAIN}"
-echo -e "${YELLOW}📁 Creating tenant directory...${NC}"
+echo -e "${YELLOW}📁 Checking tenant directory...${NC}"
 
 if [ -d "$TENANT_DIR" ]; then
     echo -e "${RED}Error: Tenant directory already exists!${NC}"
     exit 1
 fi
 
-mkdir -p "$TENANT_DIR"
-
-# Step 2: Copy MASTER template
-echo -e "${YELLOW}📋 Copying MASTER template...${NC}"
-cp -r ${MASTER_DIR}/* ${TENANT_DIR}/
-
-# Step 3: Generate unique ports and secrets
-echo -e "${YELLOW}⚙️ Generating tenant configuration...${NC}"
-APP_PORT=$((5000 + $(echo ${TENANT_SUBDOMAIN} | cksum | cut -d' ' -f1) % 1000))
-SECRET_KEY=$(openssl rand -hex 32)
-API_BASE_URL="https://api.kurs24.io"
-
-# Step 4: Replace template variables in docker-compose.yml
-echo -e "${YELLOW}🐳 Configuring Docker setup...${NC}"
-# Replace template variables in docker-compose.yml
-sed -i "s/{{TENANT_ID}}/${TENANT_SUBDOMAIN}/g" ${TENANT_DIR}/docker-compose.yml
-sed -i "s/{{TENANT_PLAN}}/${TENANT_PLAN}/g" ${TENANT_DIR}/docker-compose.yml
-sed -i "s/{{TENANT_EMAIL}}/${TENANT_EMAIL}/g" ${TENANT_DIR}/docker-compose.yml
-sed -i "s/{{TENANT_COLOR}}/${TENANT_COLOR}/g" ${TENANT_DIR}/docker-compose.yml
-sed -i "s/{{SECRET_KEY}}/${SECRET_KEY}/g" ${TENANT_DIR}/docker-compose.yml
-sed -i "s/{{APP_PORT}}/${APP_PORT}/g" ${TENANT_DIR}/docker-compose.yml
-sed -i "s|{{API_BASE_URL}}|${API_BASE_URL}|g" ${TENANT_DIR}/docker-compose.yml
-
-# Replace template variables in .env.template if it exists
-if [ -f "${TENANT_DIR}/.env.template" ]; then
-    sed -i "s/{{TENANT_ID}}/${TENANT_SUBDOMAIN}/g" ${TENANT_DIR}/.env.template
-    sed -i "s/{{TENANT_PLAN}}/${TENANT_PLAN}/g" ${TENANT_DIR}/.env.template
-    sed -i "s/{{TENANT_EMAIL}}/${TENANT_EMAIL}/g" ${TENANT_DIR}/.env.template
-    sed -i "s/{{TENANT_COLOR}}/${TENANT_COLOR}/g" ${TENANT_DIR}/.env.template
-    sed -i "s/{{SECRET_KEY}}/${SECRET_KEY}/g" ${TENANT_DIR}/.env.template
-    sed -i "s|{{API_BASE_URL}}|${API_BASE_URL}|g" ${TENANT_DIR}/.env.template
-    mv ${TENANT_DIR}/.env.template ${TENANT_DIR}/.env.processed
-fi
-
-# Step 5: Create .env file
-echo -e "${YELLOW}📄 Creating environment file...${NC}"
-cat > ${TENANT_DIR}/.env << EOF
-# Tenant Configuration
-TENANT_ID=${TENANT_SUBDOMAIN}
-TENANT_PLAN=${TENANT_PLAN}
-TENANT_EMAIL=${TENANT_EMAIL}
-TENANT_COLOR=${TENANT_COLOR}
-
-# Security
-SECRET_KEY=${SECRET_KEY}
-
-# Database
-DATABASE_PATH=/app/data/courses.db
-
-# API Configuration
-API_BASE_URL=${API_BASE_URL}
+# Step 2: Render config and start the container
+# (backend/api/tenant_deployer.py - same code path as paid provisioning)
+echo -e "${YELLOW}🐳 Deploying tenant container...${NC}"
+docker exec kurs24-api python tenant_deployer.py \
+    "$TENANT_SUBDOMAIN" "$TENANT_PLAN" "$TENANT_EMAIL" "$TENANT_COLOR"
 
-# Flask Environment
-FLASK_ENV=production
-
-# Features based on plan
-ENABLE_AI_FEATURES=$([ "$TENANT_PLAN" = "pro" ] && echo "true" || echo "false")
-MAX_STUDENTS=$([ "$TENANT_PLAN" = "pro" ] && echo "unlimited" || echo "50")
-MAX_COURSES=$([ "$TENANT_PLAN" = "pro" ] && echo "unlimited" || echo "10")
-
-# Branding
-ACADEMY_NAME="${TENANT_SUBDOMAIN//-/ }"
-EOF
-
-# Step 6: Create Caddy configuration
+# Step 3: Create Caddy configuration
 echo -e "${YELLOW}🔒 Configuring Caddy for SSL...${NC}"
 mkdir -p "${CADDY_DYNAMIC_DIR}"
 cat > ${CADDY_DYNAMIC_DIR}/${TENANT_SUBDOMAIN}.caddyfile << EOF
@@ -146,7 +88,7 @@ ${TENANT_SUBDOMAIN}.kurs24.io {
 }
 EOF
 
-# Step 7: Create DNS record via Porkbun API
+# Step 4: Create DNS record via Porkbun API
 echo -e "${YELLOW}🌐 Creating DNS record...${NC}"
 if [ -f "/home/tba/kurs24-platform/.env.production" ]; then
     source /home/tba/kurs24-platform/.env.production
@@ -164,18 +106,12 @@ if [ -f "/home/tba/kurs24-platform/.env.production" ]; then
       }' || echo -e "${YELLOW}Warning: DNS creation failed, please create manually${NC}"
 fi
 
-# Step 8: Start tenant containers
-echo -e "${YELLOW}🚀 Starting tenant containers...${NC}"
-cd ${TENANT_DIR}
-docker compose up -d --build
-
-# Step 9: Reload Caddy to pick up new config
+# Step 5: Reload Caddy to pick up new config
 echo -e "${YELLOW}🔄 Reloading Caddy...${NC}"
 docker exec caddy caddy reload --config /etc/caddy/Caddyfile || echo -e "${YELLOW}Warning: Caddy reload failed${NC}"
 
-# Step 10: Health check
+# Step 6: Health check (the deployer already waited for the app to answer)
 echo -e "${YELLOW}🏥 Running health check...${NC}"
-sleep 15
 
 # Check if container is running
 if docker ps | grep -q "tenant-${TENANT_SUBDOMAIN}-app"; then
@@ -185,14 +121,13 @@ else
     echo "Debug: docker logs tenant-${TENANT_SUBDOMAIN}-app"
 fi
 
-# Step 11: Display results
+# Step 7: Display results
 echo -e "${GREEN}🎉 Tenant deployed successfully!${NC}"
 echo ""
 echo "🌐 URL: https://${TENANT_SUBDOMAIN}.kurs24.io (DNS may take a few minutes)"
 echo "📧 Admin: ${TENANT_EMAIL}"
 echo "💼 Plan: ${TENANT_PLAN}"
 echo "🐳 Container: tenant-${TENANT_SUBDOMAIN}-app"
-echo "🔧 Port: ${APP_PORT} → 5000"
 echo ""
 echo "Next steps:"
 echo "1. Wait for DNS propagation (2-5 minutes)"
@@ -200,7 +135,7 @@ echo "2. Test: curl -I https://${TENANT_SUBDOMAIN}.kurs24.io"
 echo "3. Monitor logs: docker logs tenant-${TENANT_SUBDOMAIN}-app"
 echo "4. Caddy logs: docker logs caddy"
 
-# Step 12: Log deployment
-echo "[$(date)] Deployed Flask tenant: ${TENANT_SUBDOMAIN} (${TENANT_PLAN}) on port ${APP_PORT}" >> /var/log/kurs24-deployments.log
+# Step 8: Log deployment
+echo "[$(date)] Deployed Flask tenant: ${TENANT_SUBDOMAIN} (${TENANT_PLAN}) " >> /var/log/kurs24-deployments.log
 
 echo -e "${GREEN}🏰 Royal Academy Flask Tenant Deployment Complete!${NC}"
\ No newline at end of file